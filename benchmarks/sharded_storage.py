@@ -0,0 +1,62 @@
+"""Write throughput of one database versus per-user shards as active users grow.
+
+Run with ``python -m benchmarks.sharded_storage --users 1 4 16 --steps 200``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from src.infrastructure.storage.sharded_storage import ShardedSQLiteStorage
+from src.infrastructure.storage.sqlite_storage import SQLiteStorage
+
+
+async def run(mode: str, users: int, steps: int) -> float:
+    """Transitions per second with ``users`` users each writing ``steps`` times."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage: SQLiteStorage | ShardedSQLiteStorage
+        if mode == "sharded":
+            storage = ShardedSQLiteStorage(tmp, max_open_shards=users)
+        else:
+            storage = SQLiteStorage(Path(tmp) / "bench.db")
+        await storage.initialize()
+        user_ids = [await storage.create_user(chat_id) for chat_id in range(users)]
+        app_ids = [
+            await storage.create_job_application(user_id, f"https://jobs.test/{user_id}")
+            for user_id in user_ids
+        ]
+
+        async def worker(app_id: int) -> None:
+            for step in range(steps):
+                await storage.transition_application(
+                    app_id, "in_progress", event_type="step", event_data={"n": step}
+                )
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(app_id) for app_id in app_ids))
+        elapsed = time.perf_counter() - started
+        await storage.close()
+    return users * steps / elapsed
+
+
+async def run_all(user_counts: list[int], steps: int) -> dict[int, dict[str, float]]:
+    return {
+        users: {mode: round(await run(mode, users, steps), 1) for mode in ("single", "sharded")}
+        for users in user_counts
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+    print(asyncio.run(run_all(args.users, args.steps)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Concurrent update/get throughput of SQLiteStorage.
+
+Run with ``python -m benchmarks.sqlite_storage --applications 200 --steps 20``;
+add ``--steps-mode`` to compare update+history pairs with transition_application.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from src.infrastructure.storage.sqlite_storage import SQLiteStorage
+from src.utils.metrics import LatencyStats
+
+
+async def run(applications: int, steps: int, readers: int) -> dict[str, object]:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(Path(tmp) / "bench.db", readers=readers)
+        await storage.initialize()
+        user_id = await storage.create_user(1)
+        app_ids = [
+            await storage.create_job_application(user_id, f"https://jobs.test/{n}")
+            for n in range(applications)
+        ]
+        updates = LatencyStats(max_samples=applications * steps)
+        reads = LatencyStats(max_samples=applications * steps)
+
+        async def worker(app_id: int) -> None:
+            for step in range(steps):
+                started = time.perf_counter()
+                await storage.update_job_application(app_id, "in_progress", {"step": step})
+                updates.record(time.perf_counter() - started)
+                started = time.perf_counter()
+                await storage.get_job_application(app_id)
+                reads.record(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(app_id) for app_id in app_ids))
+        elapsed = time.perf_counter() - started
+        await storage.close()
+
+    operations = applications * steps * 2
+    return {
+        "applications": applications,
+        "steps": steps,
+        "readers": readers,
+        "elapsed_s": round(elapsed, 3),
+        "ops_per_s": round(operations / elapsed, 1),
+        "update": updates.snapshot(),
+        "get": reads.snapshot(),
+    }
+
+
+async def run_steps(mode: str, applications: int, steps: int) -> dict[str, object]:
+    """Per-step latency of update_job_application+add_application_history or one transition."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(Path(tmp) / "bench.db")
+        await storage.initialize()
+        user_id = await storage.create_user(1)
+        app_ids = [
+            await storage.create_job_application(user_id, f"https://jobs.test/{n}")
+            for n in range(applications)
+        ]
+        latency = LatencyStats(max_samples=applications * steps)
+
+        async def worker(app_id: int) -> None:
+            for step in range(steps):
+                started = time.perf_counter()
+                if mode == "paired":
+                    await storage.update_job_application(app_id, "in_progress")
+                    await storage.add_application_history(app_id, "step", {"n": step})
+                else:
+                    await storage.transition_application(
+                        app_id, "in_progress", event_type="step", event_data={"n": step}
+                    )
+                latency.record(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(app_id) for app_id in app_ids))
+        elapsed = time.perf_counter() - started
+        await storage.close()
+    return {"elapsed_s": round(elapsed, 3), **latency.snapshot()}
+
+
+async def run_step_modes(applications: int, steps: int) -> dict[str, object]:
+    return {mode: await run_steps(mode, applications, steps) for mode in ("paired", "transition")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--applications", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--steps-mode", action="store_true")
+    args = parser.parse_args()
+    if args.steps_mode:
+        print(asyncio.run(run_step_modes(args.applications, args.steps)))
+    else:
+        print(asyncio.run(run(args.applications, args.steps, args.readers)))
+
+
+if __name__ == "__main__":
+    main()
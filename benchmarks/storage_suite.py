@@ -0,0 +1,404 @@
+"""Per-method throughput and latency of IStorage against a synthetic dataset.
+
+Seeds a database with users, profiles, configs, applications and history at a
+configurable scale, then drives every storage method with concurrent workers
+and writes one JSON document with ops/s and latency percentiles per method::
+
+    python -m benchmarks.storage_suite --users 10000 --applications 1000000 \\
+        --events-per-application 10 --output results.json
+
+Pass ``--baseline old.json`` to compare against an earlier run; the command
+exits non-zero when a method regressed by more than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from src.infrastructure.storage.sqlite_storage import SQLiteStorage
+from src.utils.metrics import LatencyStats
+from src.utils.urls import ats_domain, canonicalize_job_url
+
+FORMAT_VERSION = 1
+_SEED_CHUNK = 10_000
+_HOSTS = ("boards.greenhouse.io", "jobs.lever.co", "acme.wd5.myworkdayjobs.com", "jobs.ashbyhq.com")
+_FINISHED = ("completed", "failed", "cancelled")
+_REASONS = ("submit_button_not_found", "login_required", "captcha", "timeout")
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Size of the synthetic dataset."""
+
+    users: int = 100
+    applications: int = 10_000
+    events_per_application: int = 10
+    seed: int = 1
+
+    def user_of(self, application_id: int) -> int:
+        return (application_id - 1) % self.users + 1
+
+    def is_active(self, application_id: int) -> bool:
+        # Every fifth application is still running so transitions have targets.
+        return application_id % 5 == 0
+
+
+def _job_url(application_id: int) -> str:
+    host = _HOSTS[application_id % len(_HOSTS)]
+    if host == "acme.wd5.myworkdayjobs.com":
+        return f"https://{host}/en-US/careers/job/Remote/Engineer_R{application_id}"
+    if host == "boards.greenhouse.io":
+        return f"https://{host}/acme/jobs/{application_id}"
+    return f"https://{host}/acme/{application_id:08x}-0000-4000-8000-000000000000"
+
+
+def _profile(user_id: int) -> dict[str, Any]:
+    return {
+        "personal_info": {
+            "first_name": f"User{user_id}",
+            "last_name": "Bench",
+            "email": f"user{user_id}@example.com",
+            "phone": f"+1555{user_id:07d}",
+        },
+        "experience": [{"company": "Acme", "title": "Engineer", "years": 3}],
+        "skills": ["python", "sql", "asyncio"],
+    }
+
+
+def _chunks(rows: Iterator[tuple[Any, ...]]) -> Iterator[list[tuple[Any, ...]]]:
+    chunk: list[tuple[Any, ...]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == _SEED_CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def seed(storage: SQLiteStorage, scale: Scale) -> None:
+    """Bulk-load the dataset with executemany on a connection of its own.
+
+    The per-row API would take hours at full scale, so rows are written
+    directly; outcomes are set the way ``transition_application`` sets
+    them, so the triggers record history and failure reasons as in use.
+    """
+    rng = random.Random(scale.seed)
+    origin = datetime(2024, 1, 1, tzinfo=UTC)
+
+    def users() -> Iterator[tuple[Any, ...]]:
+        for user_id in range(1, scale.users + 1):
+            yield user_id, 1_000_000 + user_id, origin.isoformat()
+
+    def profiles() -> Iterator[tuple[Any, ...]]:
+        for user_id in range(1, scale.users + 1):
+            yield user_id, json.dumps(_profile(user_id)), origin.isoformat()
+
+    def configs() -> Iterator[tuple[Any, ...]]:
+        for user_id in range(1, scale.users + 1):
+            model = ("gpt-4o-mini", "https://api.openai.com/v1")
+            yield user_id, "token", "key", *model, origin.isoformat()
+
+    def applications() -> Iterator[tuple[Any, ...]]:
+        for app_id in range(1, scale.applications + 1):
+            started = (origin + timedelta(minutes=app_id)).isoformat()
+            url = _job_url(app_id)
+            yield (
+                app_id,
+                scale.user_of(app_id),
+                url,
+                canonicalize_job_url(url),
+                ats_domain(url),
+                started,
+                started,
+            )
+
+    # Statuses are set by a separate UPDATE so the analytics triggers see them.
+    def outcomes() -> Iterator[tuple[Any, ...]]:
+        for app_id in range(1, scale.applications + 1):
+            if scale.is_active(app_id):
+                started = (origin + timedelta(minutes=app_id)).isoformat()
+                yield "in_progress", None, started, "started", "{}", app_id
+                continue
+            status = rng.choice(_FINISHED)
+            finished = origin + timedelta(minutes=app_id, seconds=rng.randint(30, 1800))
+            data = json.dumps({"reason": rng.choice(_REASONS)} if status == "failed" else {})
+            yield status, finished.isoformat(), finished.isoformat(), status, data, app_id
+
+    def history() -> Iterator[tuple[Any, ...]]:
+        for app_id in range(1, scale.applications + 1):
+            started = origin + timedelta(minutes=app_id)
+            for step in range(scale.events_per_application):
+                created = (started + timedelta(seconds=step)).isoformat()
+                yield app_id, "step", json.dumps({"n": step}), created
+
+    statements = [
+        ("INSERT INTO users (id, telegram_chat_id, created_at) VALUES (?, ?, ?)", users),
+        (
+            "INSERT INTO user_profiles (user_id, profile_data, updated_at) VALUES (?, ?, ?)",
+            profiles,
+        ),
+        (
+            "INSERT INTO user_configs (user_id, telegram_bot_token, openai_key, model_name, "
+            "model_base_url, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            configs,
+        ),
+        (
+            "INSERT INTO job_applications (id, user_id, job_url, canonical_url, ats_domain, "
+            "started_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            applications,
+        ),
+        (
+            "UPDATE job_applications SET status = ?, completed_at = ?, updated_at = ?, "
+            "last_event_type = ?, last_event_data = ? WHERE id = ?",
+            outcomes,
+        ),
+        (
+            "INSERT INTO application_history (application_id, event_type, event_data, "
+            "created_at) VALUES (?, ?, ?, ?)",
+            history,
+        ),
+    ]
+    async with aiosqlite.connect(storage.db_path, isolation_level=None) as connection:
+        for sql, rows in statements:
+            for chunk in _chunks(rows()):
+                await connection.execute("BEGIN IMMEDIATE")
+                await connection.executemany(sql, chunk)
+                await connection.execute("COMMIT")
+        await connection.execute("ANALYZE")
+    await storage.load_dedupe_filter()
+
+
+Operation = Callable[[SQLiteStorage, random.Random, Scale], Awaitable[Any]]
+
+
+def _app(rng: random.Random, scale: Scale) -> int:
+    return rng.randint(1, scale.applications)
+
+
+def _active_app(rng: random.Random, scale: Scale) -> int:
+    return 5 * rng.randint(1, max(1, scale.applications // 5))
+
+
+def _user(rng: random.Random, scale: Scale) -> int:
+    return rng.randint(1, scale.users)
+
+
+async def _save_profile(storage: SQLiteStorage, user_id: int) -> None:
+    await storage.save_user_profile(user_id, _profile(user_id))
+
+
+OPERATIONS: dict[str, Operation] = {
+    "get_user": lambda s, r, c: s.get_user(_user(r, c)),
+    "get_user_by_telegram_id": lambda s, r, c: s.get_user_by_telegram_id(1_000_000 + _user(r, c)),
+    "create_user": lambda s, r, c: s.create_user(2_000_000 + r.randrange(1 << 30)),
+    "get_user_config": lambda s, r, c: s.get_user_config(_user(r, c)),
+    "save_user_config": lambda s, r, c: s.save_user_config(
+        _user(r, c), "token", "key", "gpt-4o-mini", "https://api.openai.com/v1"
+    ),
+    "get_user_profile": lambda s, r, c: s.get_user_profile(_user(r, c)),
+    "save_user_profile": lambda s, r, c: _save_profile(s, _user(r, c)),
+    "save_resume": lambda s, r, c: s.save_resume(_user(r, c), "/tmp/resume.pdf", "pdf"),
+    "get_resume": lambda s, r, c: s.get_resume(_user(r, c)),
+    "save_cover_letter": lambda s, r, c: s.save_cover_letter(_user(r, c), "Dear hiring team"),
+    "get_cover_letter": lambda s, r, c: s.get_cover_letter(_user(r, c)),
+    "create_job_application": lambda s, r, c: s.create_job_application(
+        _user(r, c), _job_url(c.applications + r.randrange(1 << 30))
+    ),
+    "update_job_application": lambda s, r, c: s.update_job_application(
+        _active_app(r, c), "in_progress", {"step": r.randrange(100)}
+    ),
+    "transition_application": lambda s, r, c: s.transition_application(
+        _active_app(r, c), "in_progress", event_type="step", event_data={"n": 0}
+    ),
+    "find_job_application": lambda s, r, c: s.find_job_application(
+        c.user_of(app_id := _app(r, c)), _job_url(app_id) + "?utm_source=bench"
+    ),
+    "get_job_application": lambda s, r, c: s.get_job_application(_app(r, c)),
+    "get_user_applications": lambda s, r, c: s.get_user_applications(_user(r, c), 20),
+    "query_applications": lambda s, r, c: s.query_applications(
+        _user(r, c), statuses=["completed"], ats_domain=r.choice(_HOSTS), limit=20
+    ),
+    "get_application_stats": lambda s, r, c: s.get_application_stats(_user(r, c)),
+    "add_application_history": lambda s, r, c: s.add_application_history(
+        _app(r, c), "step", {"n": 0}
+    ),
+    "get_application_history": lambda s, r, c: s.get_application_history(_app(r, c)),
+    "save_telegram_file_id": lambda s, r, c: s.save_telegram_file_id(
+        1, f"{r.randrange(10_000):064x}", "document", "file-id"
+    ),
+    "get_telegram_file_id": lambda s, r, c: s.get_telegram_file_id(
+        1, f"{r.randrange(10_000):064x}", "document"
+    ),
+    "save_pending_prompt": lambda s, r, c: s.save_pending_prompt(
+        {"application_id": _app(r, c), "kind": "question", "text": "Salary?"}
+    ),
+    "get_pending_prompts": lambda s, r, c: s.get_pending_prompts(),
+    "delete_pending_prompt": lambda s, r, c: s.delete_pending_prompt(_app(r, c)),
+    "enqueue_application": lambda s, r, c: s.enqueue_application(
+        _user(r, c), _job_url(_app(r, c)), r.randrange(3)
+    ),
+    "get_queued_applications": lambda s, r, c: s.get_queued_applications(),
+    "delete_queued_application": lambda s, r, c: s.delete_queued_application(r.randint(1, 1000)),
+}
+
+
+async def measure(
+    storage: SQLiteStorage,
+    scale: Scale,
+    name: str,
+    operations: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """Run ``operations`` calls of one method spread over ``concurrency`` workers.
+
+    Throughput counts the time to drain the history write-behind buffer, so a
+    buffered write is not reported as faster than it is; ``flush_ms`` shows
+    how much of the run that drain took.
+    """
+    operation = OPERATIONS[name]
+    latency = LatencyStats(max_samples=operations)
+    remaining = operations
+
+    async def worker(seed: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed)
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                await operation(storage, rng, scale)
+            except Exception:
+                latency.record(time.perf_counter() - started, ok=False)
+            else:
+                latency.record(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(scale.seed * 1000 + n) for n in range(concurrency)))
+    flush_started = time.perf_counter()
+    await storage.history.flush()
+    finished = time.perf_counter()
+    elapsed = finished - started
+    return {
+        "ops_per_s": operations / elapsed if elapsed else 0.0,
+        "flush_ms": (finished - flush_started) * 1000,
+        **latency.snapshot(),
+    }
+
+
+async def run(
+    scale: Scale,
+    operations: int = 1000,
+    concurrency: int = 8,
+    readers: int = 4,
+    methods: list[str] | None = None,
+    db_path: Path | None = None,
+) -> dict[str, Any]:
+    """Seed a fresh database (or reuse a seeded ``db_path``) and measure each method."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = db_path or Path(tmp) / "bench.db"
+        fresh = not path.exists()
+        storage = SQLiteStorage(path, readers=readers)
+        await storage.initialize()
+        results = {}
+        try:
+            seed_started = time.perf_counter()
+            if fresh:
+                await seed(storage, scale)
+            seed_elapsed = time.perf_counter() - seed_started
+            for name in methods or list(OPERATIONS):
+                results[name] = await measure(storage, scale, name, operations, concurrency)
+        finally:
+            await storage.close()
+    return {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "scale": asdict(scale),
+        "settings": {"operations": operations, "concurrency": concurrency, "readers": readers},
+        "seed_s": seed_elapsed if fresh else None,
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.2
+) -> list[dict[str, Any]]:
+    """Methods whose p95 latency grew or throughput dropped by more than ``threshold``."""
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        checks = (
+            ("p95_ms", before["p95_ms"], now["p95_ms"], now["p95_ms"] > before["p95_ms"]),
+            (
+                "ops_per_s",
+                before["ops_per_s"],
+                now["ops_per_s"],
+                now["ops_per_s"] < before["ops_per_s"],
+            ),
+        )
+        for metric, old, new, worse in checks:
+            if worse and old and abs(new - old) / old > threshold:
+                regressions.append(
+                    {"method": name, "metric": metric, "baseline": old, "current": new}
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=Scale.users)
+    parser.add_argument("--applications", type=int, default=Scale.applications)
+    parser.add_argument("--events-per-application", type=int, default=Scale.events_per_application)
+    parser.add_argument("--seed", type=int, default=Scale.seed)
+    parser.add_argument("--operations", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--method", action="append", choices=sorted(OPERATIONS))
+    parser.add_argument("--db", type=Path, help="Reuse (or create and keep) a seeded database")
+    parser.add_argument("--output", type=Path, default=Path("storage_benchmark.json"))
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    scale = Scale(args.users, args.applications, args.events_per_application, args.seed)
+    result = asyncio.run(
+        run(scale, args.operations, args.concurrency, args.readers, args.method, args.db)
+    )
+    args.output.write_text(json.dumps(result, indent=2))
+    for name, stats in result["results"].items():
+        print(
+            f"{name:28} {stats['ops_per_s']:10.1f} ops/s  p50 {stats['p50_ms']:7.3f} ms  "
+            f"p99 {stats['p99_ms']:7.3f} ms  errors {stats['errors']}"
+        )
+    if args.baseline:
+        regressions = compare(json.loads(args.baseline.read_text()), result, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
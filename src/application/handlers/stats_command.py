@@ -0,0 +1,87 @@
+"""/stats command: application success rates, timings and failure reasons."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from src.domain.interfaces.command_handler import ICommandHandler
+from src.domain.interfaces.storage import IStorage
+from src.domain.interfaces.telegram import ITelegramBot
+
+
+def _percent(rate: float | None) -> str:
+    return "n/a" if rate is None else f"{rate:.0%}"
+
+
+def _duration(seconds: int | None) -> str:
+    if seconds is None:
+        return "over a day"
+    if seconds < 60:
+        return f"under {seconds} s"
+    if seconds < 3600:
+        return f"under {seconds // 60} min"
+    return f"under {seconds // 3600} h"
+
+
+class StatsCommandHandler(ICommandHandler):
+    """Replies with the user's aggregates, e.g. ``/stats`` or ``/stats 7 jobs.lever.co``."""
+
+    def __init__(self, storage: IStorage, telegram_bot: ITelegramBot, days: int = 30) -> None:
+        self.storage = storage
+        self.telegram_bot = telegram_bot
+        self.days = days
+
+    @property
+    def command_name(self) -> str:
+        return "stats"
+
+    @property
+    def description(self) -> str:
+        return "Show application success rates and timings"
+
+    async def handle(self, update: Any, context: Any) -> None:
+        chat_id = update.effective_chat.id
+        user = await self.storage.get_user_by_telegram_id(chat_id)
+        if user is None:
+            await self.telegram_bot.send_message(chat_id, "No applications yet.")
+            return
+        days, domain = self.parse_args(update.effective_message.text or "", self.days)
+        since = datetime.now(UTC) - timedelta(days=days - 1)
+        stats = await self.storage.get_application_stats(user["id"], since, domain)
+        await self.telegram_bot.send_message(chat_id, self.format_stats(stats, days, domain))
+
+    @staticmethod
+    def parse_args(text: str, default_days: int) -> tuple[int, str | None]:
+        days, domain = default_days, None
+        for arg in text.split()[1:]:
+            if arg.isdigit() and int(arg) > 0:
+                days = int(arg)
+            else:
+                domain = arg.lower()
+        return days, domain
+
+    @staticmethod
+    def format_stats(stats: dict[str, Any], days: int, domain: str | None = None) -> str:
+        scope = f" on {domain}" if domain else ""
+        lines = [
+            f"Applications in the last {days} days{scope}",
+            f"Started: {stats['started']}  Completed: {stats['completed']}  "
+            f"Failed: {stats['failed']}  Cancelled: {stats['cancelled']}",
+            f"Success rate: {_percent(stats['success_rate'])}",
+        ]
+        if stats["duration_histogram"]:
+            lines.append(f"Median time to submit: {_duration(stats['median_duration_s'])}")
+        if not domain and len(stats["by_domain"]) > 1:
+            lines.append("By job board:")
+            lines.extend(
+                f"  {name}: {counts['completed']}/{counts['started']} submitted, "
+                f"{_percent(counts['success_rate'])} success"
+                for name, counts in stats["by_domain"].items()
+            )
+        if stats["failure_reasons"]:
+            lines.append("Top failure reasons:")
+            lines.extend(
+                f"  {entry['reason']}: {entry['count']}" for entry in stats["failure_reasons"]
+            )
+        return "\n".join(lines)
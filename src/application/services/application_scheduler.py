@@ -0,0 +1,266 @@
+"""Drain a persistent queue of job URLs with global, per-domain and per-user fairness."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.domain.interfaces.handlers import IJobApplicationHandler
+from src.domain.interfaces.storage import IStorage
+from src.domain.models.job_application import FINISHED_STATUSES
+from src.utils.logger import get_logger
+from src.utils.urls import ats_domain, validate_job_url
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Job:
+    queue_id: int
+    user_id: int
+    job_url: str
+    priority: int
+    domain: str
+    seq: int
+
+
+@dataclass
+class _Domain:
+    active: int = 0
+    next_start: float = 0.0
+
+
+@dataclass
+class _Counters:
+    submitted: int = 0
+    started: int = 0
+    finished: int = 0
+    skipped: int = 0
+    errors: int = 0
+    by_status: dict[str, int] = field(default_factory=dict)
+
+
+class ApplicationScheduler:
+    """Runs queued applications through start/process_application concurrently.
+
+    Every submitted URL is written to the storage queue first and removed once
+    processed, so ``start()`` after a restart picks up where the last run
+    stopped (start_application's dedupe keeps a half-finished entry from
+    applying twice). Up to ``max_concurrency`` applications run at once,
+    which should match the browser contexts and LLM capacity available. Each
+    ATS domain gets at most ``per_domain_concurrency`` of them and new starts
+    on a domain are ``domain_spacing`` seconds apart. Higher priority goes
+    first; among equal priorities users are served round-robin, so one user's
+    500 URLs do not starve another's three. An entry whose run raised stays in
+    storage and is retried on the next ``start()``. A URL that cannot be
+    parsed would fail every retry, so ``submit`` refuses it and a stored one
+    is dropped from the queue on ``start()``.
+    """
+
+    def __init__(
+        self,
+        handler: IJobApplicationHandler,
+        storage: IStorage,
+        max_concurrency: int = 4,
+        per_domain_concurrency: int = 2,
+        domain_spacing: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.handler = handler
+        self.storage = storage
+        self.max_concurrency = max_concurrency
+        self.per_domain_concurrency = per_domain_concurrency
+        self.domain_spacing = domain_spacing
+        self.clock = clock
+        # Users in round-robin order; each list is kept sorted by (-priority, seq).
+        self._queues: OrderedDict[int, list[_Job]] = OrderedDict()
+        self._domains: dict[str, _Domain] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._running: set[int] = set()
+        self._wake = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._dequeued = asyncio.Event()
+        self._loop_task: asyncio.Task[None] | None = None
+        self._seq = itertools.count()
+        self.counters = _Counters()
+
+    @property
+    def queued(self) -> int:
+        return sum(len(jobs) for jobs in self._queues.values())
+
+    @property
+    def active(self) -> int:
+        return len(self._tasks)
+
+    async def start(self) -> None:
+        if self._loop_task is not None:
+            return
+        # Entries submitted while stopped, or left queued by stop(), are already in memory.
+        known = {job.queue_id for jobs in self._queues.values() for job in jobs}
+        for entry in await self.storage.get_queued_applications():
+            if entry["id"] in known:
+                continue
+            try:
+                validate_job_url(entry["job_url"])
+            except ValueError:
+                self.counters.errors += 1
+                logger.exception("queued_job_url_invalid", job_url=entry["job_url"])
+                await self.storage.delete_queued_application(entry["id"])
+                continue
+            self._add(entry["id"], entry["user_id"], entry["job_url"], entry["priority"])
+        self._loop_task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, user_id: int, job_url: str, priority: int = 0) -> int:
+        validate_job_url(job_url)
+        queue_id = await self.storage.enqueue_application(user_id, job_url, priority)
+        self._add(queue_id, user_id, job_url, priority)
+        return queue_id
+
+    async def wait_queued_below(self, limit: int) -> None:
+        """Wait until fewer than ``limit`` entries are waiting; lets producers apply backpressure."""
+        while self.queued >= limit:
+            self._dequeued.clear()
+            await self._dequeued.wait()
+
+    async def drain(self) -> None:
+        """Wait until the queue is empty and nothing is running."""
+        await self._idle.wait()
+
+    async def stop(self) -> None:
+        """Stop scheduling; running applications finish, queued ones stay persisted."""
+        task, self._loop_task = self._loop_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "active": self.active,
+            "submitted": self.counters.submitted,
+            "started": self.counters.started,
+            "finished": self.counters.finished,
+            "skipped": self.counters.skipped,
+            "errors": self.counters.errors,
+            "by_status": dict(self.counters.by_status),
+            "domains": {
+                name: domain.active for name, domain in self._domains.items() if domain.active
+            },
+        }
+
+    def _add(self, queue_id: int, user_id: int, job_url: str, priority: int) -> None:
+        job = _Job(queue_id, user_id, job_url, priority, ats_domain(job_url), next(self._seq))
+        jobs = self._queues.setdefault(user_id, [])
+        # Queues are short and mostly appended to, so a linear insert is fine.
+        index = len(jobs)
+        while index and jobs[index - 1].priority < priority:
+            index -= 1
+        jobs.insert(index, job)
+        self.counters.submitted += 1
+        self._idle.clear()
+        self._wake.set()
+
+    def _available(self, domain: str, now: float) -> bool:
+        state = self._domains.get(domain)
+        return state is None or (
+            state.active < self.per_domain_concurrency and state.next_start <= now
+        )
+
+    def _next_job(self, now: float) -> _Job | None:
+        """Highest-priority startable job; ties go to the user served longest ago."""
+        best: tuple[int, int] | None = None
+        best_priority = 0
+        for user_id, jobs in self._queues.items():
+            for index, job in enumerate(jobs):
+                if self._available(job.domain, now):
+                    if best is None or job.priority > best_priority:
+                        best, best_priority = (user_id, index), job.priority
+                    break
+        if best is None:
+            return None
+        user_id, index = best
+        jobs = self._queues[user_id]
+        job = jobs.pop(index)
+        self._dequeued.set()
+        # Move the served user to the back of the rotation.
+        del self._queues[user_id]
+        if jobs:
+            self._queues[user_id] = jobs
+        return job
+
+    def _next_wakeup(self, now: float) -> float | None:
+        pending = {job.domain for jobs in self._queues.values() for job in jobs}
+        waits = [
+            state.next_start - now
+            for name, state in self._domains.items()
+            if name in pending
+            and state.active < self.per_domain_concurrency
+            and state.next_start > now
+        ]
+        return min(waits) if waits else None
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            now = self.clock()
+            while self.active < self.max_concurrency:
+                job = self._next_job(now)
+                if job is None:
+                    break
+                self._launch(job, now)
+            if not self._queues and not self._tasks:
+                self._idle.set()
+            timeout = self._next_wakeup(now)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    def _launch(self, job: _Job, now: float) -> None:
+        state = self._domains.setdefault(job.domain, _Domain())
+        state.active += 1
+        state.next_start = now + self.domain_spacing
+        self.counters.started += 1
+        task = asyncio.get_running_loop().create_task(self._process(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        self._wake.set()
+
+    async def _process(self, job: _Job) -> None:
+        try:
+            application_id = await self.handler.start_application(job.user_id, job.job_url)
+            application = await self.storage.get_job_application(application_id)
+            # A duplicate of a finished or running application is not processed again;
+            # one parked for input or an OTP resumes from its checkpoint.
+            if (
+                application is None
+                or application["status"] in FINISHED_STATUSES
+                or application_id in self._running
+            ):
+                self.counters.skipped += 1
+            else:
+                self._running.add(application_id)
+                try:
+                    result = await self.handler.process_application(application_id)
+                finally:
+                    self._running.discard(application_id)
+                status = str(result.get("status", "unknown"))
+                self.counters.by_status[status] = self.counters.by_status.get(status, 0) + 1
+            await self.storage.delete_queued_application(job.queue_id)
+        except Exception:
+            self.counters.errors += 1
+            logger.exception("scheduled_application_failed", job_url=job.job_url)
+        finally:
+            self.counters.finished += 1
+            self._domains[job.domain].active -= 1
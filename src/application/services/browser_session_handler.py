@@ -0,0 +1,82 @@
+"""Give every running application its own browser session."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.application.services.job_application_service import JobApplicationService
+from src.domain.interfaces.browser import IBrowserAutomation
+from src.domain.interfaces.handlers import IJobApplicationHandler
+
+
+class BrowserSessionHandler(IJobApplicationHandler):
+    """Runs each ``process_application`` call in a fresh browser.
+
+    One page cannot hold two applications, so concurrent runs (as the
+    scheduler makes them) each get a browser from ``make_browser`` and a
+    service from ``make_service``; the browser is closed when the run
+    returns. The run's checkpoint carries any progress over to the next
+    session. A user response or late answers get a session too, since both
+    can go on to fill and submit the form. Calls that need no page, and OTPs
+    for applications that are not running, go to a control service whose
+    browser is only launched if something uses it.
+    """
+
+    def __init__(
+        self,
+        make_service: Callable[[IBrowserAutomation], JobApplicationService],
+        make_browser: Callable[[], IBrowserAutomation],
+    ) -> None:
+        self.make_service = make_service
+        self.make_browser = make_browser
+        self._control_browser = make_browser()
+        self._control = make_service(self._control_browser)
+        self._live: dict[int, JobApplicationService] = {}
+
+    async def start_application(self, user_id: int, job_url: str) -> int:
+        return await self._control.start_application(user_id, job_url)
+
+    async def process_application(self, application_id: int) -> dict[str, Any]:
+        return await self._in_session(
+            application_id, lambda service: service.process_application(application_id)
+        )
+
+    async def handle_user_response(self, application_id: int, response: str) -> dict[str, Any]:
+        live = self._live.get(application_id)
+        if live is not None:
+            return await live.handle_user_response(application_id, response)
+        return await self._in_session(
+            application_id, lambda service: service.handle_user_response(application_id, response)
+        )
+
+    async def handle_answers(self, application_id: int, answers: dict[str, str]) -> dict[str, Any]:
+        live = self._live.get(application_id)
+        if live is not None:
+            return await live.handle_answers(application_id, answers)
+        return await self._in_session(
+            application_id, lambda service: service.handle_answers(application_id, answers)
+        )
+
+    async def handle_otp(self, application_id: int, otp_code: str) -> dict[str, Any]:
+        service = self._live.get(application_id, self._control)
+        return await service.handle_otp(application_id, otp_code)
+
+    async def cancel_application(self, application_id: int) -> None:
+        await self._control.cancel_application(application_id)
+
+    async def close(self) -> None:
+        await self._control_browser.close()
+
+    async def _in_session(
+        self,
+        application_id: int,
+        call: Callable[[JobApplicationService], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        browser = self.make_browser()
+        self._live[application_id] = self.make_service(browser)
+        try:
+            return await call(self._live[application_id])
+        finally:
+            del self._live[application_id]
+            await browser.close()
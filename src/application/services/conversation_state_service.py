@@ -0,0 +1,184 @@
+"""Durable tracking of questions awaiting a user reply."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from src.application.services.question_round_service import QuestionRoundService
+from src.domain.interfaces.handlers import IJobApplicationHandler
+from src.domain.interfaces.storage import IStorage
+from src.domain.interfaces.telegram import ITelegramBot
+from src.domain.models.job_application import InvalidStatusTransition
+from src.domain.models.pending_prompt import AnswerType, PendingPrompt
+
+
+class ConversationStateService:
+    """Persists pending prompts so replies survive process restarts.
+
+    Every question is written through ``IStorage`` before it is sent. On
+    startup ``rehydrate`` reloads the prompts that are still within their
+    deadline, and a reply arriving with no live waiter is routed to the
+    application that asked for it via the job application handler. A reply
+    to a message goes only to the prompts sent as that message; a plain
+    message goes to the oldest one. Question rounds save their prompts
+    straight to storage, so an unmatched reply reloads them before giving
+    up, and its answers are handed over per field to resume the
+    application. Status changes go through ``transition_application``; a
+    prompt whose application has since been cancelled or finished is
+    simply dropped.
+    """
+
+    def __init__(
+        self,
+        storage: IStorage,
+        telegram_bot: ITelegramBot,
+        job_handler: IJobApplicationHandler,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self.storage = storage
+        self.telegram_bot = telegram_bot
+        self.job_handler = job_handler
+        self._clock = clock
+        self._by_chat: dict[int, list[PendingPrompt]] = {}
+
+    async def ask(
+        self,
+        application_id: int,
+        chat_id: int,
+        question: str,
+        answer_type: AnswerType = AnswerType.TEXT,
+        timeout: float = 600.0,
+        options: list[str] | None = None,
+    ) -> PendingPrompt:
+        now = self._clock()
+        prompt = PendingPrompt(
+            application_id=application_id,
+            chat_id=chat_id,
+            question=question,
+            answer_type=answer_type,
+            options=options,
+            created_at=now,
+            deadline=now + timedelta(seconds=timeout),
+        )
+        status = "awaiting_otp" if answer_type == AnswerType.OTP else "awaiting_user_input"
+        await self.storage.transition_application(
+            application_id,
+            status,
+            {"question": question},
+            event_type="question_asked",
+            event_data={"question": question},
+        )
+        await self.storage.save_pending_prompt(prompt.model_dump(mode="json"))
+        self._remember(prompt)
+        message_id = await self.telegram_bot.send_message(chat_id, question)
+        if message_id is not None:
+            prompt.prompt_message_id = message_id
+            await self.storage.save_pending_prompt(prompt.model_dump(mode="json"))
+        return prompt
+
+    async def attach(self) -> int:
+        """Reload pending prompts and take the replies no live waiter claims."""
+        restored = await self.rehydrate()
+        self.telegram_bot.on_unclaimed_message(self.handle_reply)
+        return restored
+
+    async def rehydrate(self) -> int:
+        self._by_chat.clear()
+        now = self._clock()
+        restored = 0
+        for row in await self.storage.get_pending_prompts():
+            prompt = PendingPrompt.model_validate(row)
+            if prompt.deadline <= now:
+                await self._expire(prompt)
+                continue
+            self._remember(prompt)
+            restored += 1
+        return restored
+
+    async def expire_overdue(self) -> int:
+        now = self._clock()
+        overdue = [
+            prompt
+            for prompts in self._by_chat.values()
+            for prompt in prompts
+            if prompt.deadline <= now
+        ]
+        for prompt in overdue:
+            self._forget(prompt)
+            await self._expire(prompt)
+        return len(overdue)
+
+    def pending_for_chat(self, chat_id: int) -> list[PendingPrompt]:
+        return list(self._by_chat.get(chat_id, ()))
+
+    async def handle_reply(self, chat_id: int, message: dict[str, Any]) -> bool:
+        reply_to = message.get("reply_to_message_id")
+        matched = self._match(chat_id, reply_to)
+        if not matched:
+            await self.rehydrate()
+            matched = self._match(chat_id, reply_to)
+            if not matched:
+                return False
+        text = str(message.get("text", "")).strip()
+        for prompt in matched:
+            self._forget(prompt)
+            if prompt.deadline <= self._clock():
+                await self._expire(prompt)
+                continue
+            await self.storage.delete_pending_prompt(prompt.application_id)
+            try:
+                await self._deliver(prompt, text)
+            except InvalidStatusTransition:
+                pass  # Resolved while the question was open; the reply has nowhere to go.
+        return True
+
+    async def _deliver(self, prompt: PendingPrompt, text: str) -> None:
+        if prompt.answer_type == AnswerType.OTP:
+            await self.job_handler.handle_otp(prompt.application_id, text)
+        elif prompt.fields is not None:
+            answers = QuestionRoundService.answers_from_reply(
+                text, prompt.question_count or len(prompt.fields), prompt.fields
+            )
+            await self.job_handler.handle_answers(prompt.application_id, answers)
+        else:
+            await self.job_handler.handle_user_response(prompt.application_id, text)
+
+    def _match(self, chat_id: int, reply_to: int | None) -> list[PendingPrompt]:
+        prompts = self._by_chat.get(chat_id)
+        if not prompts:
+            return []
+        if reply_to is not None:
+            return [prompt for prompt in prompts if prompt.prompt_message_id == reply_to]
+        # A question round is one message shared by several applications.
+        first = prompts[0]
+        if first.prompt_message_id is None:
+            return [first]
+        return [prompt for prompt in prompts if prompt.prompt_message_id == first.prompt_message_id]
+
+    async def _expire(self, prompt: PendingPrompt) -> None:
+        await self.storage.delete_pending_prompt(prompt.application_id)
+        try:
+            await self.storage.transition_application(
+                prompt.application_id,
+                "failed",
+                {"reason": "user_input_timeout"},
+                event_type="user_input_timeout",
+                event_data={"reason": "user_input_timeout", "question": prompt.question},
+            )
+        except InvalidStatusTransition:
+            pass  # Already cancelled or finished; only the prompt had to go.
+
+    def _remember(self, prompt: PendingPrompt) -> None:
+        prompts = self._by_chat.setdefault(prompt.chat_id, [])
+        prompts[:] = [p for p in prompts if p.application_id != prompt.application_id]
+        prompts.append(prompt)
+
+    def _forget(self, prompt: PendingPrompt) -> None:
+        prompts = self._by_chat.get(prompt.chat_id)
+        if prompts is None:
+            return
+        prompts[:] = [p for p in prompts if p.application_id != prompt.application_id]
+        if not prompts:
+            del self._by_chat[prompt.chat_id]
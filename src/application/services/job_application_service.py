@@ -2,16 +2,58 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any
 
+from src.application.services.question_round_service import (
+    QuestionRoundService,
+    QuestionRoundTimeout,
+)
 from src.domain.interfaces.browser import IBrowserAutomation
 from src.domain.interfaces.handlers import (
     IAuthenticationHandler,
     IFormFiller,
     IJobApplicationHandler,
 )
-from src.domain.interfaces.storage import IStorage
+from src.domain.interfaces.storage import IFormDataProvider, IStorage
 from src.domain.interfaces.telegram import ITelegramBot
+from src.domain.models.job_application import (
+    FINISHED_STATUSES,
+    ApplicationStep,
+    DuplicateApplication,
+)
+from src.domain.models.user_profile import flatten_profile
+
+_CHECKPOINT = "checkpoint"
+_STEP_ORDER = {step: index for index, step in enumerate(ApplicationStep)}
+_CONFIRM = frozenset({"yes", "y"})
+_DENY = frozenset({"no", "n"})
+
+
+def _field_key(field_info: dict[str, Any]) -> str:
+    return str(field_info.get("name") or field_info.get("label") or "")
+
+
+@dataclass
+class _Run:
+    """One pass over an application, seeded from its stored checkpoint."""
+
+    application_id: int
+    user_id: int
+    job_url: str
+    checkpoint: dict[str, Any]
+
+    @property
+    def step(self) -> ApplicationStep | None:
+        step = self.checkpoint.get("step")
+        return None if step is None else ApplicationStep(step)
+
+    @step.setter
+    def step(self, step: ApplicationStep) -> None:
+        self.checkpoint["step"] = step
+
+    def reached(self, step: ApplicationStep) -> bool:
+        return self.step is not None and _STEP_ORDER[self.step] >= _STEP_ORDER[step]
 
 
 class JobApplicationService(IJobApplicationHandler):
@@ -24,64 +66,266 @@ class JobApplicationService(IJobApplicationHandler):
         form_filler: IFormFiller,
         auth_handler: IAuthenticationHandler,
         telegram_bot: ITelegramBot,
+        question_round: QuestionRoundService | None = None,
     ) -> None:
         self.storage = storage
         self.browser = browser
         self.form_filler = form_filler
         self.auth_handler = auth_handler
         self.telegram_bot = telegram_bot
+        self.question_round = question_round
 
     async def start_application(self, user_id: int, job_url: str) -> int:
-        application_id = await self.storage.create_job_application(user_id, job_url)
-        await self.storage.update_job_application(application_id, "in_progress")
-        return application_id
+        existing = await self.storage.find_job_application(user_id, job_url)
+        if existing is None:
+            try:
+                application_id = await self.storage.create_job_application(user_id, job_url)
+            except DuplicateApplication as exc:
+                # A concurrent start created it first; handle it like one found above.
+                existing = await self.storage.get_job_application(exc.application_id)
+                if existing is None:
+                    return exc.application_id
+            else:
+                await self.storage.transition_application(application_id, "in_progress")
+                return application_id
+        # Only a failed attempt is worth another run; one still pending is started,
+        # and anything else is returned as is.
+        if existing["status"] == "failed":
+            await self.storage.transition_application(
+                existing["id"], "pending", event_type="retried", event_data={"job_url": job_url}
+            )
+        if existing["status"] in ("failed", "pending"):
+            await self.storage.transition_application(existing["id"], "in_progress")
+        return int(existing["id"])
 
     async def process_application(self, application_id: int) -> dict[str, str]:
+        """Run the application from its last checkpoint.
+
+        Each step records a checkpoint under ``metadata["checkpoint"]`` in the
+        same transition as its history event. Navigation and filling are tied
+        to the live page, so they are only skipped while the browser is still
+        on the checkpointed URL; collected answers survive a restart and are
+        refilled instead of asked again. The submit button is never clicked
+        twice: a run that stopped between clicking and recording the result is
+        handed to the user to confirm through ``handle_user_response``.
+        """
         application = await self.storage.get_job_application(application_id)
         if application is None:
             return {"status": "failed", "message": "Application not found"}
-        await self.browser.navigate(application["job_url"])
-
-        if await self.auth_handler.detect_login_required():
-            await self.storage.update_job_application(application_id, "awaiting_user_input", {"reason": "login_required"})
-            return {"status": "awaiting_user_input", "message": "Login required"}
-
-        profile = await self.storage.get_user_profile(application["user_id"]) or {}
-        form_data = self._flatten_profile(profile)
-        unmatched = await self.form_filler.fill_form(form_data)
-        await self.storage.add_application_history(application_id, "form_filled", {"unmatched": unmatched})
-        submitted = await self.form_filler.submit_form()
-        if submitted:
-            await self.storage.update_job_application(application_id, "completed")
+        if application["status"] in FINISHED_STATUSES:
+            return {"status": application["status"], "message": "Application already finished"}
+        run = self._run(application)
+        if run.reached(ApplicationStep.SUBMITTED):
+            if application["status"] != "completed":
+                await self.storage.transition_application(application_id, "completed")
             return {"status": "completed", "message": "Application submitted"}
-        await self.storage.update_job_application(application_id, "failed", {"reason": "submit_button_not_found"})
-        return {"status": "failed", "message": "Unable to submit"}
+        if run.reached(ApplicationStep.SUBMITTING):
+            await self.storage.transition_application(
+                application_id, "awaiting_user_input", {"reason": "submission_unconfirmed"}
+            )
+            return {"status": "awaiting_user_input", "message": "Submission needs confirmation"}
+
+        page_alive = run.step is not None and run.checkpoint.get("page_url") == (
+            await self.browser.get_current_url()
+        )
+        steps = (
+            (ApplicationStep.NAVIGATED, page_alive, self._navigate),
+            (ApplicationStep.FIELDS_FILLED, page_alive, self._fill_fields),
+            (ApplicationStep.ANSWERED, True, self._collect_answers),
+        )
+        for step, skippable, action in steps:
+            if skippable and run.reached(step):
+                continue
+            result = await action(run)
+            if result is not None:
+                return result
+        return await self._submit(run)
 
     async def handle_user_response(self, application_id: int, response: str) -> dict[str, str]:
-        await self.storage.add_application_history(application_id, "user_response", {"response": response})
-        await self.storage.update_job_application(application_id, "in_progress")
+        application = await self.storage.get_job_application(application_id)
+        if application is not None and application["status"] not in FINISHED_STATUSES:
+            run = self._run(application)
+            if run.step == ApplicationStep.SUBMITTING:
+                return await self._confirm_submission(run, response)
+        await self.storage.transition_application(
+            application_id,
+            "in_progress",
+            event_type="user_response",
+            event_data={"response": response},
+        )
         return {"status": "in_progress", "message": "Response recorded"}
 
+    async def handle_answers(self, application_id: int, answers: dict[str, str]) -> dict[str, str]:
+        application = await self.storage.get_job_application(application_id)
+        if application is None or application["status"] in FINISHED_STATUSES:
+            return await self.process_application(application_id)
+        run = self._run(application)
+        # A page that is still open has its other fields filled already; a
+        # reloaded one is refilled from the merged checkpoint answers.
+        if run.step is not None and run.checkpoint.get("page_url") == (
+            await self.browser.get_current_url()
+        ):
+            await self._fill_answers(run.checkpoint.get("unmatched") or [], answers)
+        await self.storage.transition_application(
+            application_id,
+            "in_progress",
+            {_CHECKPOINT: {"answers": answers}},
+            event_type="answers_received",
+            event_data={"answers": answers},
+        )
+        return await self.process_application(application_id)
+
     async def handle_otp(self, application_id: int, otp_code: str) -> dict[str, str]:
         accepted = await self.auth_handler.submit_otp(otp_code)
         status = "in_progress" if accepted else "awaiting_otp"
-        await self.storage.update_job_application(application_id, status)
-        await self.storage.add_application_history(application_id, "otp_submitted", {"accepted": accepted})
+        await self.storage.transition_application(
+            application_id, status, event_type="otp_submitted", event_data={"accepted": accepted}
+        )
         return {"status": status}
 
     async def cancel_application(self, application_id: int) -> None:
-        await self.storage.update_job_application(application_id, "cancelled")
-        await self.storage.add_application_history(application_id, "cancelled", {})
-
-    def _flatten_profile(self, profile: dict[str, Any]) -> dict[str, Any]:
-        flattened: dict[str, Any] = {}
-        for section in ("personal_info", "work_authorization"):
-            section_data = profile.get(section)
-            if isinstance(section_data, dict):
-                flattened.update(section_data)
-        skills = profile.get("skills")
-        if isinstance(skills, dict):
-            technical = skills.get("technical_skills") or []
-            if isinstance(technical, list):
-                flattened["skills"] = ", ".join(str(item) for item in technical)
-        return flattened
+        await self.storage.transition_application(
+            application_id, "cancelled", event_type="cancelled"
+        )
+
+    @staticmethod
+    def _run(application: dict[str, Any]) -> _Run:
+        return _Run(
+            application["id"],
+            application["user_id"],
+            application["job_url"],
+            dict((application.get("metadata") or {}).get(_CHECKPOINT) or {}),
+        )
+
+    async def _confirm_submission(self, run: _Run, response: str) -> dict[str, str]:
+        # "yes": the click went through. "no": nothing was sent, so submit again.
+        answer = response.strip().lower()
+        if answer not in _CONFIRM | _DENY:
+            await self.storage.transition_application(
+                run.application_id,
+                "awaiting_user_input",
+                event_type="user_response",
+                event_data={"response": response},
+            )
+            return {"status": "awaiting_user_input", "message": "Reply yes or no"}
+        confirmed = answer in _CONFIRM
+        await self.storage.transition_application(
+            run.application_id,
+            "in_progress",
+            None if confirmed else {_CHECKPOINT: {"step": ApplicationStep.ANSWERED}},
+            event_type="submission_confirmed" if confirmed else "submission_denied",
+            event_data={"response": response},
+        )
+        if confirmed:
+            await self._checkpoint(run, ApplicationStep.SUBMITTED, "completed")
+            return {"status": "completed", "message": "Application submitted"}
+        return await self.process_application(run.application_id)
+
+    async def _form_data(self, user_id: int) -> dict[str, Any]:
+        if isinstance(self.storage, IFormDataProvider):
+            return await self.storage.get_form_data(user_id)
+        return flatten_profile(await self.storage.get_user_profile(user_id) or {})
+
+    async def _checkpoint(
+        self,
+        run: _Run,
+        step: ApplicationStep,
+        status: str = "in_progress",
+        metadata: dict[str, Any] | None = None,
+        **data: Any,
+    ) -> None:
+        # The furthest step is kept, so refilling a reloaded page does not forget answers.
+        if not run.reached(step):
+            run.step = step
+        run.checkpoint.update(data, step=run.step)
+        await self.storage.transition_application(
+            run.application_id,
+            status,
+            {**(metadata or {}), _CHECKPOINT: {**data, "step": run.step}},
+            event_type=step.value,
+            event_data=data,
+        )
+
+    async def _navigate(self, run: _Run) -> dict[str, str] | None:
+        await self.browser.navigate(run.job_url)
+        if await self.auth_handler.detect_login_required():
+            await self.storage.transition_application(
+                run.application_id, "awaiting_user_input", {"reason": "login_required"}
+            )
+            return {"status": "awaiting_user_input", "message": "Login required"}
+        await self._checkpoint(
+            run, ApplicationStep.NAVIGATED, page_url=await self.browser.get_current_url()
+        )
+        return None
+
+    async def _fill_fields(self, run: _Run) -> None:
+        unmatched = await self.form_filler.fill_form(await self._form_data(run.user_id))
+        await self._fill_answers(unmatched, run.checkpoint.get("answers") or {})
+        await self._checkpoint(run, ApplicationStep.FIELDS_FILLED, unmatched=unmatched)
+
+    async def _collect_answers(self, run: _Run) -> dict[str, str] | None:
+        known = run.checkpoint.get("answers") or {}
+        missing = [
+            field_info
+            for field_info in run.checkpoint.get("unmatched") or []
+            if _field_key(field_info) not in known
+        ]
+        answers: dict[str, Any] = {}
+        if missing and self.question_round is not None:
+            user = await self.storage.get_user(run.user_id)
+            chat_id = user.get("telegram_chat_id") if user else None
+            if chat_id is not None:
+                await self._checkpoint(
+                    run,
+                    ApplicationStep.ANSWERS_PENDING,
+                    "awaiting_user_input",
+                    {"reason": "unmatched_fields"},
+                    pending=[_field_key(field_info) for field_info in missing],
+                )
+                try:
+                    answers = await self.question_round.ask(run.application_id, chat_id, missing)
+                except QuestionRoundTimeout:
+                    return await self._park_unanswered(run, missing, known)
+                await self._fill_answers(missing, answers)
+                unanswered = [f for f in missing if _field_key(f) not in answers]
+                if unanswered:
+                    return await self._park_unanswered(run, unanswered, {**known, **answers})
+        await self._checkpoint(run, ApplicationStep.ANSWERED, answers={**known, **answers})
+        return None
+
+    async def _park_unanswered(
+        self, run: _Run, unanswered: list[dict[str, Any]], answers: dict[str, Any]
+    ) -> dict[str, str]:
+        # Never submit with questions open; the answers so far are kept and the
+        # next run only asks for the rest.
+        run.checkpoint["answers"] = answers
+        await self.storage.transition_application(
+            run.application_id,
+            "awaiting_user_input",
+            {"reason": "questions_unanswered", _CHECKPOINT: {"answers": answers}},
+            event_type="questions_unanswered",
+            event_data={"pending": [_field_key(f) for f in unanswered]},
+        )
+        return {"status": "awaiting_user_input", "message": "Questions unanswered"}
+
+    async def _submit(self, run: _Run) -> dict[str, str]:
+        previous = run.step
+        await self._checkpoint(run, ApplicationStep.SUBMITTING)
+        if await self.form_filler.submit_form():
+            await self._checkpoint(run, ApplicationStep.SUBMITTED, "completed")
+            return {"status": "completed", "message": "Application submitted"}
+        # Nothing was sent, so a retry may submit again from the previous step.
+        await self.storage.transition_application(
+            run.application_id,
+            "failed",
+            {"reason": "submit_button_not_found", _CHECKPOINT: {"step": previous}},
+            event_type="submit_failed",
+            event_data={"reason": "submit_button_not_found"},
+        )
+        return {"status": "failed", "message": "Unable to submit"}
+
+    async def _fill_answers(self, fields: list[dict[str, Any]], answers: dict[str, Any]) -> None:
+        for field_info in fields:
+            value = answers.get(_field_key(field_info))
+            if value is not None:
+                await self.form_filler.fill_field(field_info, value)
@@ -0,0 +1,220 @@
+"""Batch unresolved form fields into a single question round per chat."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from src.domain.interfaces.storage import IStorage
+from src.domain.interfaces.telegram import ITelegramBot
+from src.domain.models.pending_prompt import PendingPrompt
+
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[:.)\-]\s*(.*)$")
+
+
+class QuestionRoundTimeout(TimeoutError):
+    """Raised to every application in a round the user did not answer in time."""
+
+    def __init__(self, chat_id: int, timeout: float) -> None:
+        super().__init__(f"No reply in chat {chat_id} within {timeout:.0f}s")
+        self.chat_id = chat_id
+        self.timeout = timeout
+
+
+@dataclass
+class _Question:
+    application_id: int
+    field: dict[str, Any]
+
+    @property
+    def name(self) -> str:
+        return str(self.field.get("name") or self.field.get("label") or "")
+
+    @property
+    def label(self) -> str:
+        return str(self.field.get("label") or self.field.get("name") or "field")
+
+    @property
+    def options(self) -> list[str]:
+        return [str(option) for option in self.field.get("options") or []]
+
+
+@dataclass
+class _Round:
+    questions: list[_Question] = field(default_factory=list)
+    waiters: dict[int, asyncio.Future[dict[str, str]]] = field(default_factory=dict)
+    flush_task: asyncio.Task[None] | None = None
+
+
+class QuestionRoundService:
+    """Collects unmatched fields and asks for all of them in one message.
+
+    Fields submitted for the same chat within ``window`` seconds, from any
+    number of applications, are merged into one numbered message. The user
+    answers with one line per number (``1: Jane``, ``2) yes``), and the reply is
+    split back into per-field answers for each application, so every
+    application costs one round trip instead of one per field. The message
+    asks for a reply, and only a reply to it is read as the answers; with
+    no reply within ``timeout`` every waiting application gets
+    ``QuestionRoundTimeout``.
+
+    With ``storage``, each application's part of a round is saved as a
+    pending prompt once the message is sent and removed when the reply is
+    read, so a reply that comes after the timeout or a restart can still be
+    routed by ConversationStateService; it stays valid for ``prompt_ttl``.
+    """
+
+    def __init__(
+        self,
+        telegram_bot: ITelegramBot,
+        window: float = 2.0,
+        timeout: float = 600.0,
+        storage: IStorage | None = None,
+        prompt_ttl: float = 86400.0,
+    ) -> None:
+        self.telegram_bot = telegram_bot
+        self.window = window
+        self.timeout = timeout
+        self.storage = storage
+        self.prompt_ttl = prompt_ttl
+        self._rounds: dict[int, _Round] = {}
+        self.rounds_sent = 0
+        self.questions_asked = 0
+
+    async def ask(
+        self,
+        application_id: int,
+        chat_id: int,
+        fields: list[dict[str, Any]],
+    ) -> dict[str, str]:
+        if not fields:
+            return {}
+        current = self._rounds.get(chat_id)
+        if current is None:
+            current = self._rounds[chat_id] = _Round()
+            current.flush_task = asyncio.get_running_loop().create_task(
+                self._flush_later(chat_id, current)
+            )
+        current.questions.extend(_Question(application_id, item) for item in fields)
+        waiter = current.waiters.get(application_id)
+        if waiter is None:
+            waiter = current.waiters[application_id] = asyncio.get_running_loop().create_future()
+        return await asyncio.shield(waiter)
+
+    async def _flush_later(self, chat_id: int, current: _Round) -> None:
+        await asyncio.sleep(self.window)
+        if self._rounds.get(chat_id) is current:
+            del self._rounds[chat_id]
+        try:
+            answers = await self._run_round(chat_id, current.questions)
+        except Exception as exc:
+            for waiter in current.waiters.values():
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            return
+        for application_id, waiter in current.waiters.items():
+            if not waiter.done():
+                waiter.set_result(answers.get(application_id, {}))
+
+    async def _run_round(
+        self, chat_id: int, questions: list[_Question]
+    ) -> dict[int, dict[str, str]]:
+        self.rounds_sent += 1
+        self.questions_asked += len(questions)
+        text = self.format_round(questions)
+        numbered: dict[int, list[dict[str, Any]]] = {}
+        for number, question in enumerate(questions, start=1):
+            numbered.setdefault(question.application_id, []).append(
+                {"number": number, "name": question.name, "options": question.options}
+            )
+
+        async def save_prompts(message_id: int) -> None:
+            assert self.storage is not None
+            now = datetime.now(UTC)
+            for application_id, fields in numbered.items():
+                prompt = PendingPrompt(
+                    application_id=application_id,
+                    chat_id=chat_id,
+                    question=text,
+                    prompt_message_id=message_id,
+                    fields=fields,
+                    question_count=len(questions),
+                    created_at=now,
+                    deadline=now + timedelta(seconds=self.prompt_ttl),
+                )
+                await self.storage.save_pending_prompt(prompt.model_dump(mode="json"))
+
+        reply = await self.telegram_bot.ask(
+            chat_id,
+            text,
+            timeout=self.timeout,
+            on_sent=None if self.storage is None else save_prompts,
+        )
+        if reply is None:
+            # The prompts stay so a late reply can still be routed.
+            raise QuestionRoundTimeout(chat_id, self.timeout)
+        if self.storage is not None:
+            for application_id in numbered:
+                await self.storage.delete_pending_prompt(application_id)
+        reply_text = str(reply.get("text", ""))
+        return {
+            application_id: self.answers_from_reply(reply_text, len(questions), fields)
+            for application_id, fields in numbered.items()
+        }
+
+    @staticmethod
+    def format_round(questions: list[_Question]) -> str:
+        multiple_applications = len({q.application_id for q in questions}) > 1
+        lines = ['I need a few more details. Reply with one line per number, e.g. "1: answer".']
+        for number, question in enumerate(questions, start=1):
+            line = f"{number}. {question.label}"
+            if multiple_applications:
+                line += f" (application #{question.application_id})"
+            if question.options:
+                choices = ", ".join(
+                    f"{index}) {option}" for index, option in enumerate(question.options, start=1)
+                )
+                line += f" [{choices}]"
+            lines.append(line)
+        return "\n".join(lines)
+
+    @staticmethod
+    def parse_reply(text: str, count: int) -> dict[int, str]:
+        answers: dict[int, str] = {}
+        current: int | None = None
+        for line in text.splitlines():
+            match = _NUMBERED_LINE.match(line)
+            if match:
+                number = int(match.group(1))
+                current = number if 1 <= number <= count else None
+                if current is not None:
+                    answers[current] = match.group(2).strip()
+            elif current is not None and line.strip():
+                answers[current] = f"{answers[current]}\n{line.strip()}".strip()
+        if not answers and count == 1 and text.strip():
+            answers[1] = text.strip()
+        return {number: answer for number, answer in answers.items() if answer}
+
+    @classmethod
+    def answers_from_reply(
+        cls, text: str, count: int, fields: list[dict[str, Any]]
+    ) -> dict[str, str]:
+        """Answers in a reply to a round of ``count`` questions for ``fields``.
+
+        Each field carries its ``number`` in the round, its ``name`` and any
+        ``options``; a numeric answer to a field with options picks that option.
+        """
+        parsed = cls.parse_reply(text, count)
+        answers: dict[str, str] = {}
+        for item in fields:
+            answer = parsed.get(item["number"])
+            if answer is None:
+                continue
+            options = item.get("options") or []
+            if options and answer.isdigit() and 1 <= int(answer) <= len(options):
+                answer = options[int(answer) - 1]
+            answers[item["name"]] = answer
+        return answers
@@ -0,0 +1,177 @@
+"""Stream job URLs from a file or stdin through the application scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from collections.abc import AsyncIterator
+from typing import Any, TextIO
+
+from src.application.services.application_scheduler import ApplicationScheduler
+from src.utils.urls import validate_job_url
+
+_READ_HINT = 64 * 1024
+
+
+def parse_job_line(line: str, default_priority: int = 0) -> tuple[str, int] | None:
+    """
+    Parse one input line: a bare URL or a JSON object with ``url`` and ``priority``.
+
+    Args:
+        line: Raw input line
+        default_priority: Priority for lines that do not set one
+
+    Returns:
+        (job_url, priority), or None for blank and ``#`` comment lines
+
+    Raises:
+        ValueError: If the line is neither an http(s) URL nor a valid JSON job
+    """
+    text = line.strip()
+    if not text or text.startswith("#"):
+        return None
+    if text.startswith("{"):
+        try:
+            entry = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON line: {exc}") from exc
+        url = str(entry.get("url") or entry.get("job_url") or "")
+        priority = int(entry.get("priority", default_priority))
+    else:
+        url, priority = text, default_priority
+    if not url.startswith(("http://", "https://")):
+        raise ValueError(f"Not a job URL: {text[:80]!r}")
+    validate_job_url(url)
+    return url, priority
+
+
+async def read_lines(stream: TextIO) -> AsyncIterator[str]:
+    """Yield lines read in ~64 KiB batches off the event loop, never the whole input."""
+    while True:
+        lines = await asyncio.to_thread(stream.readlines, _READ_HINT)
+        if not lines:
+            return
+        for line in lines:
+            yield line
+
+
+def _line_start(stream: TextIO) -> str:
+    """Carriage return plus erase-line on terminals; nothing for files and pipes."""
+    return "\r\033[K" if stream.isatty() else ""
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class ProgressLine:
+    """Reports throughput and ETA while the batch runs.
+
+    On a terminal one status line is rewritten in place every second; when
+    ``out`` is redirected, a plain line is appended every ``plain_interval``
+    seconds instead so logs stay readable.
+    """
+
+    def __init__(
+        self,
+        scheduler: ApplicationScheduler,
+        out: TextIO = sys.stderr,
+        plain_interval: float = 30.0,
+    ) -> None:
+        self.scheduler = scheduler
+        self.out = out
+        self.tty = out.isatty()
+        self.plain_interval = plain_interval
+        self.started = time.monotonic()
+        self.input_done = False
+
+    def render(self) -> str:
+        stats = self.scheduler.stats()
+        elapsed = time.monotonic() - self.started
+        rate = stats["finished"] / elapsed if elapsed else 0.0
+        remaining = stats["submitted"] - stats["finished"]
+        # Until the input is exhausted the total is unknown, so the ETA is a lower bound.
+        eta = _duration(remaining / rate) if rate else "--:--:--"
+        return (
+            f"{stats['finished']}/{stats['submitted']}{'' if self.input_done else '+'} done, "
+            f"{stats['active']} running, {rate * 60:.1f}/min, ETA {eta}"
+        )
+
+    async def run(self, interval: float = 1.0) -> None:
+        while self.tty:
+            self.out.write(f"\r\033[K{self.render()}")
+            self.out.flush()
+            await asyncio.sleep(interval)
+        while True:
+            await asyncio.sleep(self.plain_interval)
+            self.out.write(f"{self.render()}\n")
+            self.out.flush()
+
+    def finish(self) -> None:
+        self.out.write(f"{_line_start(self.out)}{self.render()}\n")
+        self.out.flush()
+
+
+async def bulk_apply(
+    scheduler: ApplicationScheduler,
+    user_id: int,
+    stream: TextIO,
+    default_priority: int = 0,
+    max_pending: int = 100,
+    progress: ProgressLine | None = None,
+    errors: TextIO = sys.stderr,
+) -> dict[str, Any]:
+    """
+    Submit every job in ``stream`` for ``user_id`` and wait for all of them.
+
+    At most ``max_pending`` entries wait in the scheduler at any time; reading
+    pauses until it catches up, so memory stays flat for any input size.
+
+    Returns:
+        Scheduler stats plus ``rejected`` (unparseable lines) and ``elapsed_s``
+    """
+    started = time.monotonic()
+    rejected = 0
+    await scheduler.start()
+    reporter = None if progress is None else asyncio.create_task(progress.run())
+    try:
+        number = 0
+        async for line in read_lines(stream):
+            number += 1
+            try:
+                job = parse_job_line(line, default_priority)
+            except ValueError as exc:
+                rejected += 1
+                errors.write(f"{_line_start(errors)}line {number}: {exc}\n")
+                continue
+            if job is None:
+                continue
+            await scheduler.wait_queued_below(max_pending)
+            await scheduler.submit(user_id, *job)
+        if progress is not None:
+            progress.input_done = True
+        await scheduler.drain()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+        await scheduler.stop()
+    if progress is not None:
+        progress.finish()
+    return {**scheduler.stats(), "rejected": rejected, "elapsed_s": time.monotonic() - started}
+
+
+def format_summary(result: dict[str, Any]) -> str:
+    lines = [
+        f"Processed {result['finished']} of {result['submitted']} jobs "
+        f"in {_duration(result['elapsed_s'])}"
+    ]
+    lines.extend(f"  {status}: {count}" for status, count in sorted(result["by_status"].items()))
+    for key in ("skipped", "errors", "rejected"):
+        if result[key]:
+            lines.append(f"  {key}: {result[key]}")
+    return "\n".join(lines)
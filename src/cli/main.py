@@ -4,17 +4,34 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import sys
+from collections.abc import Callable
 
+from src.application.services.application_scheduler import ApplicationScheduler
+from src.application.services.browser_session_handler import BrowserSessionHandler
+from src.application.services.conversation_state_service import ConversationStateService
+from src.application.services.job_application_service import JobApplicationService
 from src.application.services.onboarding_service import OnboardingInput, OnboardingService
+from src.application.services.question_round_service import QuestionRoundService
 from src.application.services.resume_parser_service import ResumeParserService
+from src.cli.bulk_apply import ProgressLine, bulk_apply, format_summary
+from src.domain.interfaces.browser import IBrowserAutomation
+from src.domain.interfaces.storage import IStorage
 from src.domain.models.user_config import UserConfig
-from src.infrastructure.storage.sqlite_storage import (
-    SQLiteStorage,  # type: ignore[import-not-found]
-)
+from src.infrastructure.browser import BrowserAuthHandler, BrowserFormFiller, PlaywrightBrowser
+from src.infrastructure.storage.sharded_storage import ShardedSQLiteStorage
+from src.infrastructure.storage.sqlite_storage import SQLiteStorage
+from src.infrastructure.telegram.telegram_bot import TelegramBot
+
+
+def build_storage(args: argparse.Namespace) -> SQLiteStorage | ShardedSQLiteStorage:
+    if args.shard_dir:
+        return ShardedSQLiteStorage(args.shard_dir)
+    return SQLiteStorage(args.db_path)
 
 
 async def run_onboarding(args: argparse.Namespace) -> None:
-    storage = SQLiteStorage(args.db_path)
+    storage = build_storage(args)
     await storage.initialize()
     service = OnboardingService(storage=storage, resume_parser=ResumeParserService())
 
@@ -34,9 +51,76 @@ async def run_onboarding(args: argparse.Namespace) -> None:
     print(f"Onboarding completed for user_id={user_id}")
 
 
+def build_application_handler(
+    storage: IStorage, telegram_bot: TelegramBot, args: argparse.Namespace
+) -> BrowserSessionHandler:
+    # Rounds are saved as pending prompts so a late reply still resumes its application.
+    question_round = QuestionRoundService(telegram_bot, storage=storage)
+
+    def make_service(browser: IBrowserAutomation) -> JobApplicationService:
+        return JobApplicationService(
+            storage,
+            browser,
+            BrowserFormFiller(browser),
+            BrowserAuthHandler(browser),
+            telegram_bot,
+            question_round,
+        )
+
+    return BrowserSessionHandler(make_service, lambda: PlaywrightBrowser(headless=not args.headed))
+
+
+async def run_apply(
+    args: argparse.Namespace,
+    handler_factory: Callable[
+        [IStorage, TelegramBot, argparse.Namespace], BrowserSessionHandler
+    ] = build_application_handler,
+) -> None:
+    storage = build_storage(args)
+    await storage.initialize()
+    try:
+        user = await storage.get_user_by_telegram_id(args.telegram_chat_id)
+        config = await storage.get_user_config(user["id"]) if user is not None else None
+        if user is None or config is None:
+            raise SystemExit(f"No user for chat {args.telegram_chat_id}; run onboard first")
+        # Questions about unmatched fields are asked and answered over Telegram.
+        telegram_bot = TelegramBot(config["telegram_bot_token"], storage=storage)
+        handler = handler_factory(storage, telegram_bot, args)
+        # Late replies to questions asked before a restart reach their application.
+        await ConversationStateService(storage, telegram_bot, handler).attach()
+        await telegram_bot.start_polling()
+        try:
+            scheduler = ApplicationScheduler(
+                handler,
+                storage,
+                max_concurrency=args.concurrency,
+                per_domain_concurrency=args.per_domain,
+                domain_spacing=args.domain_spacing,
+            )
+            stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+            with stream:
+                result = await bulk_apply(
+                    scheduler,
+                    user["id"],
+                    stream,
+                    default_priority=args.priority,
+                    max_pending=args.concurrency * 4,
+                    progress=ProgressLine(scheduler),
+                )
+        finally:
+            await handler.close()
+            await telegram_bot.stop_polling()
+        print(format_summary(result))
+    finally:
+        await storage.close()
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Apply Job Claw CLI")
     parser.add_argument("--db-path", default="apply_job_claw.db")
+    parser.add_argument(
+        "--shard-dir", help="Keep each user's applications in its own database under this directory"
+    )
 
     subparsers = parser.add_subparsers(dest="command", required=True)
     onboard = subparsers.add_parser("onboard", help="Run onboarding flow")
@@ -47,6 +131,15 @@ def build_parser() -> argparse.ArgumentParser:
     onboard.add_argument("--model-base-url", default="https://api.openai.com/v1")
     onboard.add_argument("--resume-path")
     onboard.add_argument("--cover-letter")
+
+    apply = subparsers.add_parser("apply", help="Apply to every job URL in a file or stdin")
+    apply.add_argument("input", nargs="?", default="-", help="URLs or JSONL, one per line")
+    apply.add_argument("--telegram-chat-id", type=int, required=True)
+    apply.add_argument("--concurrency", type=int, default=4)
+    apply.add_argument("--per-domain", type=int, default=2)
+    apply.add_argument("--domain-spacing", type=float, default=5.0)
+    apply.add_argument("--priority", type=int, default=0)
+    apply.add_argument("--headed", action="store_true", help="Show the browser windows")
     return parser
 
 
@@ -54,6 +147,8 @@ def main() -> None:
     args = build_parser().parse_args()
     if args.command == "onboard":
         asyncio.run(run_onboarding(args))
+    elif args.command == "apply":
+        asyncio.run(run_apply(args))
 
 
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ from .handlers import (
 )
 from .llm import ILLMClient
 from .resume_parser import IResumeParser
-from .storage import IStorage
+from .storage import IFormDataProvider, IStorage
 from .telegram import ITelegramBot
 
 __all__ = [
@@ -18,6 +18,7 @@ __all__ = [
     "ITelegramBot",
     "ILLMClient",
     "IStorage",
+    "IFormDataProvider",
     "IResumeParser",
     "IJobApplicationHandler",
     "IFormFiller",
@@ -16,6 +16,9 @@ class IJobApplicationHandler(Protocol):
         """
         Start a new job application process.
 
+        A URL for a posting the user already applied to returns the existing
+        application instead of starting another; a failed one is restarted.
+
         Args:
             user_id: User ID
             job_url: Job application URL
@@ -59,6 +62,24 @@ class IJobApplicationHandler(Protocol):
         """
         ...
 
+    @abstractmethod
+    async def handle_answers(
+        self,
+        application_id: int,
+        answers: dict[str, str],
+    ) -> dict[str, Any]:
+        """
+        Record answers to form questions and resume the application.
+
+        Args:
+            application_id: Application ID
+            answers: Answer text by field name
+
+        Returns:
+            Status dictionary
+        """
+        ...
+
     @abstractmethod
     async def handle_otp(
         self,
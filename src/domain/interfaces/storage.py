@@ -1,7 +1,9 @@
 """Storage interface."""
 
 from abc import abstractmethod
-from typing import Any, Protocol
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Protocol, runtime_checkable
 
 
 class IStorage(Protocol):
@@ -33,6 +35,19 @@ class IStorage(Protocol):
         """
         ...
 
+    @abstractmethod
+    async def get_user(self, user_id: int) -> dict[str, Any] | None:
+        """
+        Get user by ID.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            User dictionary (with telegram_chat_id) or None if not found
+        """
+        ...
+
     @abstractmethod
     async def save_user_config(
         self,
@@ -41,6 +56,7 @@ class IStorage(Protocol):
         openai_key: str,
         model_name: str,
         model_base_url: str,
+        model_routes: dict[str, str] | None = None,
     ) -> None:
         """
         Save user configuration.
@@ -51,6 +67,7 @@ class IStorage(Protocol):
             openai_key: OpenAI API key
             model_name: LLM model name
             model_base_url: Model base URL
+            model_routes: Optional mapping of task kind to model name
         """
         ...
 
@@ -176,6 +193,31 @@ class IStorage(Protocol):
 
         Returns:
             Application ID
+
+        Raises:
+            DuplicateApplication: If the user already has an application whose
+                URL canonicalizes to the same posting
+        """
+        ...
+
+    @abstractmethod
+    async def find_job_application(
+        self,
+        user_id: int,
+        job_url: str,
+    ) -> dict[str, Any] | None:
+        """
+        Find the user's application for the posting a URL points at.
+
+        URLs are compared after ``canonicalize_job_url``, so tracking
+        parameters, embed links and case differences still match.
+
+        Args:
+            user_id: User ID
+            job_url: Job application URL
+
+        Returns:
+            Application dictionary or None if the posting was never applied to
         """
         ...
 
@@ -189,10 +231,44 @@ class IStorage(Protocol):
         """
         Update job application status.
 
+        Equivalent to ``transition_application`` without a history event.
+
         Args:
             application_id: Application ID
             status: Application status
             metadata: Optional metadata dictionary
+
+        Raises:
+            InvalidStatusTransition: If the current status cannot move to ``status``
+        """
+        ...
+
+    @abstractmethod
+    async def transition_application(
+        self,
+        application_id: int,
+        status: str,
+        metadata: dict[str, Any] | None = None,
+        event_type: str | None = None,
+        event_data: dict[str, Any] | None = None,
+    ) -> bool:
+        """
+        Move an application to a new status and record an event atomically.
+
+        The status check, the update and the history event are one transaction.
+
+        Args:
+            application_id: Application ID
+            status: New application status
+            metadata: Optional metadata to merge into the application
+            event_type: Optional history event type to record with the change
+            event_data: Event data dictionary (defaults to empty)
+
+        Returns:
+            True if the application was updated, False if it does not exist
+
+        Raises:
+            InvalidStatusTransition: If the current status cannot move to ``status``
         """
         ...
 
@@ -227,6 +303,62 @@ class IStorage(Protocol):
         """
         ...
 
+    @abstractmethod
+    async def query_applications(
+        self,
+        user_id: int,
+        statuses: Sequence[str] | None = None,
+        ats_domain: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Get one page of a user's applications, newest first.
+
+        Args:
+            user_id: User ID
+            statuses: Only include applications in one of these statuses
+            ats_domain: Only include applications on this job board host
+            started_after: Only include applications started at or after this time
+            started_before: Only include applications started before this time
+            limit: Maximum number of applications in the page
+            cursor: ``next_cursor`` of the previous page, or None for the first page
+
+        Returns:
+            Dictionary with ``items`` (application dictionaries) and
+            ``next_cursor`` (None when there are no more pages)
+        """
+        ...
+
+    @abstractmethod
+    async def get_application_stats(
+        self,
+        user_id: int,
+        since: datetime | None = None,
+        ats_domain: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Get aggregate application statistics for a user.
+
+        A retried application counts only under its latest outcome. Failures
+        are grouped by the ``reason`` in the ``event_data`` of the transition
+        to ``failed``.
+
+        Args:
+            user_id: User ID
+            since: Only count activity on or after this day
+            ats_domain: Only count applications on this job board host
+
+        Returns:
+            Dictionary with ``started``, per terminal status counts and
+            ``success_rate`` overall and under ``by_domain``, plus
+            ``median_duration_s``, ``duration_histogram`` (``le``/``count``
+            buckets) and the most common ``failure_reasons``
+        """
+        ...
+
     @abstractmethod
     async def add_application_history(
         self,
@@ -259,3 +391,130 @@ class IStorage(Protocol):
             List of history event dictionaries
         """
         ...
+
+    @abstractmethod
+    async def get_telegram_file_id(
+        self,
+        bot_id: int,
+        content_hash: str,
+        media_type: str,
+    ) -> str | None:
+        """
+        Get the Telegram file_id of previously uploaded content.
+
+        Args:
+            bot_id: Telegram bot ID (file_ids are only valid for the uploading bot)
+            content_hash: SHA-256 hex digest of the file content
+            media_type: Media type the file was sent as (document, photo)
+
+        Returns:
+            Telegram file_id or None if the content was never uploaded
+        """
+        ...
+
+    @abstractmethod
+    async def save_telegram_file_id(
+        self,
+        bot_id: int,
+        content_hash: str,
+        media_type: str,
+        file_id: str,
+    ) -> None:
+        """
+        Remember the Telegram file_id of uploaded content.
+
+        Args:
+            bot_id: Telegram bot ID
+            content_hash: SHA-256 hex digest of the file content
+            media_type: Media type the file was sent as (document, photo)
+            file_id: Telegram file_id returned by the upload
+        """
+        ...
+
+    @abstractmethod
+    async def save_pending_prompt(self, prompt: dict[str, Any]) -> None:
+        """
+        Save (or replace) the prompt an application is waiting on.
+
+        Args:
+            prompt: Pending prompt dictionary keyed by application_id
+        """
+        ...
+
+    @abstractmethod
+    async def get_pending_prompts(self) -> list[dict[str, Any]]:
+        """
+        Get all pending prompts.
+
+        Returns:
+            List of pending prompt dictionaries
+        """
+        ...
+
+    @abstractmethod
+    async def delete_pending_prompt(self, application_id: int) -> None:
+        """
+        Delete the pending prompt of an application.
+
+        Args:
+            application_id: Application ID
+        """
+        ...
+
+    @abstractmethod
+    async def enqueue_application(
+        self,
+        user_id: int,
+        job_url: str,
+        priority: int = 0,
+    ) -> int:
+        """
+        Persist a job URL waiting to be applied to.
+
+        Args:
+            user_id: User ID
+            job_url: Job application URL
+            priority: Higher values are scheduled first
+
+        Returns:
+            Queue entry ID
+        """
+        ...
+
+    @abstractmethod
+    async def get_queued_applications(self) -> list[dict[str, Any]]:
+        """
+        Get every queued job URL, oldest first.
+
+        Returns:
+            List of queue entry dictionaries
+        """
+        ...
+
+    @abstractmethod
+    async def delete_queued_application(self, queue_id: int) -> None:
+        """
+        Remove a queue entry once it has been processed.
+
+        Args:
+            queue_id: Queue entry ID
+        """
+        ...
+
+
+@runtime_checkable
+class IFormDataProvider(Protocol):
+    """Interface for storages that can serve a user's form data directly."""
+
+    @abstractmethod
+    async def get_form_data(self, user_id: int) -> dict[str, Any]:
+        """
+        Get the flattened form data derived from the user's profile.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dictionary mapping form field names to values (empty without a profile)
+        """
+        ...
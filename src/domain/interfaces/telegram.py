@@ -15,7 +15,7 @@ class ITelegramBot(Protocol):
         text: str,
         reply_to_message_id: int | None = None,
         parse_mode: str | None = None,
-    ) -> None:
+    ) -> int | None:
         """
         Send a text message to a chat.
 
@@ -24,6 +24,9 @@ class ITelegramBot(Protocol):
             text: Message text
             reply_to_message_id: Optional message ID to reply to
             parse_mode: Optional parse mode (HTML, Markdown, etc.)
+
+        Returns:
+            ID of the sent message, if known
         """
         ...
 
@@ -106,6 +109,47 @@ class ITelegramBot(Protocol):
         """
         ...
 
+    @abstractmethod
+    async def ask(
+        self,
+        chat_id: int,
+        text: str,
+        timeout: float | None = None,
+        parse_mode: str | None = None,
+        on_sent: Callable[[int], Awaitable[None]] | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Send a question that asks for a reply and wait for that reply.
+
+        Only a message replying to the question, or a plain message when the
+        client does not thread replies, is accepted as the answer.
+
+        Args:
+            chat_id: Chat to ask in
+            text: Question text
+            timeout: Optional timeout in seconds
+            parse_mode: Optional parse mode
+            on_sent: Optional callback awaited with the question's message id
+                once it is sent; a reply arriving meanwhile is still returned
+
+        Returns:
+            Reply message dictionary or None if timeout
+        """
+        ...
+
+    @abstractmethod
+    def on_unclaimed_message(
+        self, handler: Callable[[int, dict[str, Any]], Awaitable[bool]] | None
+    ) -> None:
+        """
+        Route messages nobody is waiting for to a handler.
+
+        Args:
+            handler: Async callable taking (chat_id, message) that returns True
+                if it consumed the message, or None to remove it
+        """
+        ...
+
     @abstractmethod
     async def start_polling(self) -> None:
         """Start the bot polling loop."""
@@ -2,11 +2,21 @@
 
 from .education import Education
 from .form_field import FieldType, FormField
-from .job_application import ApplicationStatus, JobApplication
+from .job_application import (
+    ALLOWED_TRANSITIONS,
+    ApplicationStatus,
+    ApplicationStep,
+    DuplicateApplication,
+    InvalidStatusTransition,
+    JobApplication,
+    allowed_predecessors,
+)
+from .model_route import TaskKind
+from .pending_prompt import AnswerType, PendingPrompt
 from .personal_info import PersonalInfo
 from .skills import Skills
 from .user_config import UserConfig
-from .user_profile import UserProfile
+from .user_profile import UserProfile, flatten_profile
 from .work_authorization import WorkAuthorization
 from .work_experience import WorkExperience
 
@@ -20,6 +30,15 @@ __all__ = [
     "UserProfile",
     "JobApplication",
     "ApplicationStatus",
+    "ApplicationStep",
+    "ALLOWED_TRANSITIONS",
+    "InvalidStatusTransition",
+    "DuplicateApplication",
+    "allowed_predecessors",
     "FormField",
     "FieldType",
+    "TaskKind",
+    "PendingPrompt",
+    "AnswerType",
+    "flatten_profile",
 ]
@@ -19,6 +19,86 @@ class ApplicationStatus(StrEnum):
     CANCELLED = "cancelled"
 
 
+class ApplicationStep(StrEnum):
+    """Checkpointed steps of one application run, in the order they happen."""
+
+    NAVIGATED = "navigated"
+    FIELDS_FILLED = "fields_filled"
+    ANSWERS_PENDING = "answers_pending"
+    ANSWERED = "answered"
+    SUBMITTING = "submitting"
+    SUBMITTED = "submitted"
+
+
+ALLOWED_TRANSITIONS: dict[ApplicationStatus, frozenset[ApplicationStatus]] = {
+    ApplicationStatus.PENDING: frozenset(
+        {ApplicationStatus.IN_PROGRESS, ApplicationStatus.FAILED, ApplicationStatus.CANCELLED}
+    ),
+    ApplicationStatus.IN_PROGRESS: frozenset(
+        {
+            ApplicationStatus.IN_PROGRESS,
+            ApplicationStatus.AWAITING_USER_INPUT,
+            ApplicationStatus.AWAITING_OTP,
+            ApplicationStatus.COMPLETED,
+            ApplicationStatus.FAILED,
+            ApplicationStatus.CANCELLED,
+        }
+    ),
+    ApplicationStatus.AWAITING_USER_INPUT: frozenset(
+        {
+            ApplicationStatus.IN_PROGRESS,
+            ApplicationStatus.AWAITING_USER_INPUT,
+            ApplicationStatus.AWAITING_OTP,
+            ApplicationStatus.FAILED,
+            ApplicationStatus.CANCELLED,
+        }
+    ),
+    ApplicationStatus.AWAITING_OTP: frozenset(
+        {
+            ApplicationStatus.IN_PROGRESS,
+            ApplicationStatus.AWAITING_USER_INPUT,
+            ApplicationStatus.AWAITING_OTP,
+            ApplicationStatus.FAILED,
+            ApplicationStatus.CANCELLED,
+        }
+    ),
+    ApplicationStatus.COMPLETED: frozenset(),
+    ApplicationStatus.FAILED: frozenset({ApplicationStatus.PENDING}),  # retry
+    ApplicationStatus.CANCELLED: frozenset(),
+}
+
+# No run continues from these; a failed application is only retried through pending.
+FINISHED_STATUSES = frozenset(
+    {ApplicationStatus.COMPLETED, ApplicationStatus.FAILED, ApplicationStatus.CANCELLED}
+)
+
+
+class InvalidStatusTransition(ValueError):
+    """Raised when an application is moved to a status its current one cannot reach."""
+
+    def __init__(self, application_id: int, current: str, requested: str) -> None:
+        super().__init__(
+            f"Application {application_id} cannot move from {current!r} to {requested!r}"
+        )
+        self.application_id = application_id
+        self.current = current
+        self.requested = requested
+
+
+class DuplicateApplication(ValueError):
+    """Raised when a user already has an application for the same posting."""
+
+    def __init__(self, application_id: int, job_url: str) -> None:
+        super().__init__(f"Job {job_url!r} was already applied to as application {application_id}")
+        self.application_id = application_id
+        self.job_url = job_url
+
+
+def allowed_predecessors(status: ApplicationStatus) -> frozenset[ApplicationStatus]:
+    """Return every status from which ``status`` may be entered."""
+    return frozenset(source for source, targets in ALLOWED_TRANSITIONS.items() if status in targets)
+
+
 class JobApplication(BaseModel):
     """Job application model."""
 
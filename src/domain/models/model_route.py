@@ -0,0 +1,23 @@
+"""LLM task routing model."""
+
+from enum import StrEnum
+
+from .form_field import FieldType
+
+
+class TaskKind(StrEnum):
+    """Kind of LLM task, used to pick a model."""
+
+    FIELD_MAPPING = "field_mapping"
+    CLASSIFICATION = "classification"
+    EXTRACTION = "extraction"
+    LONG_FORM = "long_form"
+
+    @classmethod
+    def for_field(cls, field_type: FieldType) -> "TaskKind":
+        """Infer the task kind for answering a form field of the given type."""
+        if field_type in (FieldType.SELECT, FieldType.RADIO, FieldType.CHECKBOX):
+            return cls.CLASSIFICATION
+        if field_type == FieldType.TEXTAREA:
+            return cls.LONG_FORM
+        return cls.FIELD_MAPPING
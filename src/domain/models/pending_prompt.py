@@ -0,0 +1,51 @@
+"""Pending user prompt model."""
+
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class AnswerType(StrEnum):
+    """Kind of answer expected from the user."""
+
+    TEXT = "text"
+    OTP = "otp"
+    CHOICE = "choice"
+
+
+class PendingPrompt(BaseModel):
+    """A question sent to the user that an application is waiting on.
+
+    A prompt from a question round carries the application's ``fields``,
+    each with the ``number`` it has in the message, and the round's
+    ``question_count`` so a late reply can be split back into answers.
+    """
+
+    application_id: int
+    chat_id: int
+    question: str
+    answer_type: AnswerType = AnswerType.TEXT
+    options: list[str] | None = None
+    prompt_message_id: int | None = None
+    fields: list[dict[str, Any]] | None = None
+    question_count: int | None = None
+    created_at: datetime
+    deadline: datetime
+
+    class Config:
+        """Pydantic config."""
+
+        json_schema_extra = {
+            "example": {
+                "application_id": 42,
+                "chat_id": 123456789,
+                "question": "Enter the verification code sent to your email",
+                "answer_type": "otp",
+                "options": None,
+                "prompt_message_id": None,
+                "created_at": "2024-01-15T10:00:00Z",
+                "deadline": "2024-01-15T10:10:00Z",
+            }
+        }
@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel, SecretStr
 
+from .model_route import TaskKind
+
 
 class UserConfig(BaseModel):
     """User configuration model for API keys and LLM settings."""
@@ -10,6 +12,7 @@ class UserConfig(BaseModel):
     openai_key: SecretStr
     model_name: str
     model_base_url: str
+    model_routes: dict[TaskKind, str] = {}  # Per-task overrides of model_name
 
     class Config:
         """Pydantic config."""
@@ -20,5 +23,9 @@ class UserConfig(BaseModel):
                 "openai_key": "sk-...",
                 "model_name": "gpt-4",
                 "model_base_url": "https://api.openai.com/v1",
+                "model_routes": {
+                    "classification": "gpt-4o-mini",
+                    "long_form": "gpt-4o",
+                },
             }
         }
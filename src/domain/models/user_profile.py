@@ -1,5 +1,6 @@
 """User profile model."""
 
+from typing import Any
 
 from pydantic import BaseModel
 
@@ -44,3 +45,18 @@ class UserProfile(BaseModel):
                 "cover_letter_path": "/path/to/cover_letter.txt",
             }
         }
+
+
+def flatten_profile(profile: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a stored profile into the field name -> value map used to fill forms."""
+    flattened: dict[str, Any] = {}
+    for section in ("personal_info", "work_authorization"):
+        section_data = profile.get(section)
+        if isinstance(section_data, dict):
+            flattened.update(section_data)
+    skills = profile.get("skills")
+    if isinstance(skills, dict):
+        technical = skills.get("technical_skills") or []
+        if isinstance(technical, list):
+            flattened["skills"] = ", ".join(str(item) for item in technical)
+    return flattened
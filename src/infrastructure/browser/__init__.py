@@ -1,6 +1,8 @@
 """Browser infrastructure package."""
 
+from .auth_handler import BrowserAuthHandler
 from .form_detector import FormDetector
+from .form_filler import BrowserFormFiller
 from .playwright_browser import PlaywrightBrowser
 
-__all__ = ["PlaywrightBrowser", "FormDetector"]
+__all__ = ["PlaywrightBrowser", "FormDetector", "BrowserFormFiller", "BrowserAuthHandler"]
@@ -0,0 +1,50 @@
+"""Detect and complete login and OTP prompts through IBrowserAutomation."""
+
+from __future__ import annotations
+
+from src.domain.interfaces.browser import IBrowserAutomation
+from src.domain.interfaces.handlers import IAuthenticationHandler
+
+_PASSWORD_SELECTOR = 'input[type="password"]'
+_USERNAME_SELECTOR = (
+    'input[type="email"], input[autocomplete="username"], '
+    'input[name*="email" i], input[name*="user" i], input[name*="login" i]'
+)
+_OTP_SELECTOR = (
+    'input[autocomplete="one-time-code"], input[name*="otp" i], '
+    'input[name*="verification" i], input[name*="code" i]'
+)
+_SUBMIT_SELECTOR = 'button[type="submit"], input[type="submit"]'
+
+
+class BrowserAuthHandler(IAuthenticationHandler):
+    """Treats a visible password input as a login wall and a code input as OTP."""
+
+    def __init__(self, browser: IBrowserAutomation, timeout: float | None = 10.0) -> None:
+        self.browser = browser
+        self.timeout = timeout
+
+    async def detect_login_required(self) -> bool:
+        return await self.browser.find_element(_PASSWORD_SELECTOR) is not None
+
+    async def perform_login(self, credentials: dict[str, str]) -> bool:
+        username = credentials.get("username") or credentials.get("email")
+        if username and await self.browser.find_element(_USERNAME_SELECTOR) is not None:
+            await self.browser.fill(_USERNAME_SELECTOR, username, self.timeout)
+        await self.browser.fill(_PASSWORD_SELECTOR, credentials.get("password", ""), self.timeout)
+        await self._submit()
+        return not await self.detect_login_required()
+
+    async def detect_otp_required(self) -> bool:
+        return await self.browser.find_element(_OTP_SELECTOR) is not None
+
+    async def submit_otp(self, otp_code: str) -> bool:
+        if not await self.detect_otp_required():
+            return False
+        await self.browser.fill(_OTP_SELECTOR, otp_code.strip(), self.timeout)
+        await self._submit()
+        return not await self.detect_otp_required()
+
+    async def _submit(self) -> None:
+        await self.browser.click(_SUBMIT_SELECTOR, self.timeout)
+        await self.browser.wait_for_navigation(self.timeout)
@@ -0,0 +1,87 @@
+"""Fill detected form fields from profile data through IBrowserAutomation."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from src.domain.interfaces.browser import IBrowserAutomation
+from src.domain.interfaces.handlers import IFormFiller
+
+_SKIPPED_TYPES = frozenset({"hidden", "submit", "button", "reset", "image", "password"})
+_SUBMIT_SELECTOR = 'button[type="submit"], input[type="submit"]'
+_TRUTHY = frozenset({"yes", "y", "true", "1", "on"})
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def _as_text(value: Any) -> str:
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, list | tuple):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+class BrowserFormFiller(IFormFiller):
+    """Matches detected fields to form data by normalized name or label.
+
+    A field matches a key when their normalized forms are equal, or, failing
+    that, when the field name contains the key (``applicant_email`` takes
+    ``email``); the longest such key wins. Only required fields left without a
+    value are reported back, so optional ones never turn into questions.
+    """
+
+    def __init__(self, browser: IBrowserAutomation, timeout: float | None = 10.0) -> None:
+        self.browser = browser
+        self.timeout = timeout
+
+    async def detect_form_fields(self) -> list[dict[str, Any]]:
+        return [
+            field_info
+            for field_info in await self.browser.detect_forms()
+            if str(field_info.get("field_type", "")).lower() not in _SKIPPED_TYPES
+        ]
+
+    async def fill_field(self, field_info: dict[str, Any], value: str) -> None:
+        selector = str(field_info["selector"])
+        field_type = str(field_info.get("field_type", "text")).lower()
+        if field_type == "select":
+            await self.browser.select_option(selector, value, self.timeout)
+        elif field_type == "file":
+            await self.browser.upload_file(selector, value, self.timeout)
+        elif field_type in {"checkbox", "radio"}:
+            if value.strip().lower() in _TRUTHY:
+                await self.browser.click(selector, self.timeout)
+        else:
+            await self.browser.fill(selector, value, self.timeout)
+
+    async def fill_form(self, form_data: dict[str, Any]) -> list[dict[str, Any]]:
+        values = {_normalize(key): value for key, value in form_data.items() if value is not None}
+        unmatched: list[dict[str, Any]] = []
+        for field_info in await self.detect_form_fields():
+            value = self._match(field_info, values)
+            if value is not None:
+                await self.fill_field(field_info, _as_text(value))
+            elif field_info.get("required"):
+                unmatched.append(field_info)
+        return unmatched
+
+    async def submit_form(self) -> bool:
+        if await self.browser.find_element(_SUBMIT_SELECTOR) is None:
+            return False
+        await self.browser.click(_SUBMIT_SELECTOR, self.timeout)
+        await self.browser.wait_for_navigation(self.timeout)
+        return True
+
+    @staticmethod
+    def _match(field_info: dict[str, Any], values: dict[str, Any]) -> Any | None:
+        candidates = [_normalize(str(field_info.get(key) or "")) for key in ("name", "label")]
+        for candidate in candidates:
+            if candidate and candidate in values:
+                return values[candidate]
+        name = candidates[0]
+        contained = [key for key in values if key and key in name]
+        return values[max(contained, key=len)] if contained else None
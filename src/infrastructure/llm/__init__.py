@@ -1,5 +1,16 @@
 """LLM infrastructure package."""
 
+from .http_pool import HTTPPoolConfig, LLMClientRegistry
+from .model_router import ModelRoute, ModelRouter
 from .openai_client import OpenAIClient
+from .prompt_builder import PromptBuilder, PromptCacheStats
 
-__all__ = ["OpenAIClient"]
+__all__ = [
+    "OpenAIClient",
+    "LLMClientRegistry",
+    "HTTPPoolConfig",
+    "PromptBuilder",
+    "PromptCacheStats",
+    "ModelRouter",
+    "ModelRoute",
+]
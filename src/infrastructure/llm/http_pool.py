@@ -0,0 +1,150 @@
+"""Process-wide pooled HTTP transport shared by LLM clients."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+# openai 3.x is built on httpx2; the transport must come from the same library.
+import httpx2 as httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+@dataclass(frozen=True)
+class HTTPPoolConfig:
+    """Connection pool and timeout settings for the shared LLM transport."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+    http2: bool = False
+
+
+class _TrackingTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper counting in-flight requests for utilization stats."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self._inner = inner
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.errors = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await self._inner.handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class LLMClientRegistry:
+    """Shares one tuned connection pool across all OpenAI-compatible clients.
+
+    Clients are cached by ``(base_url, credentials)`` so users pointing at the
+    same provider with the same key reuse a single ``AsyncOpenAI`` instance, and
+    every instance rides on the same keep-alive pool regardless of key.
+    """
+
+    def __init__(self, config: HTTPPoolConfig | None = None) -> None:
+        self.config = config or HTTPPoolConfig()
+        self._transport: _TrackingTransport | None = None
+        self._http_client: httpx.AsyncClient | None = None
+        self._clients: dict[tuple[str, str], AsyncOpenAI] = {}
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            config = self.config
+            limits = httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            )
+            self._transport = _TrackingTransport(
+                httpx.AsyncHTTPTransport(limits=limits, http2=config.http2)
+            )
+            self._http_client = DefaultAsyncHttpxClient(
+                transport=self._transport,
+                timeout=httpx.Timeout(
+                    connect=config.connect_timeout,
+                    read=config.read_timeout,
+                    write=config.write_timeout,
+                    pool=config.pool_timeout,
+                ),
+            )
+            self._clients.clear()
+        return self._http_client
+
+    def get_client(self, api_key: str, base_url: str) -> AsyncOpenAI:
+        key = (base_url.rstrip("/"), hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+        http_client = self.http_client
+        client = self._clients.get(key)
+        if client is None:
+            # Retries are handled by OpenAIClient, so the SDK must not retry as well.
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=http_client,
+                max_retries=0,
+            )
+            self._clients[key] = client
+        return client
+
+    def stats(self) -> dict[str, Any]:
+        transport = self._transport
+        max_connections = self.config.max_connections
+        in_flight = transport.in_flight if transport else 0
+        peak = transport.peak_in_flight if transport else 0
+        return {
+            "clients": len(self._clients),
+            "max_connections": max_connections,
+            "requests": transport.requests if transport else 0,
+            "errors": transport.errors if transport else 0,
+            "in_flight": in_flight,
+            "peak_in_flight": peak,
+            "utilization": in_flight / max_connections if max_connections else 0.0,
+            "peak_utilization": peak / max_connections if max_connections else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._transport = None
+        self._clients.clear()
+
+
+_default_registry: LLMClientRegistry | None = None
+
+
+def get_default_registry() -> LLMClientRegistry:
+    """Return the process-level registry, creating it on first use."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = LLMClientRegistry()
+    return _default_registry
+
+
+def configure_default_registry(config: HTTPPoolConfig) -> LLMClientRegistry:
+    """Replace the process-level registry with one using ``config``.
+
+    Call this during startup, before any ``OpenAIClient`` is created; clients
+    created earlier keep using the previous pool.
+    """
+    global _default_registry
+    _default_registry = LLMClientRegistry(config)
+    return _default_registry
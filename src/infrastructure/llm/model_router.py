@@ -0,0 +1,68 @@
+"""Per-task model routing for LLM calls."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from src.domain.models.form_field import FieldType
+from src.domain.models.model_route import TaskKind
+from src.domain.models.user_config import UserConfig
+from src.utils.metrics import LatencyStats
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Model chosen for one LLM call."""
+
+    task: TaskKind
+    model: str
+    field_type: FieldType | None = None
+
+
+@dataclass(frozen=True)
+class RouteRecord:
+    """Outcome of one routed LLM call."""
+
+    route: ModelRoute
+    latency: float
+    ok: bool
+
+
+class ModelRouter:
+    """Picks a model per task kind, falling back to the default model."""
+
+    def __init__(
+        self,
+        default_model: str,
+        routes: Mapping[TaskKind, str] | None = None,
+        history_size: int = 256,
+    ) -> None:
+        self.default_model = default_model
+        self.routes: dict[TaskKind, str] = dict(routes or {})
+        self.recent: deque[RouteRecord] = deque(maxlen=history_size)
+        self._stats: dict[tuple[TaskKind, str], LatencyStats] = {}
+
+    @classmethod
+    def from_config(cls, config: UserConfig) -> ModelRouter:
+        return cls(config.model_name, config.model_routes)
+
+    def route(
+        self, task: TaskKind | None = None, field_type: FieldType | None = None
+    ) -> ModelRoute:
+        if task is None:
+            task = TaskKind.for_field(field_type) if field_type else TaskKind.FIELD_MAPPING
+        return ModelRoute(task, self.routes.get(task, self.default_model), field_type)
+
+    def record(self, route: ModelRoute, latency: float, ok: bool = True) -> None:
+        self.recent.append(RouteRecord(route, latency, ok))
+        key = (route.task, route.model)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = LatencyStats()
+        stats.record(latency, ok)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {f"{task}:{model}": stats.snapshot() for (task, model), stats in self._stats.items()}
@@ -4,20 +4,49 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
 from typing import Any, cast
 
-from openai import AsyncOpenAI
-
 from src.domain.interfaces.llm import ILLMClient
+from src.domain.models.form_field import FieldType
+from src.domain.models.model_route import TaskKind
+from src.domain.models.user_config import UserConfig
+from src.domain.models.user_profile import UserProfile
+from src.infrastructure.llm.http_pool import LLMClientRegistry, get_default_registry
+from src.infrastructure.llm.model_router import ModelRouter
+from src.infrastructure.llm.prompt_builder import PromptBuilder, PromptCacheStats
 
 
 class OpenAIClient(ILLMClient):
     """Thin async wrapper for OpenAI-compatible chat APIs."""
 
-    def __init__(self, api_key: str, model_name: str, base_url: str = "https://api.openai.com/v1") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str,
+        base_url: str = "https://api.openai.com/v1",
+        registry: LLMClientRegistry | None = None,
+        prompt_builder: PromptBuilder | None = None,
+        router: ModelRouter | None = None,
+    ) -> None:
         self.model_name = model_name
-        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        self.router = router or ModelRouter(model_name)
+        self.client = (registry or get_default_registry()).get_client(api_key, base_url)
         self.max_retries = 3
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.prompt_cache_stats = PromptCacheStats()
+
+    @classmethod
+    def from_config(
+        cls, config: UserConfig, registry: LLMClientRegistry | None = None
+    ) -> OpenAIClient:
+        return cls(
+            api_key=config.openai_key.get_secret_value(),
+            model_name=config.model_name,
+            base_url=config.model_base_url,
+            registry=registry,
+            router=ModelRouter.from_config(config),
+        )
 
     async def chat_completion(
         self,
@@ -43,13 +72,60 @@ class OpenAIClient(ILLMClient):
         for attempt in range(self.max_retries):
             try:
                 response = await self.client.chat.completions.create(**request)
-                return cast(dict[str, Any], response.model_dump())
+                result = cast(dict[str, Any], response.model_dump())
+                self.prompt_cache_stats.record(result.get("usage"))
+                return result
             except Exception:
                 if attempt == self.max_retries - 1:
                     raise
                 await asyncio.sleep(0.2 * (attempt + 1))
         return {"choices": [{"message": {"content": ""}}]}
 
+    async def complete_task(
+        self,
+        task: TaskKind | None,
+        messages: list[dict[str, str]],
+        field_type: FieldType | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        tools: list[dict[str, Any]] | None = None,
+        tool_choice: str | None = None,
+    ) -> dict[str, Any]:
+        """Run a chat completion on the model routed for ``task``/``field_type``."""
+        route = self.router.route(task, field_type)
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = await self.chat_completion(
+                messages=messages,
+                model=route.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+                tool_choice=tool_choice,
+            )
+            ok = True
+            return result
+        finally:
+            self.router.record(route, time.perf_counter() - started, ok)
+
+    async def _complete(
+        self,
+        task: TaskKind | None,
+        messages: list[dict[str, str]],
+        model: str | None,
+        field_type: FieldType | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+    ) -> dict[str, Any]:
+        if model is not None:
+            return await self.chat_completion(
+                messages=messages, model=model, temperature=temperature, max_tokens=max_tokens
+            )
+        return await self.complete_task(
+            task, messages, field_type=field_type, temperature=temperature, max_tokens=max_tokens
+        )
+
     async def extract_structured_data(
         self,
         text: str,
@@ -61,12 +137,13 @@ class OpenAIClient(ILLMClient):
             f"Schema: {json.dumps(schema)}\n"
             f"Text:\n{text}"
         )
-        result = await self.chat_completion(
-            messages=[
+        result = await self._complete(
+            TaskKind.EXTRACTION,
+            [
                 {"role": "system", "content": "You output strict JSON only."},
                 {"role": "user", "content": prompt},
             ],
-            model=model,
+            model,
             temperature=0.0,
         )
         content = result["choices"][0]["message"]["content"]
@@ -79,9 +156,31 @@ class OpenAIClient(ILLMClient):
         temperature: float | None = None,
         max_tokens: int | None = None,
     ) -> str:
-        result = await self.chat_completion(
-            messages=[{"role": "user", "content": prompt}],
-            model=model,
+        result = await self._complete(
+            TaskKind.LONG_FORM,
+            [{"role": "user", "content": prompt}],
+            model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return result["choices"][0]["message"]["content"] or ""
+
+    async def complete_for_profile(
+        self,
+        profile: UserProfile | dict[str, Any],
+        request: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        task: TaskKind | None = None,
+        field_type: FieldType | None = None,
+    ) -> str:
+        """Answer ``request`` with the user's profile laid out as a cacheable prefix."""
+        result = await self._complete(
+            task,
+            self.prompt_builder.build(profile, request),
+            model,
+            field_type=field_type,
             temperature=temperature,
             max_tokens=max_tokens,
         )
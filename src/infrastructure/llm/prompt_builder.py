@@ -0,0 +1,95 @@
+"""Cache-friendly prompt layout for profile-grounded LLM requests."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from src.domain.models.user_profile import UserProfile
+
+DEFAULT_SYSTEM_PROMPT = (
+    "You help a candidate complete job applications. "
+    "Answer only from the candidate profile provided. "
+    "If the profile does not contain the answer, say so instead of guessing."
+)
+
+PROFILE_PREFIX_HEADER = "Candidate profile (JSON):\n"
+
+
+def cached_token_ratio(usage: dict[str, Any] | None) -> float:
+    """
+    Compute the share of prompt tokens served from the provider's prefix cache.
+
+    Args:
+        usage: ``usage`` block of a chat completion response
+
+    Returns:
+        Ratio between 0.0 and 1.0 (0.0 when usage data is missing)
+    """
+    prompt_tokens, cached_tokens = _prompt_and_cached_tokens(usage)
+    return cached_tokens / prompt_tokens if prompt_tokens else 0.0
+
+
+def _prompt_and_cached_tokens(usage: dict[str, Any] | None) -> tuple[int, int]:
+    if not usage:
+        return 0, 0
+    prompt_tokens = int(usage.get("prompt_tokens") or 0)
+    details = usage.get("prompt_tokens_details") or {}
+    cached_tokens = int(details.get("cached_tokens") or 0)
+    return prompt_tokens, cached_tokens
+
+
+class PromptCacheStats:
+    """Running totals of prompt and cached tokens across completions."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    def record(self, usage: dict[str, Any] | None) -> None:
+        prompt_tokens, cached_tokens = _prompt_and_cached_tokens(usage)
+        self.requests += 1
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+
+    @property
+    def ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_ratio": self.ratio,
+        }
+
+
+class PromptBuilder:
+    """Builds messages as stable system prompt, profile prefix, then request suffix.
+
+    Providers cache prompts by exact prefix, so everything that repeats across
+    requests for one user comes first and is serialized byte-for-byte the same
+    way every time; only the trailing message varies per request.
+    """
+
+    def __init__(self, system_prompt: str = DEFAULT_SYSTEM_PROMPT) -> None:
+        self.system_prompt = system_prompt
+
+    @staticmethod
+    def serialize_profile(profile: UserProfile | dict[str, Any]) -> str:
+        data = profile.model_dump(mode="json") if isinstance(profile, UserProfile) else profile
+        return json.dumps(
+            data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+
+    def profile_prefix(self, profile: UserProfile | dict[str, Any]) -> str:
+        return PROFILE_PREFIX_HEADER + self.serialize_profile(profile)
+
+    def build(self, profile: UserProfile | dict[str, Any], request: str) -> list[dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": self.profile_prefix(profile)},
+            {"role": "user", "content": request},
+        ]
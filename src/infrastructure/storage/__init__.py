@@ -0,0 +1,16 @@
+"""Storage infrastructure package."""
+
+from .blob_store import BlobStore
+from .cached_storage import CachedStorage
+from .history_archive import HistoryArchive, HistoryCompactor
+from .sharded_storage import ShardedSQLiteStorage
+from .sqlite_storage import SQLiteStorage
+
+__all__ = [
+    "SQLiteStorage",
+    "ShardedSQLiteStorage",
+    "CachedStorage",
+    "BlobStore",
+    "HistoryArchive",
+    "HistoryCompactor",
+]
@@ -0,0 +1,105 @@
+"""Content-addressed on-disk store for resumes, cover letters and other binaries."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import mmap
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    """Stores each distinct content once under its SHA-256 digest.
+
+    Blobs live at ``root/ab/cd/<digest>``. Writes go to a temporary file in the
+    same directory and are renamed into place, so a blob path either does not
+    exist or holds the complete content, and writing identical content twice
+    is a no-op. Reads can map the file instead of copying it into memory.
+    Reference counting lives with the metadata in the database; this class
+    only knows about files.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise ValueError(f"Not a SHA-256 hex digest: {digest!r}")
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).is_file()
+
+    async def put_bytes(self, data: bytes) -> str:
+        return await asyncio.to_thread(self._put_bytes, data)
+
+    async def put_file(self, source: str | Path) -> str:
+        return await asyncio.to_thread(self._put_file, Path(source))
+
+    async def read_bytes(self, digest: str) -> bytes:
+        return await asyncio.to_thread(self.path(digest).read_bytes)
+
+    @contextmanager
+    def mapped(self, digest: str) -> Iterator[memoryview]:
+        """Map a blob read-only; the view is only valid inside the ``with`` block."""
+        with open(self.path(digest), "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                view = memoryview(mapping)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    async def delete(self, digest: str) -> None:
+        await asyncio.to_thread(self.path(digest).unlink, True)
+
+    def _put_bytes(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.path(digest).exists():
+            self._commit(self._spool([data]), digest)
+        return digest
+
+    def _put_file(self, source: Path) -> str:
+        hasher = hashlib.sha256()
+
+        def chunks() -> Iterator[bytes]:
+            with open(source, "rb") as handle:
+                for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+                    yield chunk
+
+        # Hash while copying so the source is read once.
+        tmp = self._spool(chunks())
+        self._commit(tmp, hasher.hexdigest())
+        return hasher.hexdigest()
+
+    def _spool(self, chunks: Iterable[bytes]) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                handle.flush()
+                os.fsync(handle.fileno())
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return Path(tmp_name)
+
+    def _commit(self, tmp: Path, digest: str) -> None:
+        target = self.path(digest)
+        if target.exists():
+            tmp.unlink(missing_ok=True)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp, target)
@@ -0,0 +1,226 @@
+"""Read-through cache for per-user profile and config data."""
+
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from src.domain.interfaces.storage import IFormDataProvider, IStorage
+from src.domain.models.user_profile import flatten_profile
+
+_MISSING = object()
+
+
+class CachedStorage(IStorage, IFormDataProvider):
+    """Wraps an IStorage and caches parsed profiles, configs and form data.
+
+    Entries are keyed by (kind, user_id) in a bounded LRU. Every user has a
+    version that ``save_user_profile``/``save_user_config`` bump after the
+    write lands; a read only populates the cache if the version did not move
+    while it was in flight, so a slow read can never re-insert stale data.
+    Callers get deep copies, so mutating a result never corrupts the cache.
+    Invalidation is in-process only: write through this wrapper.
+    """
+
+    def __init__(self, storage: IStorage, max_entries: int = 1024) -> None:
+        self.storage = storage
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int], Any] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def _cached(self, kind: str, user_id: int, load: Callable[[], Awaitable[Any]]) -> Any:
+        key = (kind, user_id)
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return copy.deepcopy(value)
+        self.misses += 1
+        version = self._versions.get(user_id, 0)
+        value = await load()
+        if self._versions.get(user_id, 0) == version:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def invalidate(self, user_id: int) -> None:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        for kind in ("profile", "config", "form_data"):
+            self._entries.pop((kind, user_id), None)
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "invalidations": self.invalidations,
+        }
+
+    async def get_user_profile(self, user_id: int) -> dict[str, Any] | None:
+        result: dict[str, Any] | None = await self._cached(
+            "profile", user_id, lambda: self.storage.get_user_profile(user_id)
+        )
+        return result
+
+    async def get_user_config(self, user_id: int) -> dict[str, Any] | None:
+        result: dict[str, Any] | None = await self._cached(
+            "config", user_id, lambda: self.storage.get_user_config(user_id)
+        )
+        return result
+
+    async def get_form_data(self, user_id: int) -> dict[str, Any]:
+        async def load() -> dict[str, Any]:
+            return flatten_profile(await self.get_user_profile(user_id) or {})
+
+        result: dict[str, Any] = await self._cached("form_data", user_id, load)
+        return result
+
+    async def save_user_profile(self, user_id: int, profile_data: dict[str, Any]) -> None:
+        try:
+            await self.storage.save_user_profile(user_id, profile_data)
+        finally:
+            self.invalidate(user_id)
+
+    async def save_user_config(
+        self,
+        user_id: int,
+        telegram_bot_token: str,
+        openai_key: str,
+        model_name: str,
+        model_base_url: str,
+        model_routes: dict[str, str] | None = None,
+    ) -> None:
+        try:
+            await self.storage.save_user_config(
+                user_id, telegram_bot_token, openai_key, model_name, model_base_url, model_routes
+            )
+        finally:
+            self.invalidate(user_id)
+
+    async def create_user(self, telegram_chat_id: int) -> int:
+        return await self.storage.create_user(telegram_chat_id)
+
+    async def get_user_by_telegram_id(self, telegram_chat_id: int) -> dict[str, Any] | None:
+        return await self.storage.get_user_by_telegram_id(telegram_chat_id)
+
+    async def get_user(self, user_id: int) -> dict[str, Any] | None:
+        return await self.storage.get_user(user_id)
+
+    async def save_resume(self, user_id: int, file_path: str, file_type: str) -> int:
+        return await self.storage.save_resume(user_id, file_path, file_type)
+
+    async def get_resume(self, user_id: int) -> dict[str, Any] | None:
+        return await self.storage.get_resume(user_id)
+
+    async def save_cover_letter(
+        self, user_id: int, content: str, file_path: str | None = None
+    ) -> int:
+        return await self.storage.save_cover_letter(user_id, content, file_path)
+
+    async def get_cover_letter(self, user_id: int) -> dict[str, Any] | None:
+        return await self.storage.get_cover_letter(user_id)
+
+    async def create_job_application(self, user_id: int, job_url: str) -> int:
+        return await self.storage.create_job_application(user_id, job_url)
+
+    async def find_job_application(self, user_id: int, job_url: str) -> dict[str, Any] | None:
+        return await self.storage.find_job_application(user_id, job_url)
+
+    async def update_job_application(
+        self,
+        application_id: int,
+        status: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        await self.storage.update_job_application(application_id, status, metadata)
+
+    async def transition_application(
+        self,
+        application_id: int,
+        status: str,
+        metadata: dict[str, Any] | None = None,
+        event_type: str | None = None,
+        event_data: dict[str, Any] | None = None,
+    ) -> bool:
+        return await self.storage.transition_application(
+            application_id, status, metadata, event_type, event_data
+        )
+
+    async def get_job_application(self, application_id: int) -> dict[str, Any] | None:
+        return await self.storage.get_job_application(application_id)
+
+    async def get_user_applications(
+        self, user_id: int, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        return await self.storage.get_user_applications(user_id, limit)
+
+    async def query_applications(
+        self,
+        user_id: int,
+        statuses: Sequence[str] | None = None,
+        ats_domain: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        return await self.storage.query_applications(
+            user_id, statuses, ats_domain, started_after, started_before, limit, cursor
+        )
+
+    async def get_application_stats(
+        self,
+        user_id: int,
+        since: datetime | None = None,
+        ats_domain: str | None = None,
+    ) -> dict[str, Any]:
+        return await self.storage.get_application_stats(user_id, since, ats_domain)
+
+    async def add_application_history(
+        self,
+        application_id: int,
+        event_type: str,
+        event_data: dict[str, Any],
+    ) -> None:
+        await self.storage.add_application_history(application_id, event_type, event_data)
+
+    async def get_application_history(self, application_id: int) -> list[dict[str, Any]]:
+        return await self.storage.get_application_history(application_id)
+
+    async def get_telegram_file_id(
+        self, bot_id: int, content_hash: str, media_type: str
+    ) -> str | None:
+        return await self.storage.get_telegram_file_id(bot_id, content_hash, media_type)
+
+    async def save_telegram_file_id(
+        self, bot_id: int, content_hash: str, media_type: str, file_id: str
+    ) -> None:
+        await self.storage.save_telegram_file_id(bot_id, content_hash, media_type, file_id)
+
+    async def save_pending_prompt(self, prompt: dict[str, Any]) -> None:
+        await self.storage.save_pending_prompt(prompt)
+
+    async def get_pending_prompts(self) -> list[dict[str, Any]]:
+        return await self.storage.get_pending_prompts()
+
+    async def delete_pending_prompt(self, application_id: int) -> None:
+        await self.storage.delete_pending_prompt(application_id)
+
+    async def enqueue_application(self, user_id: int, job_url: str, priority: int = 0) -> int:
+        return await self.storage.enqueue_application(user_id, job_url, priority)
+
+    async def get_queued_applications(self) -> list[dict[str, Any]]:
+        return await self.storage.get_queued_applications()
+
+    async def delete_queued_application(self, queue_id: int) -> None:
+        await self.storage.delete_queued_application(queue_id)
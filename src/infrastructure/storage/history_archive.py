@@ -0,0 +1,120 @@
+"""Compressed, append-only segment files for archived application history."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from src.infrastructure.storage.sqlite_storage import SQLiteStorage
+
+logger = get_logger(__name__)
+
+# Record header: payload length, application id. The id makes segments readable
+# without the index if it ever has to be rebuilt.
+_HEADER = struct.Struct(">IQ")
+
+
+@dataclass(frozen=True)
+class ArchiveLocation:
+    """Where one archived record lives."""
+
+    segment: int
+    offset: int
+    length: int
+
+
+class HistoryArchive:
+    """Appends each application's events as one zlib-compressed record.
+
+    Segments are named ``segment-000001.log`` and are never rewritten; a new
+    one is started once the current segment exceeds ``max_segment_bytes``. The
+    caller keeps the (segment, offset, length) index, so reading an archived
+    history is a single positioned read plus a decompress.
+    """
+
+    def __init__(self, root: str | Path, max_segment_bytes: int = 64 * 1024 * 1024) -> None:
+        self.root = Path(root)
+        self.max_segment_bytes = max_segment_bytes
+        self._lock = asyncio.Lock()
+        self._segment: int | None = None
+
+    def segment_path(self, segment: int) -> Path:
+        return self.root / f"segment-{segment:06d}.log"
+
+    async def append(self, application_id: int, events: list[dict[str, Any]]) -> ArchiveLocation:
+        payload = zlib.compress(json.dumps(events, separators=(",", ":")).encode())
+        async with self._lock:
+            return await asyncio.to_thread(self._append, application_id, payload)
+
+    async def read(self, location: ArchiveLocation) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self._read, location)
+
+    def _current_segment(self) -> int:
+        if self._segment is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            existing = sorted(self.root.glob("segment-*.log"))
+            self._segment = int(existing[-1].stem.split("-")[1]) if existing else 1
+        path = self.segment_path(self._segment)
+        if path.exists() and path.stat().st_size >= self.max_segment_bytes:
+            self._segment += 1
+        return self._segment
+
+    def _append(self, application_id: int, payload: bytes) -> ArchiveLocation:
+        segment = self._current_segment()
+        with open(self.segment_path(segment), "ab") as handle:
+            offset = handle.tell()
+            handle.write(_HEADER.pack(len(payload), application_id) + payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        return ArchiveLocation(segment, offset, _HEADER.size + len(payload))
+
+    def _read(self, location: ArchiveLocation) -> list[dict[str, Any]]:
+        with open(self.segment_path(location.segment), "rb") as handle:
+            record = os.pread(handle.fileno(), location.length, location.offset)
+        size, _application_id = _HEADER.unpack_from(record)
+        events: list[dict[str, Any]] = json.loads(zlib.decompress(record[_HEADER.size :][:size]))
+        return events
+
+
+class HistoryCompactor:
+    """Periodically moves terminal applications' history into the archive."""
+
+    def __init__(
+        self,
+        storage: SQLiteStorage,
+        interval: float = 3600.0,
+        older_than: timedelta = timedelta(days=7),
+    ) -> None:
+        self.storage = storage
+        self.interval = interval
+        self.older_than = older_than
+        self._task: asyncio.Task[None] | None = None
+        self.archived = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.archived += await self.storage.archive_history(self.older_than)
+            except Exception:
+                logger.exception("history_compaction_failed")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,119 @@
+"""Write-behind buffer that group-commits application history events."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.utils.logger import get_logger
+from src.utils.metrics import LatencyStats
+
+logger = get_logger(__name__)
+
+HistoryRow = tuple[int, str, str, str]  # application_id, event_type, event_data, created_at
+
+
+class HistoryWriteBuffer:
+    """Collects history rows and writes them in batched transactions.
+
+    A batch is committed once ``max_batch`` rows are queued or
+    ``flush_interval`` seconds after the first queued row, whichever comes
+    first, so N concurrent applications cost one commit instead of N. Rows
+    carry their own timestamp, taken at enqueue time. Readers call
+    ``flush_for`` to see their own writes; an application counts as pending
+    until the batch holding its rows has committed, so a read racing a timer
+    flush waits for it. ``close`` flushes everything still pending.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[HistoryRow]], Awaitable[None]],
+        max_batch: int = 256,
+        flush_interval: float = 0.05,
+    ) -> None:
+        self.write_batch = write_batch
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: list[HistoryRow] = []
+        self._pending_apps: Counter[int] = Counter()
+        self._flush_lock = asyncio.Lock()
+        self._timer: asyncio.Task[None] | None = None
+        self._closed = False
+        self.commit_latency = LatencyStats()
+        self.batches = 0
+        self.events = 0
+        self.largest_batch = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def add(self, row: HistoryRow) -> None:
+        if self._closed:
+            await self.write_batch([row])
+            return
+        self._pending.append(row)
+        self._pending_apps[row[0]] += 1
+        if len(self._pending) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    def has_pending(self, application_id: int) -> bool:
+        return self._pending_apps[application_id] > 0
+
+    async def flush_for(self, application_id: int) -> None:
+        """Flush if ``application_id`` has queued rows, giving read-your-writes."""
+        if self.has_pending(application_id):
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            started = time.perf_counter()
+            try:
+                await self.write_batch(batch)
+            except Exception:
+                self.commit_latency.record(time.perf_counter() - started, ok=False)
+                # Put the batch back in front so ordering and durability are kept.
+                self._pending[:0] = batch
+                raise
+            self._pending_apps -= Counter(row[0] for row in batch)
+            self.commit_latency.record(time.perf_counter() - started)
+            self.batches += 1
+            self.events += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+        except Exception:
+            logger.exception("history_flush_failed", pending=len(self._pending))
+        finally:
+            self._timer = None
+            if self._pending and not self._closed:
+                self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def close(self) -> None:
+        self._closed = True
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            await asyncio.gather(timer, return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "events": self.events,
+            "pending": len(self._pending),
+            "mean_batch": self.events / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "commit": self.commit_latency.snapshot(),
+        }
@@ -0,0 +1,369 @@
+"""IStorage that keeps each user's applications in their own SQLite file."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.domain.interfaces.storage import IStorage
+from src.domain.models.job_application import DuplicateApplication, InvalidStatusTransition
+from src.infrastructure.storage.sqlite_storage import SQLiteStorage
+
+# Global application ids carry the owning user in the high bits.
+_LOCAL_BITS = 32
+_LOCAL_MASK = (1 << _LOCAL_BITS) - 1
+
+
+def encode_application_id(user_id: int, local_id: int) -> int:
+    return (user_id << _LOCAL_BITS) | local_id
+
+
+def decode_application_id(application_id: int) -> tuple[int, int]:
+    return application_id >> _LOCAL_BITS, application_id & _LOCAL_MASK
+
+
+@dataclass
+class _Shard:
+    storage: SQLiteStorage
+    in_use: int = 0
+
+
+class ShardedSQLiteStorage(IStorage):
+    """Users, configs and documents in a catalog database, applications per user.
+
+    ``root/catalog.db`` is a regular SQLiteStorage holding everything that is
+    not an application, plus the ``user_shards`` table naming each user's
+    shard file under ``root/shards``. Applications, their history and
+    analytics live in that shard, so users never wait on each other's writer
+    lock. Application ids returned to callers are global: the user id in the
+    high bits and the shard-local id in the low 32.
+
+    At most ``max_open_shards`` shards stay open; the least recently used idle
+    one is closed when another has to be opened or a call releases the last
+    hold on a shard. Opening and closing a shard both hold that user's lock,
+    and ``in_use`` is only raised under it, so a shard is never closed while
+    a call holds it nor opened twice; the limit is only exceeded while more
+    shards than that are in use. A user's lock is dropped once nobody is
+    waiting on it and their shard is closed.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        max_open_shards: int = 64,
+        catalog_options: dict[str, Any] | None = None,
+        shard_options: dict[str, Any] | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.max_open_shards = max_open_shards
+        self.catalog = SQLiteStorage(self.root / "catalog.db", **(catalog_options or {}))
+        self.shard_options = {"readers": 1, "dedupe_capacity": 1024, **(shard_options or {})}
+        self._shards: OrderedDict[int, _Shard] = OrderedDict()
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._lock_refs: dict[int, int] = {}
+        self._shard_names: dict[int, str] = {}
+        self.opened = 0
+        self.evicted = 0
+
+    async def initialize(self) -> None:
+        (self.root / "shards").mkdir(parents=True, exist_ok=True)
+        await self.catalog.initialize()
+
+    async def close(self) -> None:
+        for user_id in list(self._locks):
+            async with self._locked(user_id):
+                shard = self._shards.pop(user_id, None)
+                if shard is not None:
+                    await shard.storage.close()
+        await self.catalog.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "open_shards": len(self._shards),
+            "in_use": sum(1 for shard in self._shards.values() if shard.in_use),
+            "opened": self.opened,
+            "evicted": self.evicted,
+        }
+
+    async def _shard_name(self, user_id: int, create: bool) -> str | None:
+        name = self._shard_names.get(user_id)
+        if name is not None:
+            return name
+        name = await self.catalog.get_user_shard(user_id)
+        if name is None:
+            if not create or await self.catalog.get_user(user_id) is None:
+                return None
+            name = await self.catalog.assign_user_shard(user_id, f"user-{user_id}.db")
+        self._shard_names[user_id] = name
+        return name
+
+    async def _open(self, user_id: int, name: str) -> _Shard:
+        storage = SQLiteStorage(self.root / "shards" / name, **self.shard_options)
+        await storage.initialize()
+        user = await self.catalog.get_user(user_id)
+        if user is not None:
+            # Shard rows reference users(id), so each shard carries its owner.
+            await storage.import_user(user)
+        self.opened += 1
+        return _Shard(storage)
+
+    @asynccontextmanager
+    async def _locked(self, user_id: int) -> AsyncIterator[None]:
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        # Counted before any await, so a lock is only dropped when nobody holds a reference.
+        self._lock_refs[user_id] = self._lock_refs.get(user_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_refs[user_id] -= 1
+            if not self._lock_refs[user_id]:
+                del self._lock_refs[user_id]
+                if user_id not in self._shards:
+                    del self._locks[user_id]
+
+    async def _evict_idle(self) -> None:
+        while len(self._shards) > self.max_open_shards:
+            idle = next((uid for uid, shard in self._shards.items() if not shard.in_use), None)
+            if idle is None:
+                return
+            async with self._locked(idle):
+                # A call may have taken the shard, or another eviction closed it, meanwhile.
+                shard = self._shards.get(idle)
+                if shard is None or shard.in_use:
+                    continue
+                del self._shards[idle]
+                self.evicted += 1
+                await shard.storage.close()
+
+    @asynccontextmanager
+    async def _shard(
+        self, user_id: int, create: bool = False
+    ) -> AsyncIterator[SQLiteStorage | None]:
+        async with self._locked(user_id):
+            shard = self._shards.get(user_id)
+            if shard is None:
+                name = await self._shard_name(user_id, create)
+                if name is not None:
+                    shard = self._shards[user_id] = await self._open(user_id, name)
+            if shard is not None:
+                self._shards.move_to_end(user_id)
+                shard.in_use += 1
+        if shard is None:
+            yield None
+            return
+        try:
+            await self._evict_idle()
+            yield shard.storage
+        finally:
+            shard.in_use -= 1
+            if not shard.in_use:
+                await self._evict_idle()
+
+    @staticmethod
+    def _globalize(user_id: int, row: dict[str, Any] | None) -> dict[str, Any] | None:
+        if row is not None:
+            row["id"] = encode_application_id(user_id, row["id"])
+        return row
+
+    # Users, configs, profiles and documents live in the catalog.
+
+    async def create_user(self, telegram_chat_id: int) -> int:
+        user_id = await self.catalog.create_user(telegram_chat_id)
+        await self._shard_name(user_id, create=True)
+        return user_id
+
+    async def get_user_by_telegram_id(self, telegram_chat_id: int) -> dict[str, Any] | None:
+        return await self.catalog.get_user_by_telegram_id(telegram_chat_id)
+
+    async def get_user(self, user_id: int) -> dict[str, Any] | None:
+        return await self.catalog.get_user(user_id)
+
+    async def save_user_config(
+        self,
+        user_id: int,
+        telegram_bot_token: str,
+        openai_key: str,
+        model_name: str,
+        model_base_url: str,
+        model_routes: dict[str, str] | None = None,
+    ) -> None:
+        await self.catalog.save_user_config(
+            user_id, telegram_bot_token, openai_key, model_name, model_base_url, model_routes
+        )
+
+    async def get_user_config(self, user_id: int) -> dict[str, Any] | None:
+        return await self.catalog.get_user_config(user_id)
+
+    async def save_user_profile(self, user_id: int, profile_data: dict[str, Any]) -> None:
+        await self.catalog.save_user_profile(user_id, profile_data)
+
+    async def get_user_profile(self, user_id: int) -> dict[str, Any] | None:
+        return await self.catalog.get_user_profile(user_id)
+
+    async def save_resume(self, user_id: int, file_path: str, file_type: str) -> int:
+        return await self.catalog.save_resume(user_id, file_path, file_type)
+
+    async def get_resume(self, user_id: int) -> dict[str, Any] | None:
+        return await self.catalog.get_resume(user_id)
+
+    async def save_cover_letter(
+        self, user_id: int, content: str, file_path: str | None = None
+    ) -> int:
+        return await self.catalog.save_cover_letter(user_id, content, file_path)
+
+    async def get_cover_letter(self, user_id: int) -> dict[str, Any] | None:
+        return await self.catalog.get_cover_letter(user_id)
+
+    # Applications, history and analytics live in the user's shard.
+
+    async def create_job_application(self, user_id: int, job_url: str) -> int:
+        async with self._shard(user_id, create=True) as shard:
+            if shard is None:
+                raise ValueError(f"Unknown user {user_id}")
+            try:
+                local_id = await shard.create_job_application(user_id, job_url)
+            except DuplicateApplication as exc:
+                existing = encode_application_id(user_id, exc.application_id)
+                raise DuplicateApplication(existing, job_url) from None
+        return encode_application_id(user_id, local_id)
+
+    async def find_job_application(self, user_id: int, job_url: str) -> dict[str, Any] | None:
+        async with self._shard(user_id) as shard:
+            if shard is None:
+                return None
+            return self._globalize(user_id, await shard.find_job_application(user_id, job_url))
+
+    async def update_job_application(
+        self,
+        application_id: int,
+        status: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        await self.transition_application(application_id, status, metadata)
+
+    async def transition_application(
+        self,
+        application_id: int,
+        status: str,
+        metadata: dict[str, Any] | None = None,
+        event_type: str | None = None,
+        event_data: dict[str, Any] | None = None,
+    ) -> bool:
+        user_id, local_id = decode_application_id(application_id)
+        async with self._shard(user_id) as shard:
+            if shard is None:
+                return False
+            try:
+                return await shard.transition_application(
+                    local_id, status, metadata, event_type, event_data
+                )
+            except InvalidStatusTransition as exc:
+                raise InvalidStatusTransition(application_id, exc.current, status) from None
+
+    async def get_job_application(self, application_id: int) -> dict[str, Any] | None:
+        user_id, local_id = decode_application_id(application_id)
+        async with self._shard(user_id) as shard:
+            if shard is None:
+                return None
+            return self._globalize(user_id, await shard.get_job_application(local_id))
+
+    async def get_user_applications(
+        self, user_id: int, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        async with self._shard(user_id) as shard:
+            if shard is None:
+                return []
+            rows = await shard.get_user_applications(user_id, limit)
+        for row in rows:
+            self._globalize(user_id, row)
+        return rows
+
+    async def query_applications(
+        self,
+        user_id: int,
+        statuses: Sequence[str] | None = None,
+        ats_domain: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        async with self._shard(user_id) as shard:
+            if shard is None:
+                return {"items": [], "next_cursor": None}
+            # Cursors hold shard-local ids, which is all the shard needs to resume.
+            page = await shard.query_applications(
+                user_id, statuses, ats_domain, started_after, started_before, limit, cursor
+            )
+        for row in page["items"]:
+            self._globalize(user_id, row)
+        return page
+
+    async def get_application_stats(
+        self,
+        user_id: int,
+        since: datetime | None = None,
+        ats_domain: str | None = None,
+    ) -> dict[str, Any]:
+        async with self._shard(user_id) as shard:
+            # The catalog holds no applications, so it answers with empty aggregates.
+            source = self.catalog if shard is None else shard
+            return await source.get_application_stats(user_id, since, ats_domain)
+
+    async def add_application_history(
+        self,
+        application_id: int,
+        event_type: str,
+        event_data: dict[str, Any],
+    ) -> None:
+        user_id, local_id = decode_application_id(application_id)
+        async with self._shard(user_id) as shard:
+            if shard is not None:
+                await shard.add_application_history(local_id, event_type, event_data)
+
+    async def get_application_history(self, application_id: int) -> list[dict[str, Any]]:
+        user_id, local_id = decode_application_id(application_id)
+        async with self._shard(user_id) as shard:
+            if shard is None:
+                return []
+            rows = await shard.get_application_history(local_id)
+        for row in rows:
+            row["application_id"] = application_id
+        return rows
+
+    # Bot-wide state stays in the catalog.
+
+    async def get_telegram_file_id(
+        self, bot_id: int, content_hash: str, media_type: str
+    ) -> str | None:
+        return await self.catalog.get_telegram_file_id(bot_id, content_hash, media_type)
+
+    async def save_telegram_file_id(
+        self, bot_id: int, content_hash: str, media_type: str, file_id: str
+    ) -> None:
+        await self.catalog.save_telegram_file_id(bot_id, content_hash, media_type, file_id)
+
+    async def save_pending_prompt(self, prompt: dict[str, Any]) -> None:
+        await self.catalog.save_pending_prompt(prompt)
+
+    async def get_pending_prompts(self) -> list[dict[str, Any]]:
+        return await self.catalog.get_pending_prompts()
+
+    async def delete_pending_prompt(self, application_id: int) -> None:
+        await self.catalog.delete_pending_prompt(application_id)
+
+    async def enqueue_application(self, user_id: int, job_url: str, priority: int = 0) -> int:
+        return await self.catalog.enqueue_application(user_id, job_url, priority)
+
+    async def get_queued_applications(self) -> list[dict[str, Any]]:
+        return await self.catalog.get_queued_applications()
+
+    async def delete_queued_application(self, queue_id: int) -> None:
+        await self.catalog.delete_queued_application(queue_id)
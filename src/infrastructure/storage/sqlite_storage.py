@@ -0,0 +1,1240 @@
+"""SQLite implementation of IStorage."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import sqlite3
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from src.domain.interfaces.storage import IStorage
+from src.domain.models.job_application import (
+    ApplicationStatus,
+    DuplicateApplication,
+    InvalidStatusTransition,
+    allowed_predecessors,
+)
+from src.infrastructure.storage.blob_store import BlobStore
+from src.infrastructure.storage.history_archive import ArchiveLocation, HistoryArchive
+from src.infrastructure.storage.history_buffer import HistoryRow, HistoryWriteBuffer
+from src.utils.bloom import BloomFilter
+from src.utils.urls import ats_domain, canonicalize_job_url
+
+# Each entry upgrades the schema by one version; PRAGMA user_version records
+# how many have been applied. Never edit an entry once released, append one.
+MIGRATIONS: list[str] = [
+    """
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY,
+        telegram_chat_id INTEGER NOT NULL UNIQUE,
+        created_at TEXT NOT NULL
+    );
+    CREATE TABLE user_configs (
+        user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        telegram_bot_token TEXT NOT NULL,
+        openai_key TEXT NOT NULL,
+        model_name TEXT NOT NULL,
+        model_base_url TEXT NOT NULL,
+        model_routes TEXT NOT NULL DEFAULT '{}',
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE user_profiles (
+        user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        profile_data TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE resumes (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        file_path TEXT NOT NULL,
+        file_type TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE INDEX idx_resumes_user ON resumes(user_id, id);
+    CREATE TABLE cover_letters (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        content TEXT NOT NULL,
+        file_path TEXT,
+        created_at TEXT NOT NULL
+    );
+    CREATE INDEX idx_cover_letters_user ON cover_letters(user_id, id);
+    CREATE TABLE job_applications (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        job_url TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        metadata TEXT NOT NULL DEFAULT '{}',
+        started_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        completed_at TEXT
+    );
+    CREATE INDEX idx_job_applications_user ON job_applications(user_id, id);
+    CREATE TABLE application_history (
+        id INTEGER PRIMARY KEY,
+        application_id INTEGER NOT NULL REFERENCES job_applications(id) ON DELETE CASCADE,
+        event_type TEXT NOT NULL,
+        event_data TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE INDEX idx_application_history_app ON application_history(application_id, id);
+    CREATE TABLE telegram_files (
+        bot_id INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        media_type TEXT NOT NULL,
+        file_id TEXT NOT NULL,
+        PRIMARY KEY (bot_id, content_hash, media_type)
+    ) WITHOUT ROWID;
+    CREATE TABLE pending_prompts (
+        application_id INTEGER PRIMARY KEY,
+        prompt TEXT NOT NULL
+    );
+    """,
+    """
+    ALTER TABLE job_applications ADD COLUMN ats_domain TEXT NOT NULL DEFAULT '';
+    UPDATE job_applications SET ats_domain = lower(substr(
+        substr(job_url, instr(job_url, '://') + 3),
+        1,
+        instr(substr(job_url, instr(job_url, '://') + 3) || '/', '/') - 1
+    ));
+    DROP INDEX idx_job_applications_user;
+    CREATE INDEX idx_job_applications_user_started
+        ON job_applications(user_id, started_at, id);
+    CREATE INDEX idx_job_applications_user_status
+        ON job_applications(user_id, status, started_at, id);
+    CREATE INDEX idx_job_applications_user_domain
+        ON job_applications(user_id, ats_domain, started_at, id);
+    """,
+    # transition_application sets last_event_* in the same UPDATE as the status;
+    # the trigger turns that into a history row, so both land in one statement.
+    """
+    ALTER TABLE job_applications ADD COLUMN last_event_type TEXT;
+    ALTER TABLE job_applications ADD COLUMN last_event_data TEXT;
+    CREATE TRIGGER trg_job_applications_event
+    AFTER UPDATE OF last_event_type ON job_applications
+    WHEN NEW.last_event_type IS NOT NULL
+    BEGIN
+        INSERT INTO application_history (application_id, event_type, event_data, created_at)
+        VALUES (NEW.id, NEW.last_event_type, NEW.last_event_data, NEW.updated_at);
+    END;
+    """,
+    """
+    CREATE TABLE blobs (
+        digest TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        refcount INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL
+    ) WITHOUT ROWID;
+    CREATE INDEX idx_blobs_unreferenced ON blobs(refcount) WHERE refcount <= 0;
+    ALTER TABLE resumes ADD COLUMN blob_digest TEXT REFERENCES blobs(digest);
+    ALTER TABLE cover_letters ADD COLUMN blob_digest TEXT REFERENCES blobs(digest);
+    """,
+    """
+    CREATE TABLE history_archive_index (
+        application_id INTEGER NOT NULL,
+        segment INTEGER NOT NULL,
+        byte_offset INTEGER NOT NULL,
+        length INTEGER NOT NULL,
+        events INTEGER NOT NULL,
+        archived_at TEXT NOT NULL,
+        PRIMARY KEY (application_id, segment, byte_offset)
+    ) WITHOUT ROWID;
+    CREATE INDEX idx_job_applications_completed
+        ON job_applications(completed_at) WHERE completed_at IS NOT NULL;
+    """,
+    # canonical_url is computed in Python; initialize() backfills rows left NULL.
+    """
+    ALTER TABLE job_applications ADD COLUMN canonical_url TEXT;
+    CREATE UNIQUE INDEX idx_job_applications_user_canonical
+        ON job_applications(user_id, canonical_url) WHERE canonical_url IS NOT NULL;
+    CREATE INDEX idx_job_applications_uncanonical
+        ON job_applications(id) WHERE canonical_url IS NULL;
+    """,
+    # Aggregates kept up to date by triggers in the same statement as the insert
+    # or status change. Completed durations are counted in fixed buckets named
+    # by their upper bound in seconds; 2147483647 collects everything longer.
+    """
+    CREATE TABLE stats_daily (
+        user_id INTEGER NOT NULL,
+        ats_domain TEXT NOT NULL,
+        day TEXT NOT NULL,
+        status TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (user_id, day, ats_domain, status)
+    ) WITHOUT ROWID;
+    CREATE TABLE stats_durations (
+        user_id INTEGER NOT NULL,
+        ats_domain TEXT NOT NULL,
+        day TEXT NOT NULL,
+        bucket INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (user_id, day, ats_domain, bucket)
+    ) WITHOUT ROWID;
+    CREATE TABLE stats_failures (
+        user_id INTEGER NOT NULL,
+        ats_domain TEXT NOT NULL,
+        day TEXT NOT NULL,
+        reason TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (user_id, day, ats_domain, reason)
+    ) WITHOUT ROWID;
+    CREATE VIEW stats_finished AS
+    SELECT id, user_id, ats_domain, status, substr(completed_at, 1, 10) AS day,
+        CASE
+            WHEN seconds <= 30 THEN 30
+            WHEN seconds <= 60 THEN 60
+            WHEN seconds <= 120 THEN 120
+            WHEN seconds <= 300 THEN 300
+            WHEN seconds <= 600 THEN 600
+            WHEN seconds <= 1200 THEN 1200
+            WHEN seconds <= 1800 THEN 1800
+            WHEN seconds <= 3600 THEN 3600
+            WHEN seconds <= 7200 THEN 7200
+            WHEN seconds <= 21600 THEN 21600
+            WHEN seconds <= 86400 THEN 86400
+            ELSE 2147483647
+        END AS bucket,
+        coalesce(json_extract(metadata, '$.reason'), 'unknown') AS reason
+    FROM (
+        SELECT *, (julianday(completed_at) - julianday(started_at)) * 86400 AS seconds
+        FROM job_applications
+    );
+    CREATE TRIGGER trg_stats_started AFTER INSERT ON job_applications
+    BEGIN
+        INSERT INTO stats_daily VALUES
+            (NEW.user_id, NEW.ats_domain, substr(NEW.started_at, 1, 10), 'started', 1)
+        ON CONFLICT DO UPDATE SET count = count + 1;
+    END;
+    CREATE TRIGGER trg_stats_finished AFTER UPDATE OF status ON job_applications
+    WHEN NEW.status IS NOT OLD.status AND NEW.status IN ('completed', 'failed', 'cancelled')
+    BEGIN
+        INSERT INTO stats_daily
+        SELECT user_id, ats_domain, day, status, 1 FROM stats_finished WHERE id = NEW.id
+        ON CONFLICT DO UPDATE SET count = count + 1;
+        INSERT INTO stats_durations
+        SELECT user_id, ats_domain, day, bucket, 1 FROM stats_finished
+        WHERE id = NEW.id AND status = 'completed'
+        ON CONFLICT DO UPDATE SET count = count + 1;
+        INSERT INTO stats_failures
+        SELECT user_id, ats_domain, day, reason, 1 FROM stats_finished
+        WHERE id = NEW.id AND status = 'failed'
+        ON CONFLICT DO UPDATE SET count = count + 1;
+    END;
+    INSERT INTO stats_daily
+    SELECT user_id, ats_domain, substr(started_at, 1, 10), 'started', count(*)
+    FROM job_applications GROUP BY 1, 2, 3;
+    INSERT INTO stats_daily
+    SELECT user_id, ats_domain, day, status, count(*) FROM stats_finished
+    WHERE status IN ('completed', 'failed', 'cancelled') AND day IS NOT NULL
+    GROUP BY 1, 2, 3, 4;
+    INSERT INTO stats_durations
+    SELECT user_id, ats_domain, day, bucket, count(*) FROM stats_finished
+    WHERE status = 'completed' AND day IS NOT NULL GROUP BY 1, 2, 3, 4;
+    INSERT INTO stats_failures
+    SELECT user_id, ats_domain, day, reason, count(*) FROM stats_finished
+    WHERE status = 'failed' AND day IS NOT NULL GROUP BY 1, 2, 3, 4;
+    """,
+    # Only used by ShardedSQLiteStorage's catalog: which file holds a user's applications.
+    """
+    CREATE TABLE user_shards (
+        user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        shard TEXT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE application_queue (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        job_url TEXT NOT NULL,
+        priority INTEGER NOT NULL DEFAULT 0,
+        enqueued_at TEXT NOT NULL
+    );
+    """,
+    # A status change first takes the application out of its old terminal counters
+    # (read through the view before the row changes), so a retried application is
+    # only counted under its latest outcome. The failure reason comes from the
+    # event data of the transition into 'failed', not from merged metadata that
+    # may still hold an earlier attempt's reason. The counters are rebuilt.
+    """
+    DROP TRIGGER trg_stats_finished;
+    DROP VIEW stats_finished;
+    CREATE VIEW stats_finished AS
+    SELECT id, user_id, ats_domain, status, substr(completed_at, 1, 10) AS day,
+        CASE
+            WHEN seconds <= 30 THEN 30
+            WHEN seconds <= 60 THEN 60
+            WHEN seconds <= 120 THEN 120
+            WHEN seconds <= 300 THEN 300
+            WHEN seconds <= 600 THEN 600
+            WHEN seconds <= 1200 THEN 1200
+            WHEN seconds <= 1800 THEN 1800
+            WHEN seconds <= 3600 THEN 3600
+            WHEN seconds <= 7200 THEN 7200
+            WHEN seconds <= 21600 THEN 21600
+            WHEN seconds <= 86400 THEN 86400
+            ELSE 2147483647
+        END AS bucket,
+        coalesce(json_extract(last_event_data, '$.reason'), 'unknown') AS reason
+    FROM (
+        SELECT *, (julianday(completed_at) - julianday(started_at)) * 86400 AS seconds
+        FROM job_applications
+    );
+    CREATE TRIGGER trg_stats_left BEFORE UPDATE OF status ON job_applications
+    WHEN NEW.status IS NOT OLD.status AND OLD.status IN ('completed', 'failed', 'cancelled')
+    BEGIN
+        UPDATE stats_daily SET count = count - 1
+        WHERE (user_id, day, ats_domain, status) IN (
+            SELECT user_id, day, ats_domain, status FROM stats_finished WHERE id = OLD.id
+        );
+        UPDATE stats_durations SET count = count - 1
+        WHERE (user_id, day, ats_domain, bucket) IN (
+            SELECT user_id, day, ats_domain, bucket FROM stats_finished
+            WHERE id = OLD.id AND status = 'completed'
+        );
+        UPDATE stats_failures SET count = count - 1
+        WHERE (user_id, day, ats_domain, reason) IN (
+            SELECT user_id, day, ats_domain, reason FROM stats_finished
+            WHERE id = OLD.id AND status = 'failed'
+        );
+    END;
+    CREATE TRIGGER trg_stats_finished AFTER UPDATE OF status ON job_applications
+    WHEN NEW.status IS NOT OLD.status AND NEW.status IN ('completed', 'failed', 'cancelled')
+    BEGIN
+        INSERT INTO stats_daily
+        SELECT user_id, ats_domain, day, status, 1 FROM stats_finished WHERE id = NEW.id
+        ON CONFLICT DO UPDATE SET count = count + 1;
+        INSERT INTO stats_durations
+        SELECT user_id, ats_domain, day, bucket, 1 FROM stats_finished
+        WHERE id = NEW.id AND status = 'completed'
+        ON CONFLICT DO UPDATE SET count = count + 1;
+        INSERT INTO stats_failures
+        SELECT user_id, ats_domain, day, reason, 1 FROM stats_finished
+        WHERE id = NEW.id AND status = 'failed'
+        ON CONFLICT DO UPDATE SET count = count + 1;
+    END;
+    DELETE FROM stats_daily WHERE status != 'started';
+    DELETE FROM stats_durations;
+    DELETE FROM stats_failures;
+    INSERT INTO stats_daily
+    SELECT user_id, ats_domain, day, status, count(*) FROM stats_finished
+    WHERE status IN ('completed', 'failed', 'cancelled') AND day IS NOT NULL
+    GROUP BY 1, 2, 3, 4;
+    INSERT INTO stats_durations
+    SELECT user_id, ats_domain, day, bucket, count(*) FROM stats_finished
+    WHERE status = 'completed' AND day IS NOT NULL GROUP BY 1, 2, 3, 4;
+    INSERT INTO stats_failures
+    SELECT user_id, ats_domain, day, reason, count(*) FROM stats_finished
+    WHERE status = 'failed' AND day IS NOT NULL GROUP BY 1, 2, 3, 4;
+    """,
+]
+
+_DURATION_OVERFLOW = 2147483647
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+_APPLICATION_COLUMNS = (
+    "id, user_id, job_url, canonical_url, ats_domain, status, metadata, "
+    "started_at, updated_at, completed_at"
+)
+
+_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+)
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def _loads(value: str | None) -> Any:
+    return json.loads(value) if value else {}
+
+
+def _encode_cursor(started_at: str, application_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{started_at}|{application_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        started_at, application_id = base64.urlsafe_b64decode(cursor).decode().rsplit("|", 1)
+        return started_at, int(application_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid application cursor: {cursor!r}") from exc
+
+
+def _timestamp(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).isoformat()
+
+
+def _status_counts(counts: dict[str, int]) -> dict[str, Any]:
+    finished = sum(counts.get(status, 0) for status in TERMINAL_STATUSES)
+    return {
+        "started": counts.get("started", 0),
+        **{status: counts.get(status, 0) for status in sorted(TERMINAL_STATUSES)},
+        "success_rate": counts.get("completed", 0) / finished if finished else None,
+    }
+
+
+def _summarize_stats(
+    daily: Iterable[Sequence[Any]],
+    durations: Iterable[Sequence[Any]],
+    failures: Iterable[Sequence[Any]],
+) -> dict[str, Any]:
+    totals: dict[str, int] = {}
+    by_domain: dict[str, dict[str, int]] = {}
+    for domain, status, count in daily:
+        totals[status] = totals.get(status, 0) + count
+        by_domain.setdefault(domain, {})[status] = count
+    histogram = [
+        {"le": None if bucket == _DURATION_OVERFLOW else bucket, "count": count}
+        for bucket, count in durations
+    ]
+    # Median is reported as the upper bound of the bucket holding it.
+    median = None
+    seen, half = 0, sum(entry["count"] for entry in histogram) / 2
+    for entry in histogram:
+        seen += entry["count"]
+        if seen >= half:
+            median = entry["le"]
+            break
+    return {
+        **_status_counts(totals),
+        "by_domain": {
+            domain: _status_counts(counts) for domain, counts in sorted(by_domain.items())
+        },
+        "median_duration_s": median,
+        "duration_histogram": histogram,
+        "failure_reasons": [{"reason": reason, "count": count} for reason, count in failures],
+    }
+
+
+class SQLiteStorage(IStorage):
+    """aiosqlite-backed storage tuned for many concurrent applications.
+
+    The database runs in WAL mode so readers never block the writer. All
+    writes go through one connection guarded by a lock, which is how SQLite
+    wants to be written to anyway, while reads are spread over a small pool of
+    read-only connections. Statements are plain module-level SQL so sqlite's
+    per-connection statement cache (``cached_statements``) keeps them prepared.
+    History events go through a write-behind buffer that group-commits them.
+    With a ``blob_store``, resume files and cover letter text are stored once
+    per distinct content on disk and the tables only keep digests; blobs are
+    reference counted and removed by ``collect_garbage``. With a
+    ``history_archive``, ``archive_history`` moves finished applications'
+    events out of the database into compressed segment files.
+
+    Applications are unique per user and canonical job URL. A Bloom filter of
+    every (user, canonical URL) pair answers most ``find_job_application``
+    calls for new postings without a query; it only knows about rows written
+    through this instance (and those present at ``initialize``), so one
+    process should own the database file.
+
+    Triggers keep per-user, per-board, per-day counters of started and
+    finished applications, completion times and failure reasons, which
+    ``get_application_stats`` reads without touching applications or history.
+    A finished application is counted under its latest outcome only, and a
+    failure under the ``reason`` in the event data of its transition.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        readers: int = 4,
+        cached_statements: int = 256,
+        busy_timeout_ms: int = 5000,
+        history_batch_size: int = 256,
+        history_flush_interval: float = 0.05,
+        blob_store: BlobStore | None = None,
+        keep_document_versions: int = 5,
+        history_archive: HistoryArchive | None = None,
+        dedupe_capacity: int = 100_000,
+    ) -> None:
+        self.db_path = str(db_path)
+        self.readers = readers
+        self.cached_statements = cached_statements
+        self.busy_timeout_ms = busy_timeout_ms
+        self._writer: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        self._reader_pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._reader_connections: list[aiosqlite.Connection] = []
+        self.history = HistoryWriteBuffer(
+            self._write_history, history_batch_size, history_flush_interval
+        )
+        self.blob_store = blob_store
+        self.keep_document_versions = keep_document_versions
+        self.history_archive = history_archive
+        self.dedupe_capacity = dedupe_capacity
+        self.dedupe_filter = BloomFilter(dedupe_capacity)
+        self.dedupe_skips = 0
+
+    @property
+    def in_memory(self) -> bool:
+        return self.db_path == ":memory:" or self.db_path.startswith("file::memory:")
+
+    async def initialize(self) -> None:
+        self._writer = await self._connect()
+        # Only takes effect on a new database; lets archive_history hand pages back.
+        await self._writer.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        await self._writer.execute("PRAGMA journal_mode = WAL")
+        await self._migrate(self._writer)
+        await self._backfill_canonical_urls()
+        await self.load_dedupe_filter()
+        # An in-memory database is private to its connection, so reads share the writer.
+        for _ in range(0 if self.in_memory else self.readers):
+            reader = await self._connect()
+            await reader.execute("PRAGMA query_only = ON")
+            self._reader_connections.append(reader)
+            self._reader_pool.put_nowait(reader)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            await self.history.close()
+        for reader in self._reader_connections:
+            await reader.close()
+        self._reader_connections.clear()
+        self._reader_pool = asyncio.Queue()
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
+    async def _connect(self) -> aiosqlite.Connection:
+        connection = await aiosqlite.connect(
+            self.db_path,
+            isolation_level=None,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,
+        )
+        connection.row_factory = aiosqlite.Row
+        await connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        for pragma in _PRAGMAS:
+            await connection.execute(pragma)
+        return connection
+
+    async def _migrate(self, connection: aiosqlite.Connection) -> None:
+        async with connection.execute("PRAGMA user_version") as cursor:
+            row = await cursor.fetchone()
+        version = int(row[0]) if row else 0
+        for target, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            await connection.executescript(
+                f"BEGIN IMMEDIATE;\n{script}\nPRAGMA user_version = {target};\nCOMMIT;"
+            )
+
+    async def _backfill_canonical_urls(self, batch_size: int = 1000) -> None:
+        """Fill canonical_url for rows created before it existed.
+
+        Rows that canonicalize to a posting the user already has stay NULL.
+        """
+        last_id = 0
+        while True:
+            rows = await self._fetchall(
+                "SELECT id, job_url FROM job_applications "
+                "WHERE canonical_url IS NULL AND id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            )
+            if not rows:
+                return
+            async with self._transaction() as connection:
+                await connection.executemany(
+                    "UPDATE OR IGNORE job_applications SET canonical_url = ? WHERE id = ?",
+                    [(canonicalize_job_url(row["job_url"]), row["id"]) for row in rows],
+                )
+            last_id = rows[-1]["id"]
+
+    @staticmethod
+    def _dedupe_key(user_id: int, canonical_url: str) -> str:
+        return f"{user_id}|{canonical_url}"
+
+    async def load_dedupe_filter(self) -> None:
+        """Rebuild the duplicate-check Bloom filter; call while nothing creates applications."""
+        count = await self._fetchone(
+            "SELECT count(*) AS n FROM job_applications WHERE canonical_url IS NOT NULL"
+        )
+        dedupe_filter = BloomFilter(max(self.dedupe_capacity, 2 * (count or {}).get("n", 0)))
+        async with self._reader() as connection:
+            async with connection.execute(
+                "SELECT user_id, canonical_url FROM job_applications "
+                "WHERE canonical_url IS NOT NULL"
+            ) as cursor:
+                while rows := await cursor.fetchmany(10_000):
+                    for user_id, canonical_url in rows:
+                        dedupe_filter.add(self._dedupe_key(user_id, canonical_url))
+        self.dedupe_filter = dedupe_filter
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the writer for one IMMEDIATE transaction."""
+        if self._writer is None:
+            raise RuntimeError("SQLiteStorage.initialize() has not been called")
+        async with self._write_lock:
+            await self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+            except BaseException:
+                await self._writer.execute("ROLLBACK")
+                raise
+            await self._writer.execute("COMMIT")
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        if not self._reader_connections:
+            if self._writer is None:
+                raise RuntimeError("SQLiteStorage.initialize() has not been called")
+            yield self._writer
+            return
+        connection = await self._reader_pool.get()
+        try:
+            yield connection
+        finally:
+            self._reader_pool.put_nowait(connection)
+
+    async def _execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run one write statement in its own implicit transaction and return its lastrowid."""
+        if self._writer is None:
+            raise RuntimeError("SQLiteStorage.initialize() has not been called")
+        async with self._write_lock:
+            async with self._writer.execute(sql, params) as cursor:
+                return int(cursor.lastrowid or 0)
+
+    async def _execute_rowcount(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run one write statement and return how many rows it changed."""
+        if self._writer is None:
+            raise RuntimeError("SQLiteStorage.initialize() has not been called")
+        async with self._write_lock:
+            async with self._writer.execute(sql, params) as cursor:
+                return int(cursor.rowcount)
+
+    async def _execute_script(self, sql: str) -> None:
+        """Run statements on the writer, stepping each one until it is done."""
+        if self._writer is None:
+            raise RuntimeError("SQLiteStorage.initialize() has not been called")
+        async with self._write_lock:
+            await self._writer.executescript(sql)
+
+    async def _fetchone(self, sql: str, params: Sequence[Any] = ()) -> dict[str, Any] | None:
+        async with self._reader() as connection:
+            async with connection.execute(sql, params) as cursor:
+                row = await cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    async def _fetchall(self, sql: str, params: Sequence[Any] = ()) -> list[dict[str, Any]]:
+        async with self._reader() as connection:
+            async with connection.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def create_user(self, telegram_chat_id: int) -> int:
+        async with self._transaction() as connection:
+            async with connection.execute(
+                "INSERT INTO users (telegram_chat_id, created_at) VALUES (?, ?) "
+                "ON CONFLICT (telegram_chat_id) "
+                "DO UPDATE SET telegram_chat_id = excluded.telegram_chat_id "
+                "RETURNING id",
+                (telegram_chat_id, _now()),
+            ) as cursor:
+                row = await cursor.fetchone()
+        assert row is not None
+        return int(row[0])
+
+    async def get_user_by_telegram_id(self, telegram_chat_id: int) -> dict[str, Any] | None:
+        return await self._fetchone(
+            "SELECT id, telegram_chat_id, created_at FROM users WHERE telegram_chat_id = ?",
+            (telegram_chat_id,),
+        )
+
+    async def get_user(self, user_id: int) -> dict[str, Any] | None:
+        return await self._fetchone(
+            "SELECT id, telegram_chat_id, created_at FROM users WHERE id = ?", (user_id,)
+        )
+
+    async def import_user(self, user: dict[str, Any]) -> None:
+        """
+        Insert a user row read from another database, keeping its id.
+
+        Args:
+            user: Row as returned by ``get_user``; ignored if the id exists
+        """
+        await self._execute(
+            "INSERT OR IGNORE INTO users (id, telegram_chat_id, created_at) VALUES (?, ?, ?)",
+            (user["id"], user["telegram_chat_id"], user["created_at"]),
+        )
+
+    async def get_user_shard(self, user_id: int) -> str | None:
+        """
+        Get the shard file name recorded for a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            File name, or None if the user has no shard yet
+        """
+        row = await self._fetchone("SELECT shard FROM user_shards WHERE user_id = ?", (user_id,))
+        return None if row is None else str(row["shard"])
+
+    async def assign_user_shard(self, user_id: int, shard: str) -> str:
+        """
+        Record a user's shard file name unless one is already recorded.
+
+        Args:
+            user_id: User ID
+            shard: Proposed file name
+
+        Returns:
+            The file name now recorded for the user
+        """
+        async with self._transaction() as connection:
+            await connection.execute(
+                "INSERT OR IGNORE INTO user_shards (user_id, shard) VALUES (?, ?)",
+                (user_id, shard),
+            )
+            async with connection.execute(
+                "SELECT shard FROM user_shards WHERE user_id = ?", (user_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        assert row is not None
+        return str(row[0])
+
+    async def save_user_config(
+        self,
+        user_id: int,
+        telegram_bot_token: str,
+        openai_key: str,
+        model_name: str,
+        model_base_url: str,
+        model_routes: dict[str, str] | None = None,
+    ) -> None:
+        await self._execute(
+            "INSERT INTO user_configs (user_id, telegram_bot_token, openai_key, model_name, "
+            "model_base_url, model_routes, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET telegram_bot_token = excluded.telegram_bot_token, "
+            "openai_key = excluded.openai_key, model_name = excluded.model_name, "
+            "model_base_url = excluded.model_base_url, model_routes = excluded.model_routes, "
+            "updated_at = excluded.updated_at",
+            (
+                user_id,
+                telegram_bot_token,
+                openai_key,
+                model_name,
+                model_base_url,
+                json.dumps(model_routes or {}),
+                _now(),
+            ),
+        )
+
+    async def get_user_config(self, user_id: int) -> dict[str, Any] | None:
+        row = await self._fetchone(
+            "SELECT user_id, telegram_bot_token, openai_key, model_name, model_base_url, "
+            "model_routes, updated_at FROM user_configs WHERE user_id = ?",
+            (user_id,),
+        )
+        if row is not None:
+            row["model_routes"] = _loads(row["model_routes"])
+        return row
+
+    async def save_user_profile(self, user_id: int, profile_data: dict[str, Any]) -> None:
+        await self._execute(
+            "INSERT INTO user_profiles (user_id, profile_data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET profile_data = excluded.profile_data, "
+            "updated_at = excluded.updated_at",
+            (user_id, json.dumps(profile_data, default=str), _now()),
+        )
+
+    async def get_user_profile(self, user_id: int) -> dict[str, Any] | None:
+        row = await self._fetchone(
+            "SELECT profile_data FROM user_profiles WHERE user_id = ?", (user_id,)
+        )
+        return _loads(row["profile_data"]) if row is not None else None
+
+    async def save_resume(self, user_id: int, file_path: str, file_type: str) -> int:
+        if self.blob_store is None:
+            return await self._execute(
+                "INSERT INTO resumes (user_id, file_path, file_type, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (user_id, file_path, file_type, _now()),
+            )
+        blob_store = self.blob_store
+        digest = await blob_store.put_file(file_path)
+        async with self._transaction() as connection:
+            await self._acquire_blob(
+                connection, blob_store, digest, lambda: blob_store.put_file(file_path)
+            )
+            async with connection.execute(
+                "INSERT INTO resumes (user_id, file_path, file_type, blob_digest, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (user_id, file_path, file_type, digest, _now()),
+            ) as cursor:
+                resume_id = int(cursor.lastrowid or 0)
+            await self._prune_versions(connection, "resumes", user_id)
+        return resume_id
+
+    async def get_resume(self, user_id: int) -> dict[str, Any] | None:
+        row = await self._fetchone(
+            "SELECT id, user_id, file_path, file_type, blob_digest, created_at FROM resumes "
+            "WHERE user_id = ? ORDER BY id DESC LIMIT 1",
+            (user_id,),
+        )
+        if row is not None and row["blob_digest"] and self.blob_store is not None:
+            row["blob_path"] = str(self.blob_store.path(row["blob_digest"]))
+        return row
+
+    async def save_cover_letter(
+        self, user_id: int, content: str, file_path: str | None = None
+    ) -> int:
+        if self.blob_store is None:
+            return await self._execute(
+                "INSERT INTO cover_letters (user_id, content, file_path, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (user_id, content, file_path, _now()),
+            )
+        blob_store = self.blob_store
+        data = content.encode()
+        digest = await blob_store.put_bytes(data)
+        async with self._transaction() as connection:
+            await self._acquire_blob(
+                connection, blob_store, digest, lambda: blob_store.put_bytes(data)
+            )
+            async with connection.execute(
+                "INSERT INTO cover_letters (user_id, content, file_path, blob_digest, created_at) "
+                "VALUES (?, '', ?, ?, ?)",
+                (user_id, file_path, digest, _now()),
+            ) as cursor:
+                letter_id = int(cursor.lastrowid or 0)
+            await self._prune_versions(connection, "cover_letters", user_id)
+        return letter_id
+
+    async def get_cover_letter(self, user_id: int) -> dict[str, Any] | None:
+        row = await self._fetchone(
+            "SELECT id, user_id, content, file_path, blob_digest, created_at FROM cover_letters "
+            "WHERE user_id = ? ORDER BY id DESC LIMIT 1",
+            (user_id,),
+        )
+        if row is not None and row["blob_digest"] and self.blob_store is not None:
+            row["content"] = (await self.blob_store.read_bytes(row["blob_digest"])).decode()
+        return row
+
+    @staticmethod
+    async def _acquire_blob(
+        connection: aiosqlite.Connection,
+        blob_store: BlobStore,
+        digest: str,
+        rewrite: Callable[[], Awaitable[str]],
+    ) -> None:
+        """Take a reference on a blob; runs under the write lock, like garbage collection."""
+        if not blob_store.exists(digest):
+            # Collected between the upload and this transaction; write it again.
+            await rewrite()
+        size = blob_store.path(digest).stat().st_size
+        await connection.execute(
+            "INSERT INTO blobs (digest, size, refcount, created_at) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT (digest) DO UPDATE SET refcount = refcount + 1",
+            (digest, size, _now()),
+        )
+
+    async def _prune_versions(
+        self, connection: aiosqlite.Connection, table: str, user_id: int
+    ) -> None:
+        """Drop all but the newest versions of a user's documents and release their blobs."""
+        async with connection.execute(
+            f"DELETE FROM {table} WHERE user_id = ? AND id NOT IN "
+            f"(SELECT id FROM {table} WHERE user_id = ? ORDER BY id DESC LIMIT ?) "
+            "RETURNING blob_digest",
+            (user_id, user_id, self.keep_document_versions),
+        ) as cursor:
+            released = [row[0] for row in await cursor.fetchall() if row[0] is not None]
+        if released:
+            await connection.executemany(
+                "UPDATE blobs SET refcount = refcount - 1 WHERE digest = ?",
+                [(digest,) for digest in released],
+            )
+
+    async def collect_garbage(self) -> int:
+        """
+        Delete blobs no document references any more.
+
+        Returns:
+            Number of blobs removed
+        """
+        if self.blob_store is None:
+            return 0
+        async with self._transaction() as connection:
+            async with connection.execute(
+                "DELETE FROM blobs WHERE refcount <= 0 RETURNING digest"
+            ) as cursor:
+                digests = [row[0] for row in await cursor.fetchall()]
+            # Unlink while still holding the write lock so no save can re-reference them.
+            for digest in digests:
+                await self.blob_store.delete(digest)
+        return len(digests)
+
+    async def create_job_application(self, user_id: int, job_url: str) -> int:
+        now = _now()
+        canonical_url = canonicalize_job_url(job_url)
+        try:
+            application_id = await self._execute(
+                "INSERT INTO job_applications "
+                "(user_id, job_url, canonical_url, ats_domain, started_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (user_id, job_url, canonical_url, ats_domain(job_url), now, now),
+            )
+        except sqlite3.IntegrityError:
+            existing = await self.find_job_application(user_id, job_url)
+            if existing is None:
+                raise
+            raise DuplicateApplication(existing["id"], job_url) from None
+        self.dedupe_filter.add(self._dedupe_key(user_id, canonical_url))
+        return application_id
+
+    async def find_job_application(self, user_id: int, job_url: str) -> dict[str, Any] | None:
+        canonical_url = canonicalize_job_url(job_url)
+        if self._dedupe_key(user_id, canonical_url) not in self.dedupe_filter:
+            self.dedupe_skips += 1
+            return None
+        row = await self._fetchone(
+            f"SELECT {_APPLICATION_COLUMNS} FROM job_applications "
+            "WHERE user_id = ? AND canonical_url = ?",
+            (user_id, canonical_url),
+        )
+        if row is not None:
+            row["metadata"] = _loads(row["metadata"])
+        return row
+
+    async def update_job_application(
+        self,
+        application_id: int,
+        status: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        # Same predecessor check as any other status change, just without an event.
+        await self.transition_application(application_id, status, metadata)
+
+    async def transition_application(
+        self,
+        application_id: int,
+        status: str,
+        metadata: dict[str, Any] | None = None,
+        event_type: str | None = None,
+        event_data: dict[str, Any] | None = None,
+    ) -> bool:
+        sources = allowed_predecessors(ApplicationStatus(status))
+        # Earlier buffered events must get lower ids than the one written here.
+        await self.history.flush_for(application_id)
+        now = _now()
+        # Status check, update and history row (via trigger) are a single statement.
+        updated = await self._execute_rowcount(
+            "UPDATE job_applications SET status = ?, metadata = json_patch(metadata, ?), "
+            "updated_at = ?, completed_at = CASE WHEN ? THEN ? ELSE completed_at END, "
+            "last_event_type = ?, last_event_data = ? "
+            f"WHERE id = ? AND status IN ({', '.join('?' * len(sources))})",
+            (
+                status,
+                json.dumps(metadata or {}, default=str),
+                now,
+                status in TERMINAL_STATUSES,
+                now,
+                event_type,
+                None if event_type is None else json.dumps(event_data or {}, default=str),
+                application_id,
+                *sources,
+            ),
+        )
+        if updated:
+            return True
+        current = await self._fetchone(
+            "SELECT status FROM job_applications WHERE id = ?", (application_id,)
+        )
+        if current is None:
+            return False
+        raise InvalidStatusTransition(application_id, current["status"], status)
+
+    async def get_job_application(self, application_id: int) -> dict[str, Any] | None:
+        row = await self._fetchone(
+            f"SELECT {_APPLICATION_COLUMNS} FROM job_applications WHERE id = ?",
+            (application_id,),
+        )
+        if row is not None:
+            row["metadata"] = _loads(row["metadata"])
+        return row
+
+    async def get_user_applications(
+        self, user_id: int, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        rows = await self._fetchall(
+            f"SELECT {_APPLICATION_COLUMNS} FROM job_applications "
+            "WHERE user_id = ? ORDER BY started_at DESC, id DESC LIMIT ?",
+            (user_id, -1 if limit is None else limit),
+        )
+        for row in rows:
+            row["metadata"] = _loads(row["metadata"])
+        return rows
+
+    async def query_applications(
+        self,
+        user_id: int,
+        statuses: Sequence[str] | None = None,
+        ats_domain: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        sql, params = self._application_query(
+            user_id, statuses, ats_domain, started_after, started_before, limit + 1, cursor
+        )
+        rows = await self._fetchall(sql, params)
+        for row in rows:
+            row["metadata"] = _loads(row["metadata"])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]["started_at"], rows[-1]["id"])
+        return {"items": rows, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _application_query(
+        user_id: int,
+        statuses: Sequence[str] | None,
+        domain: str | None,
+        started_after: datetime | None,
+        started_before: datetime | None,
+        limit: int,
+        cursor: str | None,
+    ) -> tuple[str, list[Any]]:
+        """Build the keyset query; every filter is a prefix of one of the indexes.
+
+        Several statuses become one arm per status joined by UNION ALL. Each arm
+        walks ``idx_job_applications_user_status`` already in page order, so
+        SQLite merges the arms and stops at the limit instead of reading the
+        user's whole history through ``user_started`` and filtering it.
+        """
+        where = ["user_id = ?"]
+        params: list[Any] = [user_id]
+        if domain:
+            where.append("ats_domain = ?")
+            params.append(domain.lower())
+        if started_after is not None:
+            where.append("started_at >= ?")
+            params.append(_timestamp(started_after))
+        if started_before is not None:
+            where.append("started_at < ?")
+            params.append(_timestamp(started_before))
+        if cursor is not None:
+            where.append("(started_at, id) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+        select = f"SELECT {_APPLICATION_COLUMNS} FROM job_applications WHERE "
+        wanted = list(dict.fromkeys(statuses or ()))
+        if not wanted:
+            sql = select + " AND ".join(where)
+        else:
+            arm = select + " AND ".join([where[0], "status = ?", *where[1:]])
+            sql = " UNION ALL ".join([arm] * len(wanted))
+            params = [value for status in wanted for value in (user_id, status, *params[1:])]
+        params.append(limit)
+        return sql + " ORDER BY started_at DESC, id DESC LIMIT ?", params
+
+    async def get_application_stats(
+        self,
+        user_id: int,
+        since: datetime | None = None,
+        ats_domain: str | None = None,
+    ) -> dict[str, Any]:
+        # Every query is a range scan of one user's (day, ats_domain) rows, so the
+        # cost depends on how many days and boards are covered, not on history size.
+        where = "user_id = ? AND day >= ?"
+        params: list[Any] = [user_id, "" if since is None else _timestamp(since)[:10]]
+        if ats_domain:
+            where += " AND ats_domain = ?"
+            params.append(ats_domain.lower())
+        async with self._reader() as connection:
+            async with connection.execute(
+                f"SELECT ats_domain, status, sum(count) FROM stats_daily WHERE {where} "
+                "GROUP BY ats_domain, status",
+                params,
+            ) as cursor:
+                daily = await cursor.fetchall()
+            async with connection.execute(
+                f"SELECT bucket, sum(count) FROM stats_durations WHERE {where} "
+                "GROUP BY bucket HAVING sum(count) > 0 ORDER BY bucket",
+                params,
+            ) as cursor:
+                durations = await cursor.fetchall()
+            async with connection.execute(
+                f"SELECT reason, sum(count) AS total FROM stats_failures WHERE {where} "
+                "GROUP BY reason HAVING total > 0 ORDER BY total DESC, reason LIMIT 5",
+                params,
+            ) as cursor:
+                failures = await cursor.fetchall()
+        return _summarize_stats(daily, durations, failures)
+
+    async def add_application_history(
+        self,
+        application_id: int,
+        event_type: str,
+        event_data: dict[str, Any],
+    ) -> None:
+        await self.history.add(
+            (application_id, event_type, json.dumps(event_data, default=str), _now())
+        )
+
+    async def _write_history(self, rows: list[HistoryRow]) -> None:
+        async with self._transaction() as connection:
+            await connection.executemany(
+                "INSERT INTO application_history "
+                "(application_id, event_type, event_data, created_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    async def get_application_history(self, application_id: int) -> list[dict[str, Any]]:
+        await self.history.flush_for(application_id)
+        rows = await self._fetchall(
+            "SELECT id, application_id, event_type, event_data, created_at "
+            "FROM application_history WHERE application_id = ? ORDER BY id",
+            (application_id,),
+        )
+        for row in rows:
+            row["event_data"] = _loads(row["event_data"])
+        if self.history_archive is None:
+            return rows
+        archived: list[dict[str, Any]] = []
+        for entry in await self._fetchall(
+            "SELECT segment, byte_offset, length FROM history_archive_index "
+            "WHERE application_id = ? ORDER BY segment, byte_offset",
+            (application_id,),
+        ):
+            archived.extend(
+                await self.history_archive.read(
+                    ArchiveLocation(entry["segment"], entry["byte_offset"], entry["length"])
+                )
+            )
+        return archived + rows
+
+    async def archive_history(self, older_than: timedelta, batch_size: int = 500) -> int:
+        """
+        Move the history of applications finished before ``older_than`` into the archive.
+
+        Args:
+            older_than: Minimum age of an application's completion
+            batch_size: Applications archived per transaction
+
+        Returns:
+            Number of applications whose history was archived
+        """
+        if self.history_archive is None:
+            return 0
+        await self.history.flush()
+        cutoff = _timestamp(datetime.now(UTC) - older_than)
+        terminal = tuple(TERMINAL_STATUSES)
+        total = 0
+        while True:
+            candidates = await self._fetchall(
+                "SELECT id FROM job_applications AS a "
+                "WHERE completed_at IS NOT NULL AND completed_at < ? "
+                f"AND status IN ({', '.join('?' * len(terminal))}) "
+                "AND EXISTS (SELECT 1 FROM application_history WHERE application_id = a.id) "
+                "LIMIT ?",
+                (cutoff, *terminal, batch_size),
+            )
+            if not candidates:
+                break
+            index_rows: list[tuple[Any, ...]] = []
+            deletions: list[tuple[int, int]] = []
+            now = _now()
+            for candidate in candidates:
+                application_id = candidate["id"]
+                events = await self._fetchall(
+                    "SELECT id, application_id, event_type, event_data, created_at "
+                    "FROM application_history WHERE application_id = ? ORDER BY id",
+                    (application_id,),
+                )
+                for event in events:
+                    event["event_data"] = _loads(event["event_data"])
+                # A crash after this append only leaves unindexed bytes in the segment.
+                location = await self.history_archive.append(application_id, events)
+                index_rows.append(
+                    (
+                        application_id,
+                        location.segment,
+                        location.offset,
+                        location.length,
+                        len(events),
+                        now,
+                    )
+                )
+                deletions.append((application_id, events[-1]["id"]))
+            async with self._transaction() as connection:
+                await connection.executemany(
+                    "INSERT INTO history_archive_index "
+                    "(application_id, segment, byte_offset, length, events, archived_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    index_rows,
+                )
+                await connection.executemany(
+                    "DELETE FROM application_history WHERE application_id = ? AND id <= ?",
+                    deletions,
+                )
+            total += len(candidates)
+        if total:
+            # execute() steps the pragma once, freeing a single page; a script runs it to the end.
+            await self._execute_script("PRAGMA incremental_vacuum;")
+        return total
+
+    async def get_telegram_file_id(
+        self, bot_id: int, content_hash: str, media_type: str
+    ) -> str | None:
+        row = await self._fetchone(
+            "SELECT file_id FROM telegram_files "
+            "WHERE bot_id = ? AND content_hash = ? AND media_type = ?",
+            (bot_id, content_hash, media_type),
+        )
+        return str(row["file_id"]) if row is not None else None
+
+    async def save_telegram_file_id(
+        self, bot_id: int, content_hash: str, media_type: str, file_id: str
+    ) -> None:
+        await self._execute(
+            "INSERT OR REPLACE INTO telegram_files (bot_id, content_hash, media_type, file_id) "
+            "VALUES (?, ?, ?, ?)",
+            (bot_id, content_hash, media_type, file_id),
+        )
+
+    async def save_pending_prompt(self, prompt: dict[str, Any]) -> None:
+        await self._execute(
+            "INSERT OR REPLACE INTO pending_prompts (application_id, prompt) VALUES (?, ?)",
+            (prompt["application_id"], json.dumps(prompt, default=str)),
+        )
+
+    async def get_pending_prompts(self) -> list[dict[str, Any]]:
+        rows = await self._fetchall("SELECT prompt FROM pending_prompts ORDER BY application_id")
+        return [json.loads(row["prompt"]) for row in rows]
+
+    async def delete_pending_prompt(self, application_id: int) -> None:
+        await self._execute(
+            "DELETE FROM pending_prompts WHERE application_id = ?", (application_id,)
+        )
+
+    async def enqueue_application(self, user_id: int, job_url: str, priority: int = 0) -> int:
+        return await self._execute(
+            "INSERT INTO application_queue (user_id, job_url, priority, enqueued_at) "
+            "VALUES (?, ?, ?, ?)",
+            (user_id, job_url, priority, _now()),
+        )
+
+    async def get_queued_applications(self) -> list[dict[str, Any]]:
+        return await self._fetchall(
+            "SELECT id, user_id, job_url, priority, enqueued_at FROM application_queue ORDER BY id"
+        )
+
+    async def delete_queued_application(self, queue_id: int) -> None:
+        await self._execute("DELETE FROM application_queue WHERE id = ?", (queue_id,))
@@ -1,5 +1,19 @@
 """Telegram infrastructure package."""
 
+from .chat_index import ChatIndex
+from .command_registry import CommandRegistry
+from .inbound_dispatcher import InboundDispatcher
+from .outbound_scheduler import MessagePriority, OutboundScheduler
 from .telegram_bot import TelegramBot
+from .webhook_server import WebhookConfig, WebhookServer
 
-__all__ = ["TelegramBot"]
+__all__ = [
+    "TelegramBot",
+    "InboundDispatcher",
+    "OutboundScheduler",
+    "MessagePriority",
+    "WebhookConfig",
+    "WebhookServer",
+    "ChatIndex",
+    "CommandRegistry",
+]
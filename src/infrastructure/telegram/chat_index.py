@@ -0,0 +1,103 @@
+"""Cached user to Telegram chat mapping backed by storage."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from src.domain.interfaces.storage import IStorage
+
+
+class ChatIndex:
+    """Bidirectional user_id <-> chat_id map with a bounded LRU in front of storage.
+
+    Storage stays the source of truth; ``register_chat`` writes through it, and
+    lookups only reach it on a cache miss, so notifying a set of warm users
+    costs no queries.
+    """
+
+    def __init__(self, storage: IStorage | None = None, max_entries: int = 10_000) -> None:
+        self.storage = storage
+        self.max_entries = max_entries
+        self._chat_by_user: OrderedDict[int, int] = OrderedDict()
+        self._user_by_chat: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def remember(self, user_id: int, chat_id: int) -> None:
+        previous = self._chat_by_user.pop(user_id, None)
+        if previous is not None:
+            self._user_by_chat.pop(previous, None)
+        self._chat_by_user[user_id] = chat_id
+        self._user_by_chat[chat_id] = user_id
+        while len(self._chat_by_user) > self.max_entries:
+            _, evicted_chat = self._chat_by_user.popitem(last=False)
+            self._user_by_chat.pop(evicted_chat, None)
+
+    async def register_chat(self, chat_id: int) -> int:
+        """
+        Return the user for a chat, creating one if the chat is new.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            User ID
+        """
+        user_id = await self.get_user_id(chat_id)
+        if user_id is not None:
+            return user_id
+        if self.storage is None:
+            raise RuntimeError("ChatIndex has no storage to create users in")
+        user_id = await self.storage.create_user(chat_id)
+        self.remember(user_id, chat_id)
+        return user_id
+
+    async def get_chat_id(self, user_id: int) -> int | None:
+        chat_id = self._chat_by_user.get(user_id)
+        if chat_id is not None:
+            self.hits += 1
+            self._chat_by_user.move_to_end(user_id)
+            return chat_id
+        self.misses += 1
+        if self.storage is None:
+            return None
+        user = await self.storage.get_user(user_id)
+        if user is None:
+            return None
+        chat_id = int(user["telegram_chat_id"])
+        self.remember(user_id, chat_id)
+        return chat_id
+
+    async def get_user_id(self, chat_id: int) -> int | None:
+        user_id = self._user_by_chat.get(chat_id)
+        if user_id is not None:
+            self.hits += 1
+            self._chat_by_user.move_to_end(user_id)
+            return user_id
+        self.misses += 1
+        if self.storage is None:
+            return None
+        user = await self.storage.get_user_by_telegram_id(chat_id)
+        if user is None:
+            return None
+        user_id = int(user["id"])
+        self.remember(user_id, chat_id)
+        return user_id
+
+    async def get_chat_ids(self, user_ids: list[int]) -> dict[int, int]:
+        """Resolve many users at once; only cache misses touch storage."""
+        resolved: dict[int, int] = {}
+        for user_id in user_ids:
+            chat_id = await self.get_chat_id(user_id)
+            if chat_id is not None:
+                resolved[user_id] = chat_id
+        return resolved
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._chat_by_user),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,201 @@
+"""Command registry with per-command concurrency limits and middleware."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Collection
+from dataclasses import dataclass, field
+from typing import Any
+
+from telegram import BotCommand
+
+from src.domain.interfaces.command_handler import ICommandHandler, ICommandRegistry
+from src.utils.logger import get_logger
+from src.utils.metrics import LatencyStats
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CommandContext:
+    """Everything a middleware needs to know about one command invocation."""
+
+    command: str
+    args: list[str]
+    update: Any
+    context: Any
+    chat_id: int | None
+    user_id: int | None
+    started_at: float = field(default_factory=time.perf_counter)
+    error: BaseException | None = None
+    rejected: bool = False
+
+
+CommandCall = Callable[[CommandContext], Awaitable[None]]
+Middleware = Callable[[CommandContext, CommandCall], Awaitable[None]]
+
+
+def auth_middleware(allowed_chat_ids: Collection[int]) -> Middleware:
+    """Only let commands from the given chats through."""
+    allowed = frozenset(allowed_chat_ids)
+
+    async def middleware(ctx: CommandContext, call_next: CommandCall) -> None:
+        if ctx.chat_id not in allowed:
+            ctx.rejected = True
+            return
+        await call_next(ctx)
+
+    return middleware
+
+
+async def error_capture_middleware(ctx: CommandContext, call_next: CommandCall) -> None:
+    """Log handler failures instead of letting them escape into the update loop."""
+    try:
+        await call_next(ctx)
+    except Exception as exc:
+        ctx.error = exc
+        logger.exception("command_failed", command=ctx.command, chat_id=ctx.chat_id)
+
+
+@dataclass
+class _Registration:
+    handler: ICommandHandler
+    semaphore: asyncio.Semaphore
+    stats: LatencyStats = field(default_factory=LatencyStats)
+    in_flight: int = 0
+    rejected: int = 0
+
+
+class CommandRegistry(ICommandRegistry):
+    """Routes Telegram commands to handlers through a middleware chain.
+
+    Lookup is a single dict access per update. Each command has its own
+    concurrency limit, so a burst of slow ``/apply`` calls queues behind its own
+    semaphore while ``/status`` keeps running. Handlers run in background tasks
+    so the update loop is never blocked, and every invocation's latency,
+    errors and auth rejections are recorded per command.
+    """
+
+    def __init__(
+        self,
+        default_concurrency: int = 4,
+        middlewares: list[Middleware] | None = None,
+    ) -> None:
+        self.default_concurrency = default_concurrency
+        self._middlewares: list[Middleware] = [error_capture_middleware, *(middlewares or [])]
+        self._commands: dict[str, _Registration] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def use(self, middleware: Middleware) -> None:
+        self._middlewares.append(middleware)
+
+    async def register_command(
+        self,
+        command: str,
+        handler: ICommandHandler,
+        max_concurrency: int | None = None,
+    ) -> None:
+        limit = max_concurrency or self.default_concurrency
+        self._commands[command.lower()] = _Registration(handler, asyncio.Semaphore(limit))
+
+    async def get_handler(self, command: str) -> ICommandHandler | None:
+        registration = self._commands.get(command.lower())
+        return registration.handler if registration else None
+
+    async def register_all_commands(self, bot: Any) -> None:
+        await bot.set_my_commands(
+            [BotCommand(item["command"], item["description"]) for item in self.get_all_commands()]
+        )
+
+    def get_all_commands(self) -> list[dict[str, str]]:
+        return [
+            {"command": name, "description": registration.handler.description}
+            for name, registration in self._commands.items()
+        ]
+
+    @staticmethod
+    def parse(text: str) -> tuple[str, list[str]] | None:
+        if not text.startswith("/"):
+            return None
+        head, *args = text.split()
+        command = head[1:].split("@", 1)[0].lower()
+        return (command, args) if command else None
+
+    async def dispatch(self, update: Any, context: Any) -> bool:
+        """
+        Route a command update to its handler.
+
+        Args:
+            update: Telegram update object
+            context: Telegram context object
+
+        Returns:
+            True if a registered command was scheduled, False otherwise
+        """
+        message = getattr(update, "effective_message", None)
+        parsed = self.parse(getattr(message, "text", None) or "")
+        if parsed is None:
+            return False
+        registration = self._commands.get(parsed[0])
+        if registration is None:
+            return False
+        chat = getattr(update, "effective_chat", None)
+        user = getattr(update, "effective_user", None)
+        ctx = CommandContext(
+            command=parsed[0],
+            args=parsed[1],
+            update=update,
+            context=context,
+            chat_id=getattr(chat, "id", None),
+            user_id=getattr(user, "id", None),
+        )
+        task = asyncio.get_running_loop().create_task(self._run(registration, ctx))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _run(self, registration: _Registration, ctx: CommandContext) -> None:
+        async def invoke(inner: CommandContext) -> None:
+            async with registration.semaphore:
+                registration.in_flight += 1
+                try:
+                    await registration.handler.handle(inner.update, inner.context)
+                finally:
+                    registration.in_flight -= 1
+
+        call: CommandCall = invoke
+        for middleware in reversed(self._middlewares):
+            call = self._bind(middleware, call)
+        try:
+            await call(ctx)
+        except Exception as exc:
+            ctx.error = exc
+            raise
+        finally:
+            if ctx.rejected:
+                registration.rejected += 1
+            else:
+                registration.stats.record(time.perf_counter() - ctx.started_at, ctx.error is None)
+
+    @staticmethod
+    def _bind(middleware: Middleware, call_next: CommandCall) -> CommandCall:
+        async def call(ctx: CommandContext) -> None:
+            await middleware(ctx, call_next)
+
+        return call
+
+    async def drain(self) -> None:
+        """Wait for all running command handlers to finish."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {
+                **registration.stats.snapshot(),
+                "in_flight": registration.in_flight,
+                "rejected": registration.rejected,
+            }
+            for name, registration in self._commands.items()
+        }
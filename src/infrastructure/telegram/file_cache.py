@@ -0,0 +1,84 @@
+"""Content-hash to Telegram file_id cache for repeat uploads."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from typing import TypeVar
+
+from src.domain.interfaces.storage import IStorage
+
+_CHUNK_SIZE = 1024 * 1024
+
+K = TypeVar("K")
+
+
+def _remember(cache: OrderedDict[K, str], key: K, value: str, limit: int) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+def _stat_key(path: str) -> tuple[str, int, int]:
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_obj:
+        while chunk := file_obj.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TelegramFileCache:
+    """Maps file content to the file_id Telegram assigned on first upload.
+
+    Lookups go to a bounded in-memory map first and fall back to storage, so
+    file_ids survive restarts. Content digests are memoized per path, size and
+    mtime, and all file I/O runs in worker threads.
+    """
+
+    def __init__(
+        self, bot_id: int, storage: IStorage | None = None, max_entries: int = 1024
+    ) -> None:
+        self.bot_id = bot_id
+        self.storage = storage
+        self.max_entries = max_entries
+        self._file_ids: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def digest(self, path: str) -> str:
+        key = await asyncio.to_thread(_stat_key, path)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = await asyncio.to_thread(_sha256_file, path)
+            _remember(self._digests, key, digest, self.max_entries)
+        return digest
+
+    async def get(self, content_hash: str, media_type: str) -> str | None:
+        key = (content_hash, media_type)
+        file_id = self._file_ids.get(key)
+        if file_id is None and self.storage is not None:
+            file_id = await self.storage.get_telegram_file_id(self.bot_id, content_hash, media_type)
+            if file_id is not None:
+                _remember(self._file_ids, key, file_id, self.max_entries)
+        if file_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return file_id
+
+    async def put(self, content_hash: str, media_type: str, file_id: str) -> None:
+        _remember(self._file_ids, (content_hash, media_type), file_id, self.max_entries)
+        if self.storage is not None:
+            await self.storage.save_telegram_file_id(self.bot_id, content_hash, media_type, file_id)
+
+    def invalidate(self, content_hash: str, media_type: str) -> None:
+        self._file_ids.pop((content_hash, media_type), None)
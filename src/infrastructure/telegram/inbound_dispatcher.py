@@ -0,0 +1,199 @@
+"""Routing of inbound Telegram messages to per-chat waiters."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+
+class _ChatMailbox:
+    """Pending waiters and buffered messages for one chat."""
+
+    __slots__ = ("buffer", "waiters", "correlated", "last_activity")
+
+    def __init__(self, max_buffered: int, now: float) -> None:
+        self.buffer: deque[dict[str, Any]] = deque(maxlen=max_buffered)
+        self.waiters: deque[asyncio.Future[dict[str, Any]]] = deque()
+        self.correlated: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self.last_activity = now
+
+    @property
+    def idle(self) -> bool:
+        return not self.waiters and not self.correlated
+
+
+class InboundDispatcher:
+    """Delivers each inbound message to the coroutine waiting for it.
+
+    A waiter may be correlated with the message id of the question it asked;
+    a Telegram reply to that question is routed to it directly, and a reply
+    to any other message never reaches it. Messages that are not replies go
+    to the oldest uncorrelated waiter, then to the oldest correlated one, and
+    are buffered (bounded, oldest dropped) when nobody is waiting. A
+    correlated wait only takes a buffered plain message sent after its
+    question. Chats with no waiters and no recent traffic are pruned.
+    """
+
+    def __init__(
+        self,
+        max_buffered: int = 20,
+        idle_ttl: float = 3600.0,
+        prune_every: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_buffered = max_buffered
+        self.idle_ttl = idle_ttl
+        self.prune_every = prune_every
+        self._clock = clock
+        self._mailboxes: dict[int, _ChatMailbox] = {}
+        self._since_prune = 0
+        self.delivered = 0
+        self.buffered = 0
+        self.dropped = 0
+
+    def _mailbox(self, chat_id: int) -> _ChatMailbox:
+        now = self._clock()
+        mailbox = self._mailboxes.get(chat_id)
+        if mailbox is None:
+            mailbox = self._mailboxes[chat_id] = _ChatMailbox(self.max_buffered, now)
+        mailbox.last_activity = now
+        return mailbox
+
+    def has_waiters(self, chat_id: int) -> bool:
+        mailbox = self._mailboxes.get(chat_id)
+        return mailbox is not None and not mailbox.idle
+
+    def dispatch(self, chat_id: int, message: dict[str, Any]) -> bool:
+        """
+        Route an inbound message.
+
+        Args:
+            chat_id: Chat the message arrived in
+            message: Normalized message dictionary
+
+        Returns:
+            True if a waiter received the message, False if it was buffered
+        """
+        self._since_prune += 1
+        if self._since_prune >= self.prune_every:
+            self.prune_idle()
+        mailbox = self._mailbox(chat_id)
+        future = self._claim_waiter(mailbox, message.get("reply_to_message_id"))
+        if future is not None:
+            future.set_result(message)
+            self.delivered += 1
+            return True
+        if len(mailbox.buffer) == mailbox.buffer.maxlen:
+            self.dropped += 1
+        mailbox.buffer.append(message)
+        self.buffered += 1
+        return False
+
+    @staticmethod
+    def _claim_waiter(
+        mailbox: _ChatMailbox, reply_to: int | None
+    ) -> asyncio.Future[dict[str, Any]] | None:
+        if reply_to is not None:
+            future = mailbox.correlated.pop(reply_to, None)
+            if future is not None and not future.done():
+                return future
+        while mailbox.waiters:
+            future = mailbox.waiters.popleft()
+            if not future.done():
+                return future
+        # A reply to some other message is not an answer to a pending question.
+        while reply_to is None and mailbox.correlated:
+            key = next(iter(mailbox.correlated))
+            future = mailbox.correlated.pop(key)
+            if not future.done():
+                return future
+        return None
+
+    async def wait(
+        self,
+        chat_id: int,
+        timeout: float | None = None,
+        reply_to: int | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Wait for the next message in a chat.
+
+        Args:
+            chat_id: Chat to wait on
+            timeout: Optional timeout in seconds
+            reply_to: Optional message id of the question being answered
+
+        Returns:
+            Message dictionary or None on timeout
+        """
+        mailbox = self._mailbox(chat_id)
+        buffered = self._take_buffered(mailbox, reply_to)
+        if buffered is not None:
+            return buffered
+
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        if reply_to is None:
+            mailbox.waiters.append(future)
+        else:
+            mailbox.correlated[reply_to] = future
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except TimeoutError:
+            return None
+        finally:
+            if reply_to is not None and mailbox.correlated.get(reply_to) is future:
+                del mailbox.correlated[reply_to]
+            elif reply_to is None and future in mailbox.waiters:
+                mailbox.waiters.remove(future)
+
+    @staticmethod
+    def _take_buffered(mailbox: _ChatMailbox, reply_to: int | None) -> dict[str, Any] | None:
+        if not mailbox.buffer:
+            return None
+        if reply_to is None:
+            return mailbox.buffer.popleft()
+        fallback: dict[str, Any] | None = None
+        for message in mailbox.buffer:
+            answered = message.get("reply_to_message_id")
+            if answered == reply_to:
+                mailbox.buffer.remove(message)
+                return message
+            # A plain message older than the question cannot be its answer.
+            if (
+                answered is None
+                and fallback is None
+                and (message.get("message_id") or 0) > reply_to
+            ):
+                fallback = message
+        if fallback is not None:
+            mailbox.buffer.remove(fallback)
+        return fallback
+
+    def prune_idle(self) -> int:
+        """
+        Drop mailboxes of chats with no waiters and no recent traffic.
+
+        Returns:
+            Number of chats pruned
+        """
+        self._since_prune = 0
+        cutoff = self._clock() - self.idle_ttl
+        stale = [
+            chat_id
+            for chat_id, mailbox in self._mailboxes.items()
+            if mailbox.idle and mailbox.last_activity < cutoff
+        ]
+        for chat_id in stale:
+            del self._mailboxes[chat_id]
+        return len(stale)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "chats": len(self._mailboxes),
+            "delivered": self.delivered,
+            "buffered": self.buffered,
+            "dropped": self.dropped,
+        }
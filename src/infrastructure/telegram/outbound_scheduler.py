@@ -0,0 +1,330 @@
+"""Rate-limited outbound delivery for Telegram Bot API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from enum import IntEnum
+from typing import Any
+
+from telegram.error import BadRequest, RetryAfter
+
+
+class MessagePriority(IntEnum):
+    """Delivery lane; lower values are sent first."""
+
+    URGENT = 0  # OTP prompts and questions the user must answer
+    NORMAL = 1
+    PROGRESS = 2  # Status updates that may be coalesced
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float]) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """Seconds until one token is available (0.0 if available now)."""
+        now = self._clock()
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self._tokens < 1:
+            wait = max(wait, (1 - self._tokens) / self.rate)
+        return wait
+
+    def consume(self) -> None:
+        self._refill(self._clock())
+        self._tokens -= 1
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, self._clock() + seconds)
+
+
+@dataclass
+class _Outbound:
+    chat_id: int
+    priority: MessagePriority
+    send: Callable[[], Awaitable[Any]] | None
+    futures: list[asyncio.Future[Any]] = field(default_factory=list)
+    progress_key: tuple[int, str] | None = None
+    text: str = ""
+    parse_mode: str | None = None
+    attempts: int = 0
+
+
+class OutboundScheduler:
+    """Sends Bot API requests under global and per-chat token buckets.
+
+    Requests wait in priority lanes so OTP prompts overtake progress notes.
+    At most one request per chat is in flight, which keeps per-chat ordering.
+    Progress updates sharing a key are coalesced: a queued update is replaced
+    by newer text, and once the status message exists later updates edit it
+    instead of posting new messages. A ``RetryAfter`` response pauses the chat
+    for the requested time and the request is retried at the head of its lane.
+    """
+
+    def __init__(
+        self,
+        bot: Any,
+        global_rate: float = 25.0,
+        global_burst: float = 25.0,
+        per_chat_rate: float = 1.0,
+        per_chat_burst: float = 3.0,
+        max_in_flight: int = 16,
+        max_attempts: int = 5,
+        max_tracked_progress: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.bot = bot
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self.max_in_flight = max_in_flight
+        self.max_attempts = max_attempts
+        self.max_tracked_progress = max_tracked_progress
+        self._clock = clock
+        self._global = TokenBucket(global_rate, global_burst, clock)
+        self._chats: dict[int, TokenBucket] = {}
+        self._lanes: dict[MessagePriority, deque[_Outbound]] = {
+            priority: deque() for priority in MessagePriority
+        }
+        self._in_flight: set[int] = set()
+        self._pending_progress: dict[tuple[int, str], _Outbound] = {}
+        self._progress_messages: OrderedDict[tuple[int, str], int] = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._worker: asyncio.Task[None] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.sent = 0
+        self.coalesced = 0
+        self.retried = 0
+
+    async def submit(
+        self,
+        chat_id: int,
+        send: Callable[[], Awaitable[Any]],
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> Any:
+        """
+        Queue a Bot API call and wait for its result.
+
+        Args:
+            chat_id: Target chat, used for per-chat limits and ordering
+            send: Zero-argument coroutine factory performing the call
+            priority: Delivery lane
+
+        Returns:
+            Whatever ``send`` returns
+        """
+        item = _Outbound(chat_id, priority, send)
+        return await self._enqueue(item)
+
+    async def submit_progress(
+        self,
+        chat_id: int,
+        key: str,
+        text: str,
+        parse_mode: str | None = None,
+    ) -> None:
+        """
+        Post or update the status message identified by ``key`` in a chat.
+
+        Args:
+            chat_id: Target chat
+            key: Identity of the status line (e.g. an application id)
+            text: Latest status text
+            parse_mode: Optional parse mode
+        """
+        progress_key = (chat_id, key)
+        pending = self._pending_progress.get(progress_key)
+        if pending is not None:
+            pending.text = text
+            pending.parse_mode = parse_mode
+            self.coalesced += 1
+            future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+            pending.futures.append(future)
+            await future
+            return
+        item = _Outbound(chat_id, MessagePriority.PROGRESS, None)
+        item.progress_key = progress_key
+        item.text = text
+        item.parse_mode = parse_mode
+        self._pending_progress[progress_key] = item
+        await self._enqueue(item)
+
+    def forget_progress(self, chat_id: int, key: str) -> None:
+        """Stop editing the current status message; the next update posts a new one."""
+        self._progress_messages.pop((chat_id, key), None)
+
+    async def _send_progress(self, item: _Outbound, progress_key: tuple[int, str]) -> Any:
+        message_id = self._progress_messages.get(progress_key)
+        if message_id is not None:
+            try:
+                return await self.bot.edit_message_text(
+                    chat_id=item.chat_id,
+                    message_id=message_id,
+                    text=item.text,
+                    parse_mode=item.parse_mode,
+                )
+            except BadRequest as exc:
+                if "not modified" in str(exc).lower():
+                    return None
+                # The status message is gone; fall through and post a new one.
+        message = await self.bot.send_message(
+            chat_id=item.chat_id, text=item.text, parse_mode=item.parse_mode
+        )
+        self._progress_messages[progress_key] = message.message_id
+        self._progress_messages.move_to_end(progress_key)
+        while len(self._progress_messages) > self.max_tracked_progress:
+            self._progress_messages.popitem(last=False)
+        return message
+
+    async def _enqueue(self, item: _Outbound) -> Any:
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        item.futures.append(future)
+        self._lanes[item.priority].append(item)
+        self.start()
+        self._wakeup.set()
+        return await future
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker after in-flight requests finish; queued requests fail."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for lane in self._lanes.values():
+            while lane:
+                self._resolve(lane.popleft(), error=RuntimeError("Outbound scheduler stopped"))
+        self._pending_progress.clear()
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(
+                self.per_chat_rate, self.per_chat_burst, self._clock
+            )
+        return bucket
+
+    def _next_ready(self) -> tuple[_Outbound | None, float | None]:
+        if len(self._in_flight) >= self.max_in_flight:
+            return None, None
+        global_delay = self._global.delay()
+        if global_delay > 0:
+            return None, global_delay
+        soonest: float | None = None
+        for priority in MessagePriority:
+            lane = self._lanes[priority]
+            for index, item in enumerate(lane):
+                if item.chat_id in self._in_flight:
+                    continue
+                delay = self._chat_bucket(item.chat_id).delay()
+                if delay == 0:
+                    del lane[index]
+                    return item, None
+                soonest = delay if soonest is None else min(soonest, delay)
+        return None, soonest
+
+    async def _run(self) -> None:
+        while True:
+            item, wait = self._next_ready()
+            if item is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except TimeoutError:
+                    pass
+                continue
+            self._global.consume()
+            self._chat_bucket(item.chat_id).consume()
+            self._in_flight.add(item.chat_id)
+            task = asyncio.get_running_loop().create_task(self._deliver(item))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, item: _Outbound) -> None:
+        result: Any = None
+        try:
+            if item.progress_key is not None:
+                # Updates arriving from now on queue behind this one instead of
+                # changing text that is already on its way.
+                self._drop_progress(item)
+                result = await self._send_progress(item, item.progress_key)
+            elif item.send is not None:
+                result = await item.send()
+        except RetryAfter as exc:
+            item.attempts += 1
+            self._chat_bucket(item.chat_id).block_for(_retry_seconds(exc.retry_after))
+            self.retried += 1
+            if item.attempts >= self.max_attempts:
+                self._resolve(item, error=exc)
+            else:
+                self._requeue(item)
+        except Exception as exc:
+            self._resolve(item, error=exc)
+        else:
+            self.sent += 1
+            self._resolve(item, result=result)
+        finally:
+            self._in_flight.discard(item.chat_id)
+            self._wakeup.set()
+
+    def _requeue(self, item: _Outbound) -> None:
+        if item.progress_key is not None:
+            newer = self._pending_progress.get(item.progress_key)
+            if newer is not None:
+                # A newer status is already queued; it supersedes this one.
+                newer.futures.extend(item.futures)
+                return
+            self._pending_progress[item.progress_key] = item
+        self._lanes[item.priority].appendleft(item)
+
+    def _drop_progress(self, item: _Outbound) -> None:
+        if item.progress_key is not None and self._pending_progress.get(item.progress_key) is item:
+            del self._pending_progress[item.progress_key]
+
+    @staticmethod
+    def _resolve(item: _Outbound, result: Any = None, error: BaseException | None = None) -> None:
+        for future in item.futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": sum(len(lane) for lane in self._lanes.values()),
+            "in_flight": len(self._in_flight),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "retried": self.retried,
+        }
+
+
+def _retry_seconds(retry_after: float | timedelta) -> float:
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
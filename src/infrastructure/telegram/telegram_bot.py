@@ -3,22 +3,49 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from collections.abc import Awaitable, Callable
+from pathlib import Path
 from typing import Any
 
-from telegram import BotCommand
-from telegram.ext import Application, CommandHandler
+from telegram import BotCommand, ForceReply, Message, Update
+from telegram.error import BadRequest
+from telegram.ext import Application, CommandHandler, MessageHandler, TypeHandler, filters
 
+from src.domain.interfaces.storage import IStorage
 from src.domain.interfaces.telegram import ITelegramBot
+from src.infrastructure.telegram.chat_index import ChatIndex
+from src.infrastructure.telegram.command_registry import CommandRegistry
+from src.infrastructure.telegram.file_cache import TelegramFileCache
+from src.infrastructure.telegram.inbound_dispatcher import InboundDispatcher
+from src.infrastructure.telegram.outbound_scheduler import MessagePriority, OutboundScheduler
+from src.infrastructure.telegram.webhook_server import WebhookConfig, WebhookServer
 
 
 class TelegramBot(ITelegramBot):
     """Telegram bot adapter with simple command registration."""
 
-    def __init__(self, bot_token: str) -> None:
+    def __init__(
+        self,
+        bot_token: str,
+        inbound: InboundDispatcher | None = None,
+        outbound: OutboundScheduler | None = None,
+        storage: IStorage | None = None,
+    ) -> None:
         self.application = Application.builder().token(bot_token).build()
-        self._chat_index: dict[int, int] = {}
-        self._queues: dict[int, asyncio.Queue[dict[str, Any]]] = {}
+        self.chat_index = ChatIndex(storage)
+        self.inbound = inbound or InboundDispatcher()
+        self.outbound = outbound or OutboundScheduler(self.application.bot)
+        bot_id = bot_token.split(":", 1)[0]
+        self.file_cache = TelegramFileCache(int(bot_id) if bot_id.isdigit() else 0, storage)
+        self.webhook: WebhookServer | None = None
+        self._unclaimed_handler: Callable[[int, dict[str, Any]], Awaitable[bool]] | None = None
+        self.application.add_handler(
+            MessageHandler(filters.TEXT & ~filters.COMMAND, self._on_message)
+        )
+        if storage is not None:
+            # Runs ahead of every other handler group, so each update keeps the index warm.
+            self.application.add_handler(TypeHandler(Update, self._track_chat), group=-1)
 
     async def send_message(
         self,
@@ -26,13 +53,30 @@ class TelegramBot(ITelegramBot):
         text: str,
         reply_to_message_id: int | None = None,
         parse_mode: str | None = None,
-    ) -> None:
-        await self.application.bot.send_message(
-            chat_id=chat_id,
-            text=text,
-            reply_to_message_id=reply_to_message_id,
-            parse_mode=parse_mode,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> int | None:
+        bot = self.application.bot
+        sent = await self.outbound.submit(
+            chat_id,
+            lambda: bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                reply_to_message_id=reply_to_message_id,
+                parse_mode=parse_mode,
+            ),
+            priority,
         )
+        return int(sent.message_id)
+
+    async def send_progress(
+        self,
+        chat_id: int,
+        key: str,
+        text: str,
+        parse_mode: str | None = None,
+    ) -> None:
+        """Post or edit the status line ``key``; superseded updates are coalesced."""
+        await self.outbound.submit_progress(chat_id, key, text, parse_mode)
 
     async def send_document(
         self,
@@ -40,8 +84,18 @@ class TelegramBot(ITelegramBot):
         document_path: str,
         caption: str | None = None,
     ) -> None:
-        with open(document_path, "rb") as file_obj:
-            await self.application.bot.send_document(chat_id=chat_id, document=file_obj, caption=caption)
+        bot = self.application.bot
+        await self._send_media(
+            chat_id,
+            document_path,
+            "document",
+            lambda media: bot.send_document(
+                chat_id=chat_id,
+                document=media,
+                caption=caption,
+                filename=os.path.basename(document_path),
+            ),
+        )
 
     async def send_photo(
         self,
@@ -49,8 +103,36 @@ class TelegramBot(ITelegramBot):
         photo_path: str,
         caption: str | None = None,
     ) -> None:
-        with open(photo_path, "rb") as file_obj:
-            await self.application.bot.send_photo(chat_id=chat_id, photo=file_obj, caption=caption)
+        bot = self.application.bot
+        await self._send_media(
+            chat_id,
+            photo_path,
+            "photo",
+            lambda media: bot.send_photo(chat_id=chat_id, photo=media, caption=caption),
+        )
+
+    async def _send_media(
+        self,
+        chat_id: int,
+        path: str,
+        media_type: str,
+        send: Callable[[str | bytes], Awaitable[Message]],
+    ) -> None:
+        """Send by cached file_id when possible, otherwise upload and cache the file_id."""
+        content_hash = await self.file_cache.digest(path)
+        file_id = await self.file_cache.get(content_hash, media_type)
+        if file_id is not None:
+            try:
+                await self.outbound.submit(chat_id, lambda: send(file_id))
+                return
+            except BadRequest:
+                # The file_id expired or belongs to another bot; upload again.
+                self.file_cache.invalidate(content_hash, media_type)
+
+        data = await asyncio.to_thread(Path(path).read_bytes)
+        message = await self.outbound.submit(chat_id, lambda: send(data))
+        uploaded = message.document if media_type == "document" else message.photo[-1]
+        await self.file_cache.put(content_hash, media_type, uploaded.file_id)
 
     async def register_command(
         self,
@@ -61,10 +143,22 @@ class TelegramBot(ITelegramBot):
         # Our generic handler is compatible at runtime, but python-telegram-bot's
         # CommandHandler callback type is more specific than mypy can infer.
         self.application.add_handler(CommandHandler(command, handler))  # type: ignore[arg-type]
-        self._chat_index.setdefault(hash(command), hash(description))
+
+    async def use_command_registry(self, registry: CommandRegistry) -> None:
+        """
+        Route every command update through ``registry`` and publish its commands.
+
+        Args:
+            registry: Registry holding the command handlers
+        """
+        self.application.add_handler(MessageHandler(filters.COMMAND, registry.dispatch))
+        await registry.register_all_commands(self.application.bot)
 
     async def set_commands(self, commands: list[dict[str, str]]) -> None:
-        command_defs = [BotCommand(command=item["command"], description=item["description"]) for item in commands]
+        command_defs = [
+            BotCommand(command=item["command"], description=item["description"])
+            for item in commands
+        ]
         await self.application.bot.set_my_commands(command_defs)
 
     async def wait_for_message(
@@ -72,11 +166,86 @@ class TelegramBot(ITelegramBot):
         chat_id: int,
         timeout: float | None = None,
     ) -> dict[str, Any] | None:
-        queue = self._queues.setdefault(chat_id, asyncio.Queue())
-        try:
-            return await asyncio.wait_for(queue.get(), timeout=timeout)
-        except TimeoutError:
-            return None
+        return await self.inbound.wait(chat_id, timeout=timeout)
+
+    async def ask(
+        self,
+        chat_id: int,
+        text: str,
+        timeout: float | None = None,
+        parse_mode: str | None = None,
+        on_sent: Callable[[int], Awaitable[None]] | None = None,
+    ) -> dict[str, Any] | None:
+        """Send a question and wait for the reply correlated with it."""
+        bot = self.application.bot
+        sent = await self.outbound.submit(
+            chat_id,
+            lambda: bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode=parse_mode,
+                reply_markup=ForceReply(selective=True),
+            ),
+            MessagePriority.URGENT,
+        )
+        reply = asyncio.ensure_future(
+            self.inbound.wait(chat_id, timeout=timeout, reply_to=sent.message_id)
+        )
+        if on_sent is not None:
+            # The wait is scheduled first, so a reply arriving meanwhile is still claimed.
+            try:
+                await on_sent(sent.message_id)
+            except BaseException:
+                reply.cancel()
+                raise
+        return await reply
+
+    def on_unclaimed_message(
+        self, handler: Callable[[int, dict[str, Any]], Awaitable[bool]] | None
+    ) -> None:
+        """
+        Route messages nobody is waiting for to ``handler`` before buffering them.
+
+        Args:
+            handler: Async callable taking (chat_id, message); returns True if it
+                consumed the message
+        """
+        self._unclaimed_handler = handler
+
+    async def _track_chat(self, update: Update, context: Any) -> None:
+        """Index the chat the first time it is seen; ``/start`` registers a new user."""
+        chat = update.effective_chat
+        if chat is None:
+            return
+        message = update.effective_message
+        words = (message.text or "").split() if message is not None else []
+        if words and words[0].split("@", 1)[0] == "/start":
+            await self.chat_index.register_chat(chat.id)
+        else:
+            await self.chat_index.get_user_id(chat.id)
+
+    async def _on_message(self, update: Update, context: Any) -> None:
+        message = update.effective_message
+        if message is None:
+            return
+        payload = self._message_to_dict(message)
+        handler = self._unclaimed_handler
+        if handler is not None and not self.inbound.has_waiters(message.chat_id):
+            if await handler(message.chat_id, payload):
+                return
+        self.inbound.dispatch(message.chat_id, payload)
+
+    @staticmethod
+    def _message_to_dict(message: Message) -> dict[str, Any]:
+        reply_to = message.reply_to_message
+        return {
+            "message_id": message.message_id,
+            "chat_id": message.chat_id,
+            "user_id": message.from_user.id if message.from_user else None,
+            "text": message.text or "",
+            "date": message.date.isoformat() if message.date else None,
+            "reply_to_message_id": reply_to.message_id if reply_to else None,
+        }
 
     async def start_polling(self) -> None:
         await self.application.initialize()
@@ -85,12 +254,35 @@ class TelegramBot(ITelegramBot):
             raise RuntimeError("Application updater is not initialised")
         await self.application.updater.start_polling()
 
+    async def start_webhook(
+        self, config: WebhookConfig, drop_pending_updates: bool = False
+    ) -> None:
+        """Receive updates through a local webhook server instead of long polling."""
+        await self.application.initialize()
+        await self.application.start()
+        self.webhook = WebhookServer(config, self._process_webhook_update)
+        await self.webhook.start()
+        await self.application.bot.set_webhook(
+            url=config.url,
+            secret_token=config.secret_token,
+            drop_pending_updates=drop_pending_updates,
+        )
+
+    async def _process_webhook_update(self, data: dict[str, Any]) -> None:
+        update = Update.de_json(data, self.application.bot)
+        await self.application.process_update(update)
+
     async def stop_polling(self) -> None:
         updater = self.application.updater
-        if updater is not None:
+        if updater is not None and updater.running:
             await updater.stop()
+        if self.webhook is not None:
+            await self.application.bot.delete_webhook()
+            await self.webhook.stop()
+            self.webhook = None
+        await self.outbound.stop()
         await self.application.stop()
         await self.application.shutdown()
 
     async def get_chat_id(self, user_id: int) -> int | None:
-        return self._chat_index.get(user_id)
+        return await self.chat_index.get_chat_id(user_id)
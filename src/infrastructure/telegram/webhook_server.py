@@ -0,0 +1,191 @@
+"""Minimal asyncio HTTP server receiving Telegram webhook updates."""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SECRET_HEADER = "x-telegram-bot-api-secret-token"
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+}
+
+
+@dataclass(frozen=True)
+class WebhookConfig:
+    """Where Telegram should deliver updates and how to verify them."""
+
+    url: str
+    secret_token: str
+    host: str = "127.0.0.1"
+    port: int = 8443
+    path: str = "/telegram/webhook"
+    max_body_bytes: int = 1024 * 1024
+
+
+class WebhookServer:
+    """Accepts Telegram update POSTs and hands each new update to a callback.
+
+    Requests must carry the configured secret token header. Telegram redelivers
+    updates it considers unacknowledged, so recently seen ``update_id`` values
+    are remembered and duplicates are acknowledged without being dispatched.
+    The response is written before the update is processed so Telegram never
+    waits on our handlers; an update whose processing fails is logged.
+    """
+
+    def __init__(
+        self,
+        config: WebhookConfig,
+        on_update: Callable[[dict[str, Any]], Coroutine[Any, Any, None]],
+        dedupe_window: int = 4096,
+    ) -> None:
+        self.config = config
+        self.on_update = on_update
+        self.dedupe_window = dedupe_window
+        self._seen: OrderedDict[int, None] = OrderedDict()
+        self._server: asyncio.Server | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._writers: set[asyncio.StreamWriter] = set()
+        self.received = 0
+        self.duplicates = 0
+        self.rejected = 0
+
+    @property
+    def port(self) -> int:
+        if self._server is None or not self._server.sockets:
+            return self.config.port
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.config.host, self.config.port
+        )
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                keep_alive = await self._handle_request(reader, writer)
+                if not keep_alive:
+                    break
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ConnectionError,
+            ValueError,
+        ):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _handle_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        head = await reader.readuntil(b"\r\n\r\n")
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        method, path, _version = request_line.split(" ", 2)
+        headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close"
+
+        length_header = headers.get("content-length")
+        if length_header is None or not length_header.isdigit():
+            await self._respond(writer, 411, keep_alive=False)
+            return False
+        length = int(length_header)
+        if length > self.config.max_body_bytes:
+            await self._respond(writer, 413, keep_alive=False)
+            return False
+        body = await reader.readexactly(length)
+
+        if path.split("?", 1)[0] != self.config.path:
+            await self._respond(writer, 404, keep_alive)
+            return keep_alive
+        if method != "POST":
+            await self._respond(writer, 405, keep_alive)
+            return keep_alive
+        if not hmac.compare_digest(
+            headers.get(SECRET_HEADER, "").encode(), self.config.secret_token.encode()
+        ):
+            self.rejected += 1
+            await self._respond(writer, 403, keep_alive)
+            return keep_alive
+        try:
+            update = json.loads(body)
+        except ValueError:
+            await self._respond(writer, 400, keep_alive)
+            return keep_alive
+        if not isinstance(update, dict):
+            await self._respond(writer, 400, keep_alive)
+            return keep_alive
+
+        await self._respond(writer, 200, keep_alive)
+        if self._is_duplicate(update.get("update_id")):
+            self.duplicates += 1
+        else:
+            self.received += 1
+            task = asyncio.get_running_loop().create_task(self.on_update(update))
+            self._tasks.add(task)
+            task.add_done_callback(self._update_done)
+        return keep_alive
+
+    def _update_done(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error("webhook_update_failed", exc_info=exc)
+
+    def _is_duplicate(self, update_id: Any) -> bool:
+        if not isinstance(update_id, int):
+            return False
+        if update_id in self._seen:
+            return True
+        self._seen[update_id] = None
+        if len(self._seen) > self.dedupe_window:
+            self._seen.popitem(last=False)
+        return False
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, keep_alive: bool) -> None:
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                "Content-Length: 0\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
@@ -0,0 +1,64 @@
+"""Lightweight in-process latency metrics."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+
+class LatencyStats:
+    """Count, mean and percentiles over a bounded window of latency samples."""
+
+    def __init__(self, max_samples: int = 1024) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: deque[float] = deque(maxlen=max_samples)
+
+    def record(self, seconds: float, ok: bool = True) -> None:
+        """
+        Record one observation.
+
+        Args:
+            seconds: Observed latency in seconds
+            ok: False if the observed operation failed
+        """
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._samples.append(seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Nearest-rank percentile over the retained samples.
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds (0.0 when no samples were recorded)
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.mean * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
@@ -0,0 +1,134 @@
+"""Job URL helpers."""
+
+from __future__ import annotations
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only say how someone got to the posting.
+TRACKING_PARAMS = frozenset(
+    {
+        "gclid",
+        "fbclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "ref",
+        "referrer",
+        "source",
+        "src",
+        "trk",
+        "trackingid",
+        "gh_src",
+        "lever-source",
+        "lever-origin",
+        "lever-via",
+        "ashby_src",
+    }
+)
+
+_LOCALE = re.compile(r"^[a-z]{2}-[a-z]{2}$", re.IGNORECASE)
+
+
+def validate_job_url(url: str) -> None:
+    """
+    Check that a job URL can be parsed by the helpers in this module.
+
+    Args:
+        url: Job URL as the user sent it
+
+    Raises:
+        ValueError: If the host is malformed or the port is not a valid number
+    """
+    try:
+        # Reading the port is what rejects one that is not a number in range.
+        _ = urlsplit(url.strip()).port
+    except ValueError as exc:
+        raise ValueError(f"Malformed job URL {url[:80]!r}: {exc}") from exc
+
+
+def ats_domain(url: str) -> str:
+    """Return the lower-cased host a job URL points at, e.g. ``boards.greenhouse.io``."""
+    return (urlsplit(url.strip()).hostname or "").lower()
+
+
+def canonicalize_job_url(url: str) -> str:
+    """
+    Reduce a job URL to a key that is equal for every link to the same posting.
+
+    Postings on Greenhouse, Lever, Ashby and Workday map to ``<ats>:<posting id>``
+    whatever host, embed or apply page the link used, so the result is a
+    dedupe key rather than something to navigate to. Any other URL is
+    normalized: https, lower-cased host without ``www.``, no fragment, no
+    trailing slash and no tracking parameters, with the rest of the query
+    sorted.
+
+    Args:
+        url: Job URL as the user sent it
+
+    Returns:
+        Canonical key for the posting
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    segments = [segment for segment in parts.path.split("/") if segment]
+    query = {key.lower(): value for key, value in parse_qsl(parts.query)}
+
+    posting = _ats_posting(host, segments, query)
+    if posting is not None:
+        return posting
+
+    kept = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    netloc = host if parts.port in (None, 80, 443) else f"{host}:{parts.port}"
+    path = "/" + "/".join(segments) if segments else ""
+    return urlunsplit(("https", netloc, path, urlencode(kept), ""))
+
+
+def _ats_posting(host: str, segments: list[str], query: dict[str, str]) -> str | None:
+    lowered = [segment.lower() for segment in segments]
+    # Company career pages embed Greenhouse and Ashby boards with the id in the query.
+    if query.get("gh_jid", "").isdigit():
+        return f"greenhouse:{query['gh_jid']}"
+    if query.get("ashby_jid"):
+        return f"ashby:{query['ashby_jid'].lower()}"
+
+    if host.endswith("greenhouse.io"):
+        if query.get("token", "").isdigit():
+            return f"greenhouse:{query['token']}"
+        if "jobs" in lowered:
+            index = lowered.index("jobs")
+            if index + 1 < len(segments) and segments[index + 1].isdigit():
+                return f"greenhouse:{segments[index + 1]}"
+    elif host.endswith("lever.co") and len(segments) >= 2:
+        return f"lever:{lowered[0]}/{lowered[1]}"
+    elif host == "jobs.ashbyhq.com" and len(segments) >= 2:
+        return f"ashby:{lowered[1]}"
+    elif host.endswith("myworkdayjobs.com"):
+        return _workday_posting(host, lowered)
+    return None
+
+
+def _workday_posting(host: str, segments: list[str]) -> str | None:
+    # {tenant}.wd5.myworkdayjobs.com/[en-US/]{site}/job/{location}/{title}_{REQ}[/apply/...]
+    if segments and _LOCALE.match(segments[0]):
+        segments = segments[1:]
+    for marker in ("job", "details"):
+        if marker in segments[1:]:
+            tail = segments[segments.index(marker, 1) + 1 :]
+            break
+    else:
+        return None
+    while tail and tail[-1].startswith("apply"):
+        tail = tail[:-1]
+    if not tail:
+        return None
+    tenant = host.split(".", 1)[0]
+    return f"workday:{tenant}/{segments[0]}/{tail[-1].rsplit('_', 1)[-1]}"
@@ -0,0 +1,126 @@
+"""Integration tests for the per-user sharded SQLite storage."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from src.domain.models.job_application import DuplicateApplication, InvalidStatusTransition
+from src.infrastructure.storage.sharded_storage import (
+    ShardedSQLiteStorage,
+    decode_application_id,
+)
+
+
+@pytest_asyncio.fixture
+async def storage(tmp_path):
+    storage = ShardedSQLiteStorage(tmp_path, max_open_shards=2)
+    await storage.initialize()
+    yield storage
+    await storage.close()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_applications_live_in_the_users_shard(storage, tmp_path):
+    """Test that each user's applications go to their own file under global ids."""
+    alice = await storage.create_user(1)
+    bob = await storage.create_user(2)
+    await storage.save_user_profile(alice, {"personal_info": {"first_name": "Alice"}})
+
+    alice_app = await storage.create_job_application(alice, "https://jobs.lever.co/acme/a-1")
+    bob_app = await storage.create_job_application(bob, "https://jobs.lever.co/acme/a-1")
+
+    assert decode_application_id(alice_app) == (alice, 1)
+    assert decode_application_id(bob_app) == (bob, 1)
+    assert {path.name for path in (tmp_path / "shards").glob("*.db")} == {
+        f"user-{alice}.db",
+        f"user-{bob}.db",
+    }
+    assert (await storage.get_user_profile(alice))["personal_info"]["first_name"] == "Alice"
+
+    assert await storage.transition_application(
+        alice_app, "in_progress", event_type="started", event_data={"n": 1}
+    )
+    application = await storage.get_job_application(alice_app)
+    assert (application["id"], application["status"]) == (alice_app, "in_progress")
+    assert [row["application_id"] for row in await storage.get_application_history(alice_app)] == [
+        alice_app
+    ]
+    assert [row["id"] for row in await storage.get_user_applications(bob)] == [bob_app]
+    assert (await storage.query_applications(alice))["items"][0]["id"] == alice_app
+    assert (await storage.find_job_application(alice, "https://jobs.lever.co/acme/a-1/apply"))[
+        "id"
+    ] == alice_app
+    assert (await storage.get_application_stats(alice))["started"] == 1
+
+    with pytest.raises(DuplicateApplication) as duplicate:
+        await storage.create_job_application(alice, "https://jobs.lever.co/ACME/a-1")
+    assert duplicate.value.application_id == alice_app
+    with pytest.raises(InvalidStatusTransition) as invalid:
+        await storage.transition_application(bob_app, "completed")
+    assert invalid.value.application_id == bob_app
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_idle_shards_are_evicted_and_reopened(storage):
+    """Test that only max_open_shards stay open and evicted shards keep their data."""
+    users = [await storage.create_user(chat_id) for chat_id in range(10, 14)]
+    app_ids = await asyncio.gather(
+        *(storage.create_job_application(user, f"https://acme.com/jobs/{user}") for user in users)
+    )
+    for app_id in app_ids:
+        await storage.add_application_history(app_id, "note", {"text": "hi"})
+
+    assert storage.stats()["open_shards"] == 2
+    assert storage.evicted >= 2
+    for app_id in app_ids:
+        assert [row["event_type"] for row in await storage.get_application_history(app_id)] == [
+            "note"
+        ]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_shards_in_use_are_never_closed(tmp_path):
+    """Test that eviction under contention skips a held shard and every call still succeeds."""
+    storage = ShardedSQLiteStorage(tmp_path, max_open_shards=1)
+    await storage.initialize()
+    users = [await storage.create_user(chat_id) for chat_id in range(20, 24)]
+    app_ids = [
+        await storage.create_job_application(user, f"https://acme.com/jobs/{user}")
+        for user in users
+    ]
+
+    async with storage._shard(users[0]) as held:
+        await asyncio.gather(
+            *(
+                storage.add_application_history(app_id, "note", {"n": n})
+                for n in range(3)
+                for app_id in app_ids[1:]
+            )
+        )
+        assert storage._shards[users[0]].storage is held
+        assert (await held.get_job_application(1))["status"] == "pending"
+
+    histories = await asyncio.gather(
+        *(storage.get_application_history(app_id) for app_id in app_ids * 3)
+    )
+    assert [len(history) for history in histories] == [0, 3, 3, 3] * 3
+    assert storage.stats()["open_shards"] == 1
+    assert list(storage._locks) == list(storage._shards)
+    await storage.close()
+    assert storage._locks == {}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_unknown_users_read_as_empty(storage):
+    """Test that ids of users without a shard behave like missing rows."""
+    assert await storage.get_job_application(99 << 32 | 1) is None
+    assert await storage.get_user_applications(99) == []
+    assert not await storage.transition_application(99 << 32 | 1, "in_progress")
+    assert (await storage.get_application_stats(99))["started"] == 0
+    with pytest.raises(ValueError):
+        await storage.create_job_application(99, "https://acme.com/jobs/1")
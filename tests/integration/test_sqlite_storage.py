@@ -0,0 +1,459 @@
+"""Integration tests for the SQLite storage."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from src.domain.models.job_application import DuplicateApplication, InvalidStatusTransition
+from src.infrastructure.storage.blob_store import BlobStore
+from src.infrastructure.storage.history_archive import HistoryArchive
+from src.infrastructure.storage.sqlite_storage import MIGRATIONS, SQLiteStorage
+
+
+@pytest_asyncio.fixture
+async def storage(tmp_path):
+    storage = SQLiteStorage(tmp_path / "claw.db", readers=2)
+    await storage.initialize()
+    yield storage
+    await storage.close()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_schema_uses_wal_and_records_version(storage):
+    """Test that initialize enables WAL and applies every migration once."""
+    async with storage._reader() as connection:
+        async with connection.execute("PRAGMA journal_mode") as cursor:
+            assert (await cursor.fetchone())[0] == "wal"
+        async with connection.execute("PRAGMA user_version") as cursor:
+            assert (await cursor.fetchone())[0] == len(MIGRATIONS)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_round_trips_user_data(storage):
+    """Test that users, config, profile and documents are stored and read back."""
+    user_id = await storage.create_user(555)
+    assert await storage.create_user(555) == user_id
+    assert (await storage.get_user(user_id))["telegram_chat_id"] == 555
+    assert (await storage.get_user_by_telegram_id(555))["id"] == user_id
+
+    await storage.save_user_config(
+        user_id, "1:abc", "sk", "gpt-4o", "https://x", {"long_form": "o"}
+    )
+    assert (await storage.get_user_config(user_id))["model_routes"] == {"long_form": "o"}
+    await storage.save_user_profile(user_id, {"personal_info": {"first_name": "Jane"}})
+    assert (await storage.get_user_profile(user_id))["personal_info"]["first_name"] == "Jane"
+    await storage.save_resume(user_id, "/old.pdf", "pdf")
+    await storage.save_resume(user_id, "/new.pdf", "pdf")
+    assert (await storage.get_resume(user_id))["file_path"] == "/new.pdf"
+    await storage.save_cover_letter(user_id, "Dear team")
+    assert (await storage.get_cover_letter(user_id))["content"] == "Dear team"
+
+    await storage.save_telegram_file_id(1, "abc", "document", "FILE")
+    assert await storage.get_telegram_file_id(1, "abc", "document") == "FILE"
+    await storage.save_pending_prompt({"application_id": 9, "question": "?"})
+    assert await storage.get_pending_prompts() == [{"application_id": 9, "question": "?"}]
+    await storage.delete_pending_prompt(9)
+    assert await storage.get_pending_prompts() == []
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_application_updates_merge_metadata(storage):
+    """Test that status updates merge metadata and stamp completion."""
+    user_id = await storage.create_user(1)
+    app_id = await storage.create_job_application(user_id, "https://jobs.test/1")
+    await storage.update_job_application(app_id, "in_progress", {"step": 1})
+    await storage.update_job_application(app_id, "completed", {"confirmation": "X"})
+    application = await storage.get_job_application(app_id)
+    assert application["status"] == "completed"
+    assert application["metadata"] == {"step": 1, "confirmation": "X"}
+    assert application["completed_at"] is not None
+    with pytest.raises(InvalidStatusTransition):
+        await storage.update_job_application(app_id, "in_progress")
+
+    await storage.add_application_history(app_id, "form_filled", {"unmatched": []})
+    history = await storage.get_application_history(app_id)
+    assert [event["event_type"] for event in history] == ["form_filled"]
+    assert [a["id"] for a in await storage.get_user_applications(user_id, limit=1)] == [app_id]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_concurrent_writes_and_reads(storage):
+    """Test that concurrent updates and reads all complete without lock errors."""
+    user_id = await storage.create_user(2)
+    app_ids = [
+        await storage.create_job_application(user_id, f"https://jobs.test/{n}") for n in range(20)
+    ]
+
+    async def worker(app_id):
+        for step in range(10):
+            await storage.update_job_application(app_id, "in_progress", {"step": step})
+            assert (await storage.get_job_application(app_id))["metadata"]["step"] == step
+
+    await asyncio.gather(*(worker(app_id) for app_id in app_ids))
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_in_memory_database_reads_through_writer():
+    """Test that an in-memory database works without a reader pool."""
+    storage = SQLiteStorage(":memory:")
+    await storage.initialize()
+    user_id = await storage.create_user(3)
+    assert (await storage.get_user(user_id))["telegram_chat_id"] == 3
+    await storage.close()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_history_is_group_committed_and_flushed_on_close(tmp_path):
+    """Test that buffered history survives close and is batched."""
+    storage = SQLiteStorage(tmp_path / "claw.db", history_flush_interval=60)
+    await storage.initialize()
+    user_id = await storage.create_user(4)
+    app_ids = [await storage.create_job_application(user_id, f"https://j/{n}") for n in range(5)]
+    await asyncio.gather(*(storage.add_application_history(a, "started", {}) for a in app_ids))
+    assert storage.history.pending == 5
+    await storage.close()
+
+    reopened = SQLiteStorage(tmp_path / "claw.db")
+    await reopened.initialize()
+    assert len(await reopened.get_application_history(app_ids[-1])) == 1
+    await reopened.close()
+    assert storage.history.stats()["batches"] == 1
+
+
+async def _seed_applications(storage, count=30):
+    user_id = await storage.create_user(5)
+    hosts = ["boards.greenhouse.io", "jobs.lever.co", "acme.wd5.myworkdayjobs.com"]
+    for n in range(count):
+        app_id = await storage.create_job_application(user_id, f"https://{hosts[n % 3]}/job/{n}")
+        await storage.update_job_application(app_id, "in_progress")
+        await storage.update_job_application(app_id, "failed" if n % 2 else "completed")
+    return user_id
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_query_applications_filters_and_pages(storage):
+    """Test that keyset pages cover every match exactly once, newest first."""
+    user_id = await _seed_applications(storage)
+    seen = []
+    cursor = None
+    while True:
+        page = await storage.query_applications(
+            user_id, statuses=["failed"], ats_domain="Jobs.Lever.Co", limit=2, cursor=cursor
+        )
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    expected = [
+        a["id"]
+        for a in await storage.get_user_applications(user_id)
+        if a["status"] == "failed" and a["ats_domain"] == "jobs.lever.co"
+    ]
+    assert seen == expected
+    assert len(seen) == 5
+
+    statuses = ["completed", "failed"]
+    pages = []
+    cursor = None
+    while cursor is not None or not pages:
+        page = await storage.query_applications(user_id, statuses=statuses, limit=4, cursor=cursor)
+        pages.append([item["id"] for item in page["items"]])
+        cursor = page["next_cursor"]
+    everything = await storage.get_user_applications(user_id)
+    assert [app_id for page in pages for app_id in page] == [a["id"] for a in everything]
+    assert all(len(page) == 4 for page in pages[:-1]) and len(pages) == 8
+
+    future = await storage.query_applications(user_id, started_after=datetime(2999, 1, 1))
+    assert future == {"items": [], "next_cursor": None}
+    with pytest.raises(ValueError):
+        await storage.query_applications(user_id, cursor="not-a-cursor")
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("filters", "index"),
+    [
+        ({}, "idx_job_applications_user_started"),
+        ({"statuses": ["failed"]}, "idx_job_applications_user_status"),
+        ({"statuses": ["failed", "completed", "failed"]}, "idx_job_applications_user_status"),
+        ({"domain": "jobs.lever.co"}, "idx_job_applications_user_domain"),
+        ({"started_after": datetime(2024, 1, 1)}, "idx_job_applications_user_started"),
+    ],
+)
+async def test_application_queries_use_indexes(storage, filters, index):
+    """Test that list queries search an index and never sort in a temp B-tree."""
+    await _seed_applications(storage, count=3)
+    args = {
+        "statuses": None,
+        "domain": None,
+        "started_after": None,
+        "started_before": None,
+        "limit": 51,
+        "cursor": "MjAyNC0wMS0wMVQwMDowMDowMCswMDowMHwxMA==",
+        **filters,
+    }
+    sql, params = storage._application_query(1, **args)
+    async with storage._reader() as connection:
+        async with connection.execute(f"EXPLAIN QUERY PLAN {sql}", params) as cursor:
+            plan = " ".join(row[3] for row in await cursor.fetchall())
+    assert f"USING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_transition_updates_status_and_history_together(storage):
+    """Test that a transition writes both rows and invalid ones write neither."""
+    user_id = await storage.create_user(6)
+    app_id = await storage.create_job_application(user_id, "https://jobs.test/6")
+    await storage.add_application_history(app_id, "queued", {})
+    assert await storage.transition_application(app_id, "in_progress", event_type="started")
+    assert await storage.transition_application(
+        app_id, "completed", {"confirmation": "X"}, "submitted", {"ok": True}
+    )
+    with pytest.raises(InvalidStatusTransition):
+        await storage.transition_application(app_id, "in_progress", event_type="retried")
+    assert await storage.transition_application(999, "in_progress") is False
+
+    application = await storage.get_job_application(app_id)
+    assert application["status"] == "completed"
+    assert application["metadata"] == {"confirmation": "X"}
+    history = await storage.get_application_history(app_id)
+    assert [e["event_type"] for e in history] == ["queued", "started", "submitted"]
+    assert history[-1]["event_data"] == {"ok": True}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_documents_are_deduplicated_and_collected(tmp_path):
+    """Test that shared resumes are stored once and unreferenced blobs are removed."""
+    blobs = BlobStore(tmp_path / "blobs")
+    storage = SQLiteStorage(tmp_path / "claw.db", blob_store=blobs, keep_document_versions=1)
+    await storage.initialize()
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF shared template")
+    first = await storage.create_user(10)
+    second = await storage.create_user(11)
+    await storage.save_resume(first, str(resume), "pdf")
+    await storage.save_resume(second, str(resume), "pdf")
+    shared = (await storage.get_resume(first))["blob_digest"]
+    assert (await storage.get_resume(second))["blob_path"] == str(blobs.path(shared))
+    assert await storage.collect_garbage() == 0
+
+    await storage.save_cover_letter(first, "Dear team, v1")
+    await storage.save_cover_letter(first, "Dear team, v2")
+    assert (await storage.get_cover_letter(first))["content"] == "Dear team, v2"
+    assert await storage.collect_garbage() == 1
+
+    resume.write_bytes(b"%PDF updated")
+    await storage.save_resume(first, str(resume), "pdf")
+    assert await storage.collect_garbage() == 0
+    await storage.save_resume(second, str(resume), "pdf")
+    assert await storage.collect_garbage() == 1
+    assert not blobs.exists(shared)
+    await storage.close()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_finished_history_is_archived_and_still_readable(tmp_path):
+    """Test that terminal applications' events move to segments but stay readable."""
+    storage = SQLiteStorage(tmp_path / "claw.db", history_archive=HistoryArchive(tmp_path / "a"))
+    await storage.initialize()
+    user_id = await storage.create_user(12)
+    done = await storage.create_job_application(user_id, "https://jobs.test/done")
+    active = await storage.create_job_application(user_id, "https://jobs.test/active")
+    for app_id in (done, active):
+        await storage.transition_application(app_id, "in_progress", event_type="started")
+        await storage.add_application_history(app_id, "form_filled", {"unmatched": ["x"]})
+    await storage.transition_application(done, "completed", event_type="submitted")
+    expected = await storage.get_application_history(done)
+
+    assert await storage.archive_history(timedelta(days=1)) == 0
+    assert await storage.archive_history(timedelta(0)) == 1
+    assert await storage.archive_history(timedelta(0)) == 0
+    assert await storage.get_application_history(done) == expected
+    assert len(await storage.get_application_history(active)) == 2
+    async with storage._reader() as connection:
+        async with connection.execute("SELECT COUNT(*) FROM application_history") as cursor:
+            assert (await cursor.fetchone())[0] == 2
+    await storage.close()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_archiving_hands_freed_pages_back(tmp_path):
+    """Test that archiving drains the free list instead of vacuuming a single page."""
+    storage = SQLiteStorage(tmp_path / "claw.db", history_archive=HistoryArchive(tmp_path / "a"))
+    await storage.initialize()
+    user_id = await storage.create_user(15)
+    app_id = await storage.create_job_application(user_id, "https://jobs.test/big")
+    await storage.transition_application(app_id, "in_progress", event_type="started")
+    for step in range(200):
+        await storage.add_application_history(
+            app_id, "form_filled", {"blob": "x" * 2000, "n": step}
+        )
+    await storage.transition_application(app_id, "completed", event_type="submitted")
+    await storage.history.flush()
+
+    async def pragma(name):
+        async with storage._reader() as connection:
+            async with connection.execute(f"PRAGMA {name}") as cursor:
+                return (await cursor.fetchone())[0]
+
+    pages_before = await pragma("page_count")
+    assert await storage.archive_history(timedelta(0)) == 1
+    assert await pragma("freelist_count") == 0
+    assert await pragma("page_count") < pages_before - 50
+    await storage.close()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_duplicate_postings_are_found_and_rejected(storage):
+    """Test that URL variants of one posting map to a single application per user."""
+    user_id = await storage.create_user(13)
+    other_id = await storage.create_user(14)
+    app_id = await storage.create_job_application(
+        user_id, "https://boards.greenhouse.io/acme/jobs/4012345?gh_src=linkedin"
+    )
+
+    variant = "https://acme.com/careers?gh_jid=4012345&utm_source=x"
+    assert (await storage.find_job_application(user_id, variant))["id"] == app_id
+    with pytest.raises(DuplicateApplication) as exc:
+        await storage.create_job_application(user_id, variant)
+    assert exc.value.application_id == app_id
+    assert await storage.find_job_application(other_id, variant) is None
+    assert await storage.create_job_application(other_id, variant) != app_id
+
+    skips = storage.dedupe_skips
+    assert await storage.find_job_application(user_id, "https://jobs.lever.co/acme/x") is None
+    assert storage.dedupe_skips == skips + 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_canonical_urls_are_backfilled_on_initialize(tmp_path):
+    """Test that rows without a canonical URL get one and are found after restart."""
+    storage = SQLiteStorage(tmp_path / "claw.db")
+    await storage.initialize()
+    user_id = await storage.create_user(15)
+    app_id = await storage.create_job_application(user_id, "https://Jobs.Lever.co/Acme/abc-123")
+    await storage._execute("UPDATE job_applications SET canonical_url = NULL")
+    await storage.close()
+
+    reopened = SQLiteStorage(tmp_path / "claw.db")
+    await reopened.initialize()
+    found = await reopened.find_job_application(user_id, "https://jobs.lever.co/acme/abc-123/apply")
+    await reopened.close()
+
+    assert found["id"] == app_id
+    assert found["canonical_url"] == "lever:acme/abc-123"
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_application_stats_follow_transitions(storage):
+    """Test that aggregates follow inserts and status changes, counting only the latest outcome."""
+    user_id = await storage.create_user(16)
+    urls = [
+        "https://boards.greenhouse.io/acme/jobs/1",
+        "https://boards.greenhouse.io/acme/jobs/2",
+        "https://jobs.lever.co/acme/a-1",
+        "https://jobs.lever.co/acme/a-2",
+        "https://jobs.lever.co/acme/a-3",
+    ]
+    app_ids = [await storage.create_job_application(user_id, url) for url in urls]
+
+    async def fail(app_id, reason):
+        await storage.transition_application(
+            app_id, "failed", {"reason": reason}, event_type="failed", event_data={"reason": reason}
+        )
+
+    async def retry(app_id):
+        await storage.transition_application(app_id, "pending", event_type="retried")
+        await storage.transition_application(app_id, "in_progress")
+
+    for app_id in app_ids:
+        await storage.transition_application(app_id, "in_progress")
+    await storage.transition_application(app_ids[0], "completed")
+    await fail(app_ids[1], "captcha")
+    await storage.transition_application(app_ids[2], "completed")
+    await fail(app_ids[3], "captcha")
+    await retry(app_ids[3])
+    await storage.transition_application(app_ids[3], "completed")
+    await fail(app_ids[4], "captcha")
+    await retry(app_ids[4])
+    # The merged metadata still says "captcha"; only the event's reason counts.
+    await storage.transition_application(
+        app_ids[4], "failed", event_type="failed", event_data={"reason": "posting_closed"}
+    )
+
+    stats = await storage.get_application_stats(user_id)
+    assert (stats["started"], stats["completed"], stats["failed"]) == (5, 3, 2)
+    assert stats["success_rate"] == pytest.approx(3 / 5)
+    assert stats["by_domain"]["boards.greenhouse.io"]["success_rate"] == 0.5
+    assert stats["median_duration_s"] == 30
+    assert stats["duration_histogram"] == [{"le": 30, "count": 3}]
+    assert stats["failure_reasons"] == [
+        {"reason": "captcha", "count": 1},
+        {"reason": "posting_closed", "count": 1},
+    ]
+
+    lever = await storage.get_application_stats(user_id, ats_domain="Jobs.Lever.co")
+    assert (lever["started"], lever["completed"], lever["by_domain"].keys()) == (
+        3,
+        2,
+        {"jobs.lever.co"},
+    )
+    future = await storage.get_application_stats(user_id, since=datetime.now() + timedelta(days=2))
+    assert future["started"] == 0 and future["success_rate"] is None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_checkpoints_merge_and_survive_a_restart(tmp_path):
+    """Test that checkpoint metadata accumulates across steps and is read back after reopening."""
+    storage = SQLiteStorage(tmp_path / "claw.db")
+    await storage.initialize()
+    user_id = await storage.create_user(9)
+    app_id = await storage.create_job_application(user_id, "https://jobs.test/1")
+    steps = [
+        ("navigated", {"page_url": "https://jobs.test/1"}),
+        ("fields_filled", {"unmatched": [{"name": "years"}]}),
+        ("answered", {"answers": {"years": "5"}}),
+    ]
+    for step, data in steps:
+        await storage.transition_application(
+            app_id,
+            "in_progress",
+            {"checkpoint": {**data, "step": step}},
+            event_type=step,
+            event_data=data,
+        )
+    await storage.close()
+
+    reopened = SQLiteStorage(tmp_path / "claw.db")
+    await reopened.initialize()
+    try:
+        application = await reopened.get_job_application(app_id)
+        assert application["metadata"]["checkpoint"] == {
+            "step": "answered",
+            "page_url": "https://jobs.test/1",
+            "unmatched": [{"name": "years"}],
+            "answers": {"years": "5"},
+        }
+        history = await reopened.get_application_history(app_id)
+        assert [event["event_type"] for event in history][-3:] == [step for step, _ in steps]
+    finally:
+        await reopened.close()
@@ -0,0 +1,117 @@
+"""Integration tests for the Telegram webhook server."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+from structlog.testing import capture_logs
+
+from src.infrastructure.telegram.inbound_dispatcher import InboundDispatcher
+from src.infrastructure.telegram.webhook_server import SECRET_HEADER, WebhookConfig, WebhookServer
+from src.utils.metrics import LatencyStats
+
+SECRET = "s3cret"
+
+
+def _update(update_id, chat_id=42, text="123456"):
+    return {
+        "update_id": update_id,
+        "message": {"message_id": update_id, "chat": {"id": chat_id}, "text": text},
+    }
+
+
+@pytest_asyncio.fixture
+async def webhook():
+    dispatcher = InboundDispatcher()
+
+    async def on_update(update):
+        message = update["message"]
+        dispatcher.dispatch(message["chat"]["id"], {"text": message["text"]})
+
+    server = WebhookServer(
+        WebhookConfig(url="https://example.test", secret_token=SECRET, port=0), on_update
+    )
+    await server.start()
+    base_url = f"http://127.0.0.1:{server.port}"
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        yield server, dispatcher, client
+    await server.stop()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_rejects_wrong_secret(webhook):
+    """Test that updates without the secret token are refused."""
+    server, _, client = webhook
+    response = await client.post(
+        "/telegram/webhook", json=_update(1), headers={SECRET_HEADER: "nope"}
+    )
+    assert response.status_code == 403
+    assert server.rejected == 1
+    assert server.received == 0
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_duplicate_updates_are_acknowledged_once(webhook):
+    """Test that a redelivered update_id is not dispatched twice."""
+    server, dispatcher, client = webhook
+    for _ in range(2):
+        response = await client.post(
+            "/telegram/webhook", json=_update(7), headers={SECRET_HEADER: SECRET}
+        )
+        assert response.status_code == 200
+    assert server.received == 1
+    assert server.duplicates == 1
+    assert (await dispatcher.wait(42, timeout=1))["text"] == "123456"
+    assert await dispatcher.wait(42, timeout=0.05) is None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_failed_update_is_logged():
+    """Test that an update whose processing raises is logged, not left unretrieved."""
+
+    async def on_update(update):
+        raise RuntimeError("boom")
+
+    server = WebhookServer(
+        WebhookConfig(url="https://example.test", secret_token=SECRET, port=0), on_update
+    )
+    await server.start()
+    try:
+        with capture_logs() as logs:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+                response = await client.post(
+                    "/telegram/webhook", json=_update(1), headers={SECRET_HEADER: SECRET}
+                )
+            await asyncio.sleep(0.05)
+    finally:
+        await server.stop()
+
+    assert response.status_code == 200
+    assert [entry["event"] for entry in logs] == ["webhook_update_failed"]
+    assert isinstance(logs[0]["exc_info"], RuntimeError)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_reply_dispatch_latency(webhook):
+    """Test and report latency from webhook POST to the waiting coroutine."""
+    _, dispatcher, client = webhook
+    latency = LatencyStats()
+    for update_id in range(100, 150):
+        waiter = asyncio.create_task(dispatcher.wait(42, timeout=2))
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        await client.post(
+            "/telegram/webhook", json=_update(update_id), headers={SECRET_HEADER: SECRET}
+        )
+        assert await waiter is not None
+        latency.record(time.perf_counter() - started)
+    snapshot = latency.snapshot()
+    print(f"webhook reply dispatch latency: {snapshot}")
+    assert snapshot["count"] == 50
+    assert snapshot["p95_ms"] < 250
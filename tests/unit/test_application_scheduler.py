@@ -0,0 +1,213 @@
+"""Unit tests for the application scheduler."""
+
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from src.application.services.application_scheduler import ApplicationScheduler
+
+
+class FakeStorage:
+    """In-memory queue and application statuses."""
+
+    def __init__(self):
+        self.queue = {}
+        self.statuses = {}
+        self._next = 0
+
+    async def enqueue_application(self, user_id, job_url, priority=0):
+        self._next += 1
+        self.queue[self._next] = {
+            "id": self._next,
+            "user_id": user_id,
+            "job_url": job_url,
+            "priority": priority,
+        }
+        return self._next
+
+    async def get_queued_applications(self):
+        return list(self.queue.values())
+
+    async def delete_queued_application(self, queue_id):
+        self.queue.pop(queue_id, None)
+
+    async def get_job_application(self, application_id):
+        return {"id": application_id, "status": self.statuses[application_id]}
+
+
+class FakeHandler:
+    """Starts one application per URL and records concurrency while processing."""
+
+    def __init__(self, storage, delay=0.01):
+        self.storage = storage
+        self.delay = delay
+        self.ids = {}
+        self.order = []
+        self.started_at = []
+        self.active = 0
+        self.peak = 0
+        self.domain_active = {}
+        self.domain_peak = {}
+
+    async def start_application(self, user_id, job_url):
+        if job_url in self.ids:
+            return self.ids[job_url]
+        self.ids[job_url] = len(self.ids) + 1
+        self.storage.statuses[self.ids[job_url]] = "in_progress"
+        return self.ids[job_url]
+
+    async def process_application(self, application_id):
+        url = next(url for url, app_id in self.ids.items() if app_id == application_id)
+        domain = url.split("/")[2]
+        self.order.append(url)
+        self.started_at.append((domain, time.monotonic()))
+        self.active += 1
+        self.domain_active[domain] = self.domain_active.get(domain, 0) + 1
+        self.peak = max(self.peak, self.active)
+        self.domain_peak[domain] = max(self.domain_peak.get(domain, 0), self.domain_active[domain])
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        self.domain_active[domain] -= 1
+        self.storage.statuses[application_id] = "completed"
+        return {"status": "completed"}
+
+
+async def _run(scheduler, jobs):
+    await scheduler.start()
+    for user_id, url, *priority in jobs:
+        await scheduler.submit(user_id, url, *priority)
+    await asyncio.wait_for(scheduler.drain(), 5)
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_limits_global_and_per_domain_concurrency():
+    """Test that neither the global nor any per-domain limit is exceeded."""
+    storage = FakeStorage()
+    handler = FakeHandler(storage)
+    scheduler = ApplicationScheduler(
+        handler, storage, max_concurrency=3, per_domain_concurrency=2, domain_spacing=0
+    )
+    jobs = [(1, f"https://{host}/jobs/{n}") for n in range(6) for host in ("a.test", "b.test")]
+
+    await _run(scheduler, jobs)
+
+    assert len(handler.order) == 12
+    assert handler.peak == 3
+    assert max(handler.domain_peak.values()) == 2
+    assert storage.queue == {}
+    assert scheduler.stats()["by_status"] == {"completed": 12}
+
+
+@pytest.mark.asyncio
+async def test_users_interleave_and_priority_goes_first():
+    """Test round-robin across users and that a higher priority jumps the queue."""
+    storage = FakeStorage()
+    handler = FakeHandler(storage, delay=0)
+    scheduler = ApplicationScheduler(handler, storage, max_concurrency=1, domain_spacing=0)
+    jobs = [(1, f"https://a.test/{n}") for n in range(4)]
+    jobs += [(2, f"https://b.test/{n}") for n in range(2)]
+    jobs.append((2, "https://c.test/urgent", 5))
+
+    await _run(scheduler, jobs)
+
+    assert handler.order == [
+        "https://c.test/urgent",
+        "https://a.test/0",
+        "https://b.test/0",
+        "https://a.test/1",
+        "https://b.test/1",
+        "https://a.test/2",
+        "https://a.test/3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_starts_on_one_domain_are_spaced():
+    """Test that consecutive starts on a domain wait for domain_spacing."""
+    storage = FakeStorage()
+    handler = FakeHandler(storage, delay=0)
+    scheduler = ApplicationScheduler(handler, storage, domain_spacing=0.05)
+
+    await _run(
+        scheduler, [(1, f"https://a.test/{n}") for n in range(3)] + [(1, "https://b.test/0")]
+    )
+
+    a_starts = [at for domain, at in handler.started_at if domain == "a.test"]
+    gaps = [later - earlier for earlier, later in itertools.pairwise(a_starts)]
+    assert len(gaps) == 2 and min(gaps) >= 0.045
+    assert handler.order.index("https://b.test/0") < 2
+
+
+@pytest.mark.asyncio
+async def test_persisted_queue_resumes_and_duplicates_are_skipped():
+    """Test that start() loads stored entries and finished duplicates are not reprocessed."""
+    storage = FakeStorage()
+    handler = FakeHandler(storage, delay=0)
+    await storage.enqueue_application(1, "https://a.test/1")
+    await storage.enqueue_application(1, "https://a.test/1?utm_source=x")
+    handler.ids["https://a.test/1?utm_source=x"] = 99
+    storage.statuses[99] = "completed"
+    scheduler = ApplicationScheduler(handler, storage, domain_spacing=0)
+
+    await _run(scheduler, [])
+
+    assert handler.order == ["https://a.test/1"]
+    assert scheduler.stats()["skipped"] == 1
+    assert storage.queue == {}
+
+
+@pytest.mark.asyncio
+async def test_restart_does_not_queue_entries_twice():
+    """Test that entries already in memory are not added again when start() reloads storage."""
+    storage = FakeStorage()
+    handler = FakeHandler(storage, delay=0)
+    scheduler = ApplicationScheduler(handler, storage, domain_spacing=0)
+    await scheduler.submit(1, "https://a.test/1")
+    await scheduler.submit(2, "https://b.test/1")
+
+    await _run(scheduler, [])
+    await _run(scheduler, [(1, "https://a.test/2")])
+
+    assert handler.order == ["https://a.test/1", "https://b.test/1", "https://a.test/2"]
+    assert scheduler.stats()["submitted"] == 3
+    assert scheduler.stats()["skipped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_parked_applications_resume_after_restart():
+    """Test that only finished applications are skipped; parked ones are processed again."""
+    storage = FakeStorage()
+    handler = FakeHandler(storage, delay=0)
+    for app_id, status in enumerate(["awaiting_user_input", "pending", "cancelled"], start=1):
+        url = f"https://a.test/{status}"
+        handler.ids[url] = app_id
+        storage.statuses[app_id] = status
+        await storage.enqueue_application(1, url)
+    scheduler = ApplicationScheduler(handler, storage, domain_spacing=0)
+
+    await _run(scheduler, [])
+
+    assert handler.order == ["https://a.test/awaiting_user_input", "https://a.test/pending"]
+    assert scheduler.stats()["skipped"] == 1
+    assert storage.queue == {}
+
+
+@pytest.mark.asyncio
+async def test_malformed_urls_are_refused_and_dropped_from_the_queue():
+    """Test that a URL with a bad port is never queued and a stored one is removed."""
+    storage = FakeStorage()
+    handler = FakeHandler(storage, delay=0)
+    await storage.enqueue_application(1, "https://a.test:port/1")
+    await storage.enqueue_application(1, "https://a.test/2")
+    scheduler = ApplicationScheduler(handler, storage, domain_spacing=0)
+
+    with pytest.raises(ValueError):
+        await scheduler.submit(1, "https://a.test:99999/3")
+    await _run(scheduler, [])
+
+    assert handler.order == ["https://a.test/2"]
+    assert scheduler.stats()["errors"] == 1
+    assert storage.queue == {}
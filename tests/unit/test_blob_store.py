@@ -0,0 +1,38 @@
+"""Unit tests for the content-addressed blob store."""
+
+import hashlib
+
+import pytest
+
+from src.infrastructure.storage.blob_store import BlobStore
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_stored_once(tmp_path):
+    """Test that files and bytes with the same content share one blob."""
+    store = BlobStore(tmp_path / "blobs")
+    source = tmp_path / "resume.pdf"
+    source.write_bytes(b"%PDF-1.7 resume" * 1000)
+
+    digest = await store.put_file(source)
+    assert digest == hashlib.sha256(source.read_bytes()).hexdigest()
+    assert await store.put_bytes(source.read_bytes()) == digest
+    assert store.path(digest).relative_to(store.root).parts[:2] == (digest[:2], digest[2:4])
+    blobs = [p for p in store.root.rglob("*") if p.is_file()]
+    assert blobs == [store.path(digest)]
+
+
+@pytest.mark.asyncio
+async def test_mapped_reads_and_delete(tmp_path):
+    """Test that blobs can be mapped without copying and deleted."""
+    store = BlobStore(tmp_path)
+    digest = await store.put_bytes(b"hello world")
+    with store.mapped(digest) as view:
+        assert bytes(view[:5]) == b"hello"
+    empty = await store.put_bytes(b"")
+    with store.mapped(empty) as view:
+        assert len(view) == 0
+    await store.delete(digest)
+    assert not store.exists(digest)
+    with pytest.raises(ValueError):
+        store.path("../../etc/passwd")
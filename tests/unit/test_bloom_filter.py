@@ -0,0 +1,25 @@
+"""Unit tests for the Bloom filter."""
+
+import pytest
+
+from src.utils.bloom import BloomFilter
+
+
+def test_added_items_are_always_found_and_false_positives_stay_rare():
+    """Test that there are no false negatives and the error rate is near target."""
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for n in range(5000):
+        bloom.add(f"item-{n}")
+
+    assert all(f"item-{n}" in bloom for n in range(5000))
+    false_positives = sum(f"other-{n}" in bloom for n in range(10000))
+    assert false_positives < 250
+    assert len(bloom) == 5000
+
+
+def test_invalid_sizing_is_rejected():
+    """Test that a zero capacity or out-of-range error rate raises."""
+    with pytest.raises(ValueError):
+        BloomFilter(0)
+    with pytest.raises(ValueError):
+        BloomFilter(10, error_rate=1.0)
@@ -0,0 +1,109 @@
+"""Unit tests for the browser-backed form filler and login detection."""
+
+import pytest
+
+from src.infrastructure.browser.auth_handler import BrowserAuthHandler
+from src.infrastructure.browser.form_filler import BrowserFormFiller
+
+
+class FakeBrowser:
+    """Serves a fixed set of fields and selectors and records every action."""
+
+    def __init__(self, fields=(), present=()):
+        self.fields = list(fields)
+        self.present = set(present)
+        self.actions = []
+
+    async def detect_forms(self):
+        return self.fields
+
+    async def find_element(self, selector, timeout=None):
+        return selector if any(part in selector for part in self.present) else None
+
+    async def fill(self, selector, value, timeout=None):
+        self.actions.append(("fill", selector, value))
+
+    async def select_option(self, selector, value, timeout=None):
+        self.actions.append(("select", selector, value))
+
+    async def upload_file(self, selector, file_path, timeout=None):
+        self.actions.append(("upload", selector, file_path))
+
+    async def click(self, selector, timeout=None):
+        self.actions.append(("click", selector))
+        self.present.discard('type="password"')
+
+    async def wait_for_navigation(self, timeout=None):
+        self.actions.append(("wait",))
+
+
+def _field(name, field_type="text", required=False, label=None):
+    return {
+        "name": name,
+        "selector": f"#{name}",
+        "field_type": field_type,
+        "required": required,
+        "label": label,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fill_form_matches_names_and_reports_required_leftovers():
+    """Test name, label and contained-key matching and which fields come back unmatched."""
+    browser = FakeBrowser(
+        [
+            _field("first-name"),
+            _field("q1", label="E-mail"),
+            _field("applicant_phone_number"),
+            _field("country", "select"),
+            _field("csrf", "hidden"),
+            _field("sponsorship", "checkbox"),
+            _field("years_python", required=True),
+            _field("nickname"),
+        ]
+    )
+    form_data = {
+        "first_name": "Jane",
+        "email": "jane@example.com",
+        "phone": "555",
+        "phone_number": "555-0100",
+        "country": "US",
+        "sponsorship": False,
+        "csrf": "x",
+    }
+
+    unmatched = await BrowserFormFiller(browser).fill_form(form_data)
+
+    assert [field_info["name"] for field_info in unmatched] == ["years_python"]
+    assert browser.actions == [
+        ("fill", "#first-name", "Jane"),
+        ("fill", "#q1", "jane@example.com"),
+        ("fill", "#applicant_phone_number", "555-0100"),
+        ("select", "#country", "US"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_submit_form_needs_a_submit_button():
+    """Test that submit clicks the button when there is one and reports False otherwise."""
+    assert await BrowserFormFiller(FakeBrowser()).submit_form() is False
+
+    browser = FakeBrowser(present={'type="submit"'})
+    assert await BrowserFormFiller(browser).submit_form() is True
+    assert browser.actions[0][0] == "click"
+
+
+@pytest.mark.asyncio
+async def test_login_wall_is_detected_and_completed():
+    """Test that a password input means login is required and logging in clears it."""
+    browser = FakeBrowser(present={'type="password"', 'type="email"'})
+    auth = BrowserAuthHandler(browser)
+
+    assert await auth.detect_login_required() is True
+    assert await auth.perform_login({"email": "jane@example.com", "password": "pw"}) is True
+    assert browser.actions[:2] == [
+        ("fill", browser.actions[0][1], "jane@example.com"),
+        ("fill", 'input[type="password"]', "pw"),
+    ]
+    assert await auth.detect_otp_required() is False
+    assert await auth.submit_otp("123456") is False
@@ -0,0 +1,69 @@
+"""Unit tests for per-application browser sessions."""
+
+import asyncio
+
+import pytest
+
+from src.application.services.browser_session_handler import BrowserSessionHandler
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeService:
+    """Remembers its browser and how many runs overlap."""
+
+    running = 0
+    peak = 0
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def start_application(self, user_id, job_url):
+        return 1
+
+    async def process_application(self, application_id):
+        FakeService.running += 1
+        FakeService.peak = max(FakeService.peak, FakeService.running)
+        await asyncio.sleep(0.01)
+        FakeService.running -= 1
+        return {"status": "completed", "browser": self.browser}
+
+    async def handle_otp(self, application_id, otp_code):
+        return {"status": "in_progress", "browser": self.browser}
+
+    async def handle_user_response(self, application_id, response):
+        return {"status": "completed", "browser": self.browser}
+
+    async def handle_answers(self, application_id, answers):
+        return {"status": "completed", "browser": self.browser}
+
+
+@pytest.mark.asyncio
+async def test_each_run_gets_its_own_browser_and_closes_it():
+    """Test that concurrent runs never share a browser and each one is closed."""
+    browsers = []
+
+    def make_browser():
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    handler = BrowserSessionHandler(FakeService, make_browser)
+    results = await asyncio.gather(*(handler.process_application(n) for n in range(3)))
+
+    used = [result["browser"] for result in results]
+    assert len(set(map(id, used))) == 3
+    assert all(browser.closed for browser in used)
+    assert FakeService.peak == 3
+    assert not browsers[0].closed
+    otp = await handler.handle_otp(1, "123")
+    assert otp["browser"] is browsers[0]
+    reply = await handler.handle_user_response(1, "no")
+    assert reply["browser"] is browsers[-1] and reply["browser"].closed
+    await handler.close()
+    assert browsers[0].closed
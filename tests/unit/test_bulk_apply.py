@@ -0,0 +1,127 @@
+"""Unit tests for the bulk apply CLI pipeline."""
+
+import asyncio
+import io
+
+import pytest
+
+from src.application.services.application_scheduler import ApplicationScheduler
+from src.cli.bulk_apply import ProgressLine, bulk_apply, format_summary, parse_job_line
+
+
+class FakeStorage:
+    """In-memory queue; every application starts in progress."""
+
+    def __init__(self):
+        self.queue = {}
+        self._next = 0
+
+    async def enqueue_application(self, user_id, job_url, priority=0):
+        self._next += 1
+        self.queue[self._next] = {"id": self._next}
+        return self._next
+
+    async def get_queued_applications(self):
+        return []
+
+    async def delete_queued_application(self, queue_id):
+        self.queue.pop(queue_id, None)
+
+    async def get_job_application(self, application_id):
+        return {"id": application_id, "status": "in_progress"}
+
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class FakeHandler:
+    """Fails URLs containing 'bad' and tracks the largest scheduler backlog."""
+
+    def __init__(self):
+        self.urls = []
+        self.scheduler = None
+        self.max_queued = 0
+
+    async def start_application(self, user_id, job_url):
+        self.urls.append(job_url)
+        return len(self.urls)
+
+    async def process_application(self, application_id):
+        self.max_queued = max(self.max_queued, self.scheduler.queued)
+        await asyncio.sleep(0)
+        failed = "bad" in self.urls[application_id - 1]
+        return {"status": "failed" if failed else "completed"}
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("https://jobs.lever.co/acme/1\n", ("https://jobs.lever.co/acme/1", 0)),
+        ('{"url": "https://a.test/2", "priority": 3}', ("https://a.test/2", 3)),
+        ('{"job_url": "https://a.test/3"}', ("https://a.test/3", 0)),
+        ("   \n", None),
+        ("# comment", None),
+    ],
+)
+def test_parse_job_line(line, expected):
+    """Test that bare URLs, JSONL and blank/comment lines are understood."""
+    assert parse_job_line(line) == expected
+
+
+@pytest.mark.parametrize(
+    "line", ["not a url", '{"url": 5', '{"priority": 1}', "https://a.test:port/1"]
+)
+def test_parse_job_line_rejects_garbage(line):
+    """Test that lines without a usable URL raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_job_line(line)
+
+
+@pytest.mark.asyncio
+async def test_bulk_apply_streams_with_backpressure_and_summarizes():
+    """Test that every line is processed, the backlog stays bounded and the summary adds up."""
+    storage, handler = FakeStorage(), FakeHandler()
+    scheduler = ApplicationScheduler(handler, storage, max_concurrency=2, domain_spacing=0)
+    handler.scheduler = scheduler
+    lines = [f"https://a.test/{n}" for n in range(40)] + ["https://a.test/bad", "nope"]
+    stream = io.StringIO("\n".join(lines) + "\n")
+    out, errors = io.StringIO(), io.StringIO()
+
+    result = await bulk_apply(
+        scheduler, 1, stream, max_pending=3, progress=ProgressLine(scheduler, out), errors=errors
+    )
+
+    assert len(handler.urls) == 41
+    assert handler.max_queued <= 3
+    assert result["by_status"] == {"completed": 40, "failed": 1}
+    assert result["rejected"] == 1
+    assert errors.getvalue().startswith("line 42: ")
+    assert out.getvalue().startswith("41/41 done, 0 running")
+    assert "\r" not in out.getvalue()
+    assert out.getvalue().endswith("ETA 0:00:00\n")
+    summary = format_summary(result)
+    assert "Processed 41 of 41 jobs" in summary
+    assert "  failed: 1" in summary and "  rejected: 1" in summary
+
+
+@pytest.mark.asyncio
+async def test_progress_rewrites_one_line_only_on_a_terminal():
+    """Test that a terminal gets in-place updates and a pipe gets periodic plain lines."""
+    scheduler = ApplicationScheduler(FakeHandler(), FakeStorage(), domain_spacing=0)
+    terminal, piped = Terminal(), io.StringIO()
+    reporters = [
+        asyncio.create_task(ProgressLine(scheduler, terminal).run(interval=0.01)),
+        asyncio.create_task(ProgressLine(scheduler, piped, plain_interval=0.01).run()),
+    ]
+    await asyncio.sleep(0.035)
+    for reporter in reporters:
+        reporter.cancel()
+    await asyncio.gather(*reporters, return_exceptions=True)
+
+    assert terminal.getvalue().count("\r\033[K0/0+ done") >= 2
+    assert "\n" not in terminal.getvalue()
+    lines = piped.getvalue().splitlines()
+    assert len(lines) >= 2 and all(line.startswith("0/0+ done") for line in lines)
+    assert "\033" not in piped.getvalue()
@@ -0,0 +1,74 @@
+"""Unit tests for the read-through storage cache."""
+
+import asyncio
+
+import pytest
+
+from src.domain.interfaces.storage import IFormDataProvider
+from src.infrastructure.storage.cached_storage import CachedStorage
+
+
+class FakeStorage:
+    """Counts profile/config reads; reads can be held open."""
+
+    def __init__(self):
+        self.profiles = {
+            1: {"personal_info": {"first_name": "Jane"}, "skills": {"technical_skills": ["Go"]}}
+        }
+        self.reads = 0
+        self.gate = None
+
+    async def get_user_profile(self, user_id):
+        self.reads += 1
+        snapshot = self.profiles.get(user_id)
+        if self.gate is not None:
+            await self.gate.wait()
+        return snapshot
+
+    async def save_user_profile(self, user_id, profile_data):
+        self.profiles[user_id] = profile_data
+
+    async def get_user_config(self, user_id):
+        self.reads += 1
+        return {"model_name": "gpt-4o"}
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_hit_the_cache():
+    """Test that profile, config and form data are loaded from storage once."""
+    inner = FakeStorage()
+    storage = CachedStorage(inner)
+    assert isinstance(storage, IFormDataProvider)
+    for _ in range(3):
+        assert (await storage.get_form_data(1)) == {"first_name": "Jane", "skills": "Go"}
+        assert (await storage.get_user_config(1))["model_name"] == "gpt-4o"
+    assert inner.reads == 2
+    assert (storage.hits, storage.misses) == (4, 3)
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates_and_results_are_copies():
+    """Test that saving drops cached entries and callers cannot mutate the cache."""
+    storage = CachedStorage(FakeStorage())
+    profile = await storage.get_user_profile(1)
+    profile["personal_info"]["first_name"] = "Mutated"
+    assert (await storage.get_user_profile(1))["personal_info"]["first_name"] == "Jane"
+
+    await storage.save_user_profile(1, {"personal_info": {"first_name": "Ana"}})
+    assert (await storage.get_form_data(1)) == {"first_name": "Ana"}
+    assert storage.stats()["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_racing_a_save_does_not_cache_stale_data():
+    """Test that a read started before a save is not stored after it."""
+    inner = FakeStorage()
+    storage = CachedStorage(inner, max_entries=2)
+    inner.gate = asyncio.Event()
+    slow_read = asyncio.create_task(storage.get_user_profile(1))
+    await asyncio.sleep(0)
+    await storage.save_user_profile(1, {"personal_info": {"first_name": "Ana"}})
+    inner.gate.set()
+    assert (await slow_read)["personal_info"]["first_name"] == "Jane"
+    inner.gate = None
+    assert (await storage.get_user_profile(1))["personal_info"]["first_name"] == "Ana"
@@ -0,0 +1,101 @@
+"""Unit tests for the cached user/chat index."""
+
+from types import SimpleNamespace
+
+import pytest
+from telegram.ext import TypeHandler
+
+from src.infrastructure.telegram.chat_index import ChatIndex
+from src.infrastructure.telegram.telegram_bot import TelegramBot
+
+
+class FakeUserStorage:
+    """In-memory users table counting queries."""
+
+    def __init__(self):
+        self.users = {}
+        self.queries = 0
+
+    async def create_user(self, telegram_chat_id):
+        user_id = len(self.users) + 1
+        self.users[user_id] = {"id": user_id, "telegram_chat_id": telegram_chat_id}
+        return user_id
+
+    async def get_user(self, user_id):
+        self.queries += 1
+        return self.users.get(user_id)
+
+    async def get_user_by_telegram_id(self, telegram_chat_id):
+        self.queries += 1
+        return next(
+            (u for u in self.users.values() if u["telegram_chat_id"] == telegram_chat_id), None
+        )
+
+
+@pytest.mark.asyncio
+async def test_register_chat_is_write_through():
+    """Test that registering creates the user once and caches both directions."""
+    storage = FakeUserStorage()
+    index = ChatIndex(storage)
+    user_id = await index.register_chat(555)
+    assert await index.register_chat(555) == user_id
+    assert len(storage.users) == 1
+    queries = storage.queries
+    assert await index.get_chat_id(user_id) == 555
+    assert await index.get_user_id(555) == user_id
+    assert storage.queries == queries
+
+
+@pytest.mark.asyncio
+async def test_fan_out_hits_storage_only_on_cold_users():
+    """Test that repeated notification fan-out costs no storage queries."""
+    storage = FakeUserStorage()
+    for chat_id in range(100, 110):
+        await storage.create_user(chat_id)
+    index = ChatIndex(storage)
+    first = await index.get_chat_ids(list(range(1, 11)))
+    assert storage.queries == 10
+    second = await index.get_chat_ids(list(range(1, 11)))
+    assert first == second
+    assert storage.queries == 10
+    assert index.stats()["hits"] == 10
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_both_directions():
+    """Test that eviction removes the reverse mapping too."""
+    index = ChatIndex(max_entries=2)
+    index.remember(1, 101)
+    index.remember(2, 102)
+    await index.get_chat_id(1)
+    index.remember(3, 103)
+    assert await index.get_chat_id(2) is None
+    assert await index.get_user_id(102) is None
+    assert await index.get_user_id(101) == 1
+
+
+def _update(chat_id, text):
+    return SimpleNamespace(
+        effective_chat=SimpleNamespace(id=chat_id),
+        effective_message=SimpleNamespace(text=text),
+    )
+
+
+@pytest.mark.asyncio
+async def test_bot_registers_chats_on_start_and_warms_the_index():
+    """Test that /start creates the user and later lookups need no storage query."""
+    storage = FakeUserStorage()
+    bot = TelegramBot("123:abc", storage=storage)
+    tracker = next(
+        handler for handler in bot.application.handlers[-1] if isinstance(handler, TypeHandler)
+    )
+
+    await tracker.callback(_update(555, "hello"), None)
+    assert storage.users == {}
+    await tracker.callback(_update(555, "/start@claw_bot"), None)
+    queries = storage.queries
+
+    assert await bot.get_chat_id(1) == 555
+    assert storage.queries == queries
+    await tracker.callback(_update(555, "/start"), None)
+    assert len(storage.users) == 1
@@ -0,0 +1,105 @@
+"""Unit tests for the command registry."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.telegram.command_registry import CommandRegistry, auth_middleware
+
+
+class FakeHandler:
+    """Records calls and optionally blocks or fails."""
+
+    def __init__(self, name, gate=None, fail=False):
+        self.name = name
+        self.gate = gate
+        self.fail = fail
+        self.calls = 0
+
+    async def handle(self, update, context):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("boom")
+
+    @property
+    def command_name(self):
+        return self.name
+
+    @property
+    def description(self):
+        return f"{self.name} command"
+
+
+class FakeBot:
+    """Captures set_my_commands calls."""
+
+    def __init__(self):
+        self.commands = None
+
+    async def set_my_commands(self, commands):
+        self.commands = commands
+
+
+def _update(text, chat_id=1):
+    return SimpleNamespace(
+        effective_message=SimpleNamespace(text=text),
+        effective_chat=SimpleNamespace(id=chat_id),
+        effective_user=SimpleNamespace(id=chat_id),
+    )
+
+
+@pytest.mark.asyncio
+async def test_slow_command_does_not_block_other_commands():
+    """Test that a saturated /apply leaves /status free to run."""
+    registry = CommandRegistry()
+    gate = asyncio.Event()
+    apply_handler = FakeHandler("apply", gate=gate)
+    status_handler = FakeHandler("status")
+    await registry.register_command("apply", apply_handler, max_concurrency=1)
+    await registry.register_command("status", status_handler)
+
+    for _ in range(3):
+        assert await registry.dispatch(_update("/apply https://example.test"), None)
+    assert await registry.dispatch(_update("/status@my_bot"), None)
+    await asyncio.sleep(0.01)
+
+    assert status_handler.calls == 1
+    assert apply_handler.calls == 1
+    assert registry.stats()["apply"]["in_flight"] == 1
+    gate.set()
+    await registry.drain()
+    assert apply_handler.calls == 3
+    assert registry.stats()["apply"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_and_captures_errors():
+    """Test that auth rejections and handler errors are counted, not raised."""
+    registry = CommandRegistry(middlewares=[auth_middleware({1})])
+    await registry.register_command("status", FakeHandler("status", fail=True))
+
+    await registry.dispatch(_update("/status", chat_id=1), None)
+    await registry.dispatch(_update("/status", chat_id=2), None)
+    await registry.drain()
+
+    stats = registry.stats()["status"]
+    assert stats["count"] == 1
+    assert stats["errors"] == 1
+    assert stats["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_commands_and_publishing():
+    """Test that unknown commands are ignored and known ones are published."""
+    registry = CommandRegistry()
+    await registry.register_command("Status", FakeHandler("status"))
+    assert not await registry.dispatch(_update("/missing"), None)
+    assert not await registry.dispatch(_update("hello"), None)
+    assert await registry.get_handler("STATUS") is not None
+
+    bot = FakeBot()
+    await registry.register_all_commands(bot)
+    assert [(c.command, c.description) for c in bot.commands] == [("status", "status command")]
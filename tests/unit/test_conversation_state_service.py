@@ -0,0 +1,196 @@
+"""Unit tests for durable pending prompts."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.application.services.conversation_state_service import ConversationStateService
+from src.domain.models.job_application import InvalidStatusTransition
+from src.domain.models.pending_prompt import AnswerType, PendingPrompt
+
+
+class FakeStorage:
+    """Keeps pending prompts and transitions in memory; closed applications refuse changes."""
+
+    def __init__(self):
+        self.prompts = {}
+        self.statuses = []
+        self.closed = set()
+
+    async def save_pending_prompt(self, prompt):
+        self.prompts[prompt["application_id"]] = dict(prompt)
+
+    async def get_pending_prompts(self):
+        return list(self.prompts.values())
+
+    async def delete_pending_prompt(self, application_id):
+        self.prompts.pop(application_id, None)
+
+    async def transition_application(
+        self, application_id, status, metadata=None, event_type=None, event_data=None
+    ):
+        if application_id in self.closed:
+            raise InvalidStatusTransition(application_id, "cancelled", status)
+        self.statuses.append((application_id, status, metadata, event_type))
+        return True
+
+
+class FakeTelegram:
+    """Returns increasing message ids and keeps the unclaimed-message handler."""
+
+    def __init__(self):
+        self.sent = []
+        self.unclaimed = None
+
+    def on_unclaimed_message(self, handler):
+        self.unclaimed = handler
+
+    async def send_message(self, chat_id, text, reply_to_message_id=None, parse_mode=None):
+        self.sent.append((chat_id, text))
+        return 500 + len(self.sent)
+
+
+class FakeJobHandler:
+    """Records replies routed to applications."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def handle_otp(self, application_id, otp_code):
+        self.calls.append(("otp", application_id, otp_code))
+        return {"status": "in_progress"}
+
+    async def handle_user_response(self, application_id, response):
+        self.calls.append(("response", application_id, response))
+        return {"status": "in_progress"}
+
+    async def handle_answers(self, application_id, answers):
+        self.calls.append(("answers", application_id, answers))
+        return {"status": "completed"}
+
+
+class Clock:
+    """Settable clock."""
+
+    def __init__(self):
+        self.now = datetime(2024, 1, 15, 10, 0, tzinfo=UTC)
+
+    def __call__(self):
+        return self.now
+
+
+def _service(storage, clock, handler=None):
+    return ConversationStateService(storage, FakeTelegram(), handler or FakeJobHandler(), clock)
+
+
+@pytest.mark.asyncio
+async def test_ask_persists_prompt_and_sets_status():
+    """Test that asking stores the prompt with its message id."""
+    storage = FakeStorage()
+    service = _service(storage, Clock())
+    await service.ask(7, 100, "Enter the code", AnswerType.OTP, timeout=300)
+    assert storage.prompts[7]["prompt_message_id"] == 501
+    assert storage.prompts[7]["answer_type"] == "otp"
+    assert storage.statuses[0][:2] == (7, "awaiting_otp")
+    assert storage.statuses[0][3] == "question_asked"
+
+
+@pytest.mark.asyncio
+async def test_late_reply_after_restart_resumes_application():
+    """Test that a reply after rehydration reaches the right application."""
+    storage = FakeStorage()
+    clock = Clock()
+    before_restart = _service(storage, clock)
+    await before_restart.ask(7, 100, "Enter the code", AnswerType.OTP)
+    await before_restart.ask(8, 100, "Years of Python?")
+
+    handler, telegram = FakeJobHandler(), FakeTelegram()
+    restarted = ConversationStateService(storage, telegram, handler, clock)
+    assert await restarted.attach() == 2
+    assert await telegram.unclaimed(100, {"text": "5", "reply_to_message_id": 502})
+    assert await telegram.unclaimed(100, {"text": " 123456 "})
+    assert handler.calls == [("response", 8, "5"), ("otp", 7, "123456")]
+    assert storage.prompts == {}
+    assert await restarted.handle_reply(100, {"text": "stray"}) is False
+
+
+@pytest.mark.asyncio
+async def test_expired_prompts_fail_application_on_rehydrate():
+    """Test that prompts past their deadline are dropped on startup."""
+    storage = FakeStorage()
+    clock = Clock()
+    await _service(storage, clock).ask(7, 100, "Enter the code", AnswerType.OTP, timeout=60)
+    clock.now += timedelta(minutes=5)
+    assert await _service(storage, clock).rehydrate() == 0
+    assert storage.prompts == {}
+    assert storage.statuses[-1] == (
+        7,
+        "failed",
+        {"reason": "user_input_timeout"},
+        "user_input_timeout",
+    )
+
+
+@pytest.mark.asyncio
+async def test_prompts_of_resolved_applications_are_dropped():
+    """Test that expiring or answering a cancelled application only removes its prompt."""
+    storage, clock = FakeStorage(), Clock()
+    handler = FakeJobHandler()
+    service = _service(storage, clock, handler)
+    await service.ask(7, 100, "Years of Python?", timeout=60)
+    await service.ask(8, 100, "Enter the code", AnswerType.OTP, timeout=600)
+    storage.closed.update({7, 8})
+
+    async def refuse(application_id, otp_code):
+        raise InvalidStatusTransition(application_id, "cancelled", "in_progress")
+
+    handler.handle_otp = refuse
+    clock.now += timedelta(minutes=5)
+    assert await service.expire_overdue() == 1
+    assert await service.handle_reply(100, {"text": "123456"})
+
+    assert storage.prompts == {}
+    assert [status for _, status, *_ in storage.statuses] == ["awaiting_user_input", "awaiting_otp"]
+
+
+def _round_prompt(application_id, fields, clock):
+    return PendingPrompt(
+        application_id=application_id,
+        chat_id=100,
+        question="1. City\n2. Remote?",
+        prompt_message_id=900,
+        fields=fields,
+        question_count=2,
+        created_at=clock.now,
+        deadline=clock.now + timedelta(hours=1),
+    ).model_dump(mode="json")
+
+
+@pytest.mark.asyncio
+async def test_late_round_reply_resumes_each_application_with_its_answers():
+    """Test that a reply to a saved round is split per application and resumes each one."""
+    storage, clock, handler = FakeStorage(), Clock(), FakeJobHandler()
+    service = _service(storage, clock, handler)
+    await service.attach()
+    # Saved by the question round after the service loaded its prompts.
+    await storage.save_pending_prompt(_round_prompt(1, [{"number": 1, "name": "city"}], clock))
+    fields = [{"number": 2, "name": "remote", "options": ["Yes", "No"]}]
+    await storage.save_pending_prompt(_round_prompt(2, fields, clock))
+
+    assert await service.handle_reply(100, {"text": "1: Berlin\n2: 2", "reply_to_message_id": 900})
+    assert handler.calls == [
+        ("answers", 1, {"city": "Berlin"}),
+        ("answers", 2, {"remote": "No"}),
+    ]
+    assert storage.prompts == {}
+
+
+@pytest.mark.asyncio
+async def test_reply_to_an_unknown_message_is_not_routed():
+    """Test that a reply to some other message never falls back to the oldest prompt."""
+    storage, clock, handler = FakeStorage(), Clock(), FakeJobHandler()
+    service = _service(storage, clock, handler)
+    await service.ask(7, 100, "Enter the code", AnswerType.OTP)
+    assert await service.handle_reply(100, {"text": "123", "reply_to_message_id": 42}) is False
+    assert handler.calls == []
+    assert 7 in storage.prompts
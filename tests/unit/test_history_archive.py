@@ -0,0 +1,24 @@
+"""Unit tests for history archive segments."""
+
+import pytest
+
+from src.infrastructure.storage.history_archive import HistoryArchive
+
+
+@pytest.mark.asyncio
+async def test_records_round_trip_and_segments_rotate(tmp_path):
+    """Test that archived events read back and full segments are left alone."""
+    archive = HistoryArchive(tmp_path, max_segment_bytes=1)
+    first_events = [{"id": 1, "event_type": "form_filled", "event_data": {"unmatched": []}}]
+    second_events = [{"id": 2, "event_type": "cancelled", "event_data": {}}]
+    first = await archive.append(7, first_events)
+    second = await archive.append(8, second_events)
+
+    assert (first.segment, second.segment) == (1, 2)
+    assert await archive.read(first) == first_events
+    assert await archive.read(second) == second_events
+
+    reopened = HistoryArchive(tmp_path)
+    third = await reopened.append(9, [])
+    assert third.segment == 2
+    assert third.offset == second.length
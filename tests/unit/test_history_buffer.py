@@ -0,0 +1,93 @@
+"""Unit tests for the history write-behind buffer."""
+
+import asyncio
+
+import pytest
+
+from src.infrastructure.storage.history_buffer import HistoryWriteBuffer
+
+
+class FakeWriter:
+    """Records batches, can fail once and can be held mid-commit."""
+
+    def __init__(self, fail_once=False):
+        self.batches = []
+        self.fail_once = fail_once
+        self.release = asyncio.Event()
+        self.release.set()
+        self.committing = asyncio.Event()
+
+    async def __call__(self, rows):
+        self.committing.set()
+        await self.release.wait()
+        if self.fail_once:
+            self.fail_once = False
+            raise RuntimeError("disk full")
+        self.batches.append(list(rows))
+
+
+def _row(application_id, event="step"):
+    return (application_id, event, "{}", "2024-01-15T10:00:00+00:00")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_events_share_one_commit():
+    """Test that events queued within the window are written together."""
+    writer = FakeWriter()
+    buffer = HistoryWriteBuffer(writer, max_batch=100, flush_interval=0.01)
+    await asyncio.gather(*(buffer.add(_row(n)) for n in range(10)))
+    assert writer.batches == []
+    await asyncio.sleep(0.05)
+    assert len(writer.batches) == 1
+    assert buffer.stats()["mean_batch"] == 10
+
+
+@pytest.mark.asyncio
+async def test_size_limit_flushes_immediately_and_close_drains():
+    """Test that a full batch commits at once and close flushes the rest."""
+    writer = FakeWriter()
+    buffer = HistoryWriteBuffer(writer, max_batch=3, flush_interval=60)
+    for n in range(4):
+        await buffer.add(_row(n))
+    assert [len(batch) for batch in writer.batches] == [3]
+    await buffer.close()
+    assert [len(batch) for batch in writer.batches] == [3, 1]
+    assert buffer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_for_and_failed_commit_keeps_rows():
+    """Test read-your-writes flushing and that a failed batch is retried."""
+    writer = FakeWriter(fail_once=True)
+    buffer = HistoryWriteBuffer(writer, flush_interval=60)
+    await buffer.add(_row(1, "a"))
+    await buffer.flush_for(2)
+    assert buffer.pending == 1
+    with pytest.raises(RuntimeError):
+        await buffer.flush_for(1)
+    assert buffer.has_pending(1)
+    await buffer.add(_row(1, "b"))
+    await buffer.flush_for(1)
+    assert [row[1] for row in writer.batches[0]] == ["a", "b"]
+    assert buffer.stats()["commit"]["errors"] == 1
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_for_waits_for_an_in_flight_commit():
+    """Test that a read during a background flush sees the rows once they commit."""
+    writer = FakeWriter()
+    writer.release.clear()
+    buffer = HistoryWriteBuffer(writer, flush_interval=0)
+    await buffer.add(_row(1))
+    await writer.committing.wait()
+    assert buffer.pending == 0 and buffer.has_pending(1)
+
+    read = asyncio.create_task(buffer.flush_for(1))
+    await asyncio.sleep(0.01)
+    assert not read.done()
+    writer.release.set()
+    await read
+    assert writer.batches == [[_row(1)]]
+    assert not buffer.has_pending(1)
+    await buffer.close()
@@ -0,0 +1,96 @@
+"""Unit tests for inbound Telegram message dispatch."""
+
+import asyncio
+
+import pytest
+
+from src.infrastructure.telegram.inbound_dispatcher import InboundDispatcher
+
+
+def _message(text, reply_to=None, message_id=None):
+    return {"text": text, "reply_to_message_id": reply_to, "message_id": message_id}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_wakes_waiter():
+    """Test that a waiting coroutine receives the next message."""
+    dispatcher = InboundDispatcher()
+    waiter = asyncio.create_task(dispatcher.wait(1, timeout=1))
+    await asyncio.sleep(0)
+    assert dispatcher.dispatch(1, _message("123456")) is True
+    assert (await waiter)["text"] == "123456"
+
+
+@pytest.mark.asyncio
+async def test_message_buffered_until_waited():
+    """Test that a message arriving before the wait is returned immediately."""
+    dispatcher = InboundDispatcher()
+    assert dispatcher.dispatch(1, _message("early")) is False
+    assert (await dispatcher.wait(1, timeout=0.01))["text"] == "early"
+
+
+@pytest.mark.asyncio
+async def test_reply_routed_to_correlated_waiter():
+    """Test that replies reach the waiter for the question they answer."""
+    dispatcher = InboundDispatcher()
+    first = asyncio.create_task(dispatcher.wait(1, timeout=1, reply_to=10))
+    second = asyncio.create_task(dispatcher.wait(1, timeout=1, reply_to=20))
+    await asyncio.sleep(0)
+    dispatcher.dispatch(1, _message("answer to 20", reply_to=20))
+    dispatcher.dispatch(1, _message("plain answer"))
+    assert (await second)["text"] == "answer to 20"
+    assert (await first)["text"] == "plain answer"
+
+
+@pytest.mark.asyncio
+async def test_reply_to_another_message_skips_correlated_waiters():
+    """Test that a reply to an unrelated message is buffered, not taken as an answer."""
+    dispatcher = InboundDispatcher()
+    waiter = asyncio.create_task(dispatcher.wait(1, timeout=1, reply_to=10))
+    await asyncio.sleep(0)
+    assert dispatcher.dispatch(1, _message("about message 99", reply_to=99)) is False
+    dispatcher.dispatch(1, _message("answer", reply_to=10))
+    assert (await waiter)["text"] == "answer"
+    assert (await dispatcher.wait(1, timeout=0.01))["text"] == "about message 99"
+
+
+@pytest.mark.asyncio
+async def test_correlated_wait_skips_buffered_messages_older_than_its_question():
+    """Test that a stale plain message is not taken as the answer to a later question."""
+    dispatcher = InboundDispatcher()
+    dispatcher.dispatch(1, _message("stale", message_id=5))
+    dispatcher.dispatch(1, _message("fresh", message_id=12))
+    assert (await dispatcher.wait(1, timeout=0.01, reply_to=10))["text"] == "fresh"
+    assert await dispatcher.wait(1, timeout=0.01, reply_to=20) is None
+    assert (await dispatcher.wait(1, timeout=0.01))["text"] == "stale"
+
+
+@pytest.mark.asyncio
+async def test_chats_are_isolated_and_timeout_returns_none():
+    """Test that messages for one chat do not satisfy another."""
+    dispatcher = InboundDispatcher()
+    waiter = asyncio.create_task(dispatcher.wait(2, timeout=0.01))
+    await asyncio.sleep(0)
+    dispatcher.dispatch(1, _message("other chat"))
+    assert await waiter is None
+    assert dispatcher._mailboxes[2].idle
+
+
+def test_buffer_is_bounded():
+    """Test that the per-chat buffer drops the oldest messages."""
+    dispatcher = InboundDispatcher(max_buffered=2)
+    for text in ("a", "b", "c"):
+        dispatcher.dispatch(1, _message(text))
+    assert [m["text"] for m in dispatcher._mailboxes[1].buffer] == ["b", "c"]
+    assert dispatcher.stats()["dropped"] == 1
+
+
+def test_prune_idle_chats():
+    """Test that idle chats without waiters are cleaned up."""
+    now = [0.0]
+    dispatcher = InboundDispatcher(idle_ttl=60, clock=lambda: now[0])
+    dispatcher.dispatch(1, _message("hello"))
+    now[0] = 61.0
+    dispatcher.dispatch(2, _message("hello"))
+    assert dispatcher.prune_idle() == 1
+    assert set(dispatcher._mailboxes) == {2}
@@ -0,0 +1,345 @@
+"""Unit tests for the checkpointed job application service."""
+
+import pytest
+
+from src.application.services.job_application_service import JobApplicationService
+from src.application.services.question_round_service import QuestionRoundTimeout
+from src.domain.models.job_application import DuplicateApplication
+
+
+def _merge(target, patch):
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class FakeStorage:
+    """One application whose metadata is merged like the SQLite json_patch."""
+
+    def __init__(self, checkpoint=None, status="in_progress"):
+        metadata = {} if checkpoint is None else {"checkpoint": checkpoint}
+        self.application = {
+            "id": 1,
+            "user_id": 7,
+            "job_url": "https://jobs.test/1",
+            "status": status,
+            "metadata": metadata,
+        }
+        self.events = []
+
+    async def get_job_application(self, application_id):
+        return self.application
+
+    async def get_user(self, user_id):
+        return {"id": user_id, "telegram_chat_id": 70}
+
+    async def get_user_profile(self, user_id):
+        return {"personal_info": {"first_name": "Jane"}}
+
+    async def transition_application(
+        self, application_id, status, metadata=None, event_type=None, event_data=None
+    ):
+        self.application["status"] = status
+        _merge(self.application["metadata"], metadata or {})
+        if event_type is not None:
+            self.events.append(event_type)
+        return True
+
+
+class FakeBrowser:
+    """Starts on a blank page like a freshly launched browser."""
+
+    def __init__(self, url="about:blank"):
+        self.url = url
+        self.visits = []
+
+    async def navigate(self, url):
+        self.visits.append(url)
+        self.url = url
+
+    async def get_current_url(self):
+        return self.url
+
+
+class FakeFormFiller:
+    """Leaves one field unmatched and records what was filled and submitted."""
+
+    def __init__(self, submit_ok=True, unmatched=None):
+        self.submit_ok = submit_ok
+        self.unmatched = unmatched or [{"name": "years", "label": "Years of Python"}]
+        self.forms_filled = 0
+        self.fields = {}
+        self.submits = 0
+
+    async def fill_form(self, form_data):
+        self.forms_filled += 1
+        return self.unmatched
+
+    async def fill_field(self, field_info, value):
+        self.fields[field_info["name"]] = value
+
+    async def submit_form(self):
+        self.submits += 1
+        return self.submit_ok
+
+
+class FakeAuth:
+    async def detect_login_required(self):
+        return False
+
+
+class FakeQuestionRound:
+    def __init__(self, answered=True, answers=None):
+        self.answered = answered
+        self.answers = {"years": "5"} if answers is None else answers
+        self.asked = []
+
+    async def ask(self, application_id, chat_id, fields):
+        self.asked.append([field_info["name"] for field_info in fields])
+        if not self.answered:
+            raise QuestionRoundTimeout(chat_id, 600)
+        return self.answers
+
+
+class RacingStorage(FakeStorage):
+    """Finds nothing, then loses the insert to a start that has not begun the run yet."""
+
+    async def find_job_application(self, user_id, job_url):
+        return None
+
+    async def create_job_application(self, user_id, job_url):
+        raise DuplicateApplication(1, job_url)
+
+
+def _service(storage, browser=None, form_filler=None, question_round=None):
+    return JobApplicationService(
+        storage,
+        browser or FakeBrowser(),
+        form_filler or FakeFormFiller(),
+        FakeAuth(),
+        telegram_bot=None,
+        question_round=question_round or FakeQuestionRound(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_records_a_checkpoint_after_every_step():
+    """Test that a fresh run walks every step in order and ends completed."""
+    storage, questions = FakeStorage(), FakeQuestionRound()
+
+    result = await _service(storage, question_round=questions).process_application(1)
+
+    assert result["status"] == "completed"
+    assert storage.events == [
+        "navigated",
+        "fields_filled",
+        "answers_pending",
+        "answered",
+        "submitting",
+        "submitted",
+    ]
+    checkpoint = storage.application["metadata"]["checkpoint"]
+    assert checkpoint["step"] == "submitted"
+    assert checkpoint["answers"] == {"years": "5"}
+    assert questions.asked == [["years"]]
+
+
+@pytest.mark.asyncio
+async def test_retry_on_the_same_page_skips_navigation_and_filling():
+    """Test that a live page at the checkpointed URL is reused as is."""
+    storage = FakeStorage(
+        {
+            "step": "fields_filled",
+            "page_url": "https://jobs.test/1",
+            "unmatched": [{"name": "years"}],
+        }
+    )
+    browser, filler = FakeBrowser("https://jobs.test/1"), FakeFormFiller()
+
+    await _service(storage, browser, filler).process_application(1)
+
+    assert browser.visits == []
+    assert filler.forms_filled == 0
+    assert filler.fields == {"years": "5"}
+    assert storage.events[0] == "answers_pending"
+
+
+@pytest.mark.asyncio
+async def test_restart_refills_stored_answers_without_asking_again():
+    """Test that after a restart the page is rebuilt but the user is not asked twice."""
+    storage = FakeStorage(
+        {
+            "step": "answered",
+            "page_url": "https://jobs.test/1",
+            "unmatched": [{"name": "years"}],
+            "answers": {"years": "9"},
+        }
+    )
+    browser, filler, questions = FakeBrowser(), FakeFormFiller(), FakeQuestionRound()
+
+    result = await _service(storage, browser, filler, questions).process_application(1)
+
+    assert result["status"] == "completed"
+    assert browser.visits == ["https://jobs.test/1"]
+    assert filler.fields == {"years": "9"}
+    assert questions.asked == []
+    assert storage.application["metadata"]["checkpoint"]["step"] == "submitted"
+
+
+@pytest.mark.asyncio
+async def test_never_submits_twice():
+    """Test that a recorded or possibly sent submission is not clicked again."""
+    submitted, filler = FakeStorage({"step": "submitted"}), FakeFormFiller()
+    result = await _service(submitted, form_filler=filler).process_application(1)
+
+    assert result["status"] == "completed"
+    assert submitted.application["status"] == "completed"
+
+    unconfirmed = FakeStorage({"step": "submitting"})
+    result = await _service(unconfirmed, form_filler=filler).process_application(1)
+
+    assert result["status"] == "awaiting_user_input"
+    assert unconfirmed.application["metadata"]["reason"] == "submission_unconfirmed"
+    assert filler.submits == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_submit_rolls_the_checkpoint_back():
+    """Test that a submit that sent nothing leaves the run retryable from its answers."""
+    storage = FakeStorage()
+
+    result = await _service(
+        storage, form_filler=FakeFormFiller(submit_ok=False)
+    ).process_application(1)
+
+    assert result["status"] == "failed"
+    assert storage.application["metadata"]["checkpoint"]["step"] == "answered"
+
+
+@pytest.mark.asyncio
+async def test_unanswered_questions_park_the_application():
+    """Test that a question round timeout waits for the user instead of submitting."""
+    storage, filler = FakeStorage(), FakeFormFiller()
+
+    result = await _service(
+        storage, form_filler=filler, question_round=FakeQuestionRound(answered=False)
+    ).process_application(1)
+
+    assert result["status"] == "awaiting_user_input"
+    assert storage.application["status"] == "awaiting_user_input"
+    assert storage.application["metadata"]["reason"] == "questions_unanswered"
+    assert storage.application["metadata"]["checkpoint"]["step"] == "answers_pending"
+    assert filler.submits == 0
+
+
+@pytest.mark.asyncio
+async def test_partial_reply_keeps_its_answers_and_does_not_submit():
+    """Test that a reply answering only some questions parks the run with what it got."""
+    storage = FakeStorage()
+    filler = FakeFormFiller(unmatched=[{"name": "years"}, {"name": "salary"}])
+    questions = FakeQuestionRound(answers={"years": "5"})
+
+    result = await _service(
+        storage, form_filler=filler, question_round=questions
+    ).process_application(1)
+
+    assert result["status"] == "awaiting_user_input"
+    assert filler.submits == 0
+    assert filler.fields == {"years": "5"}
+    assert storage.application["metadata"]["reason"] == "questions_unanswered"
+    checkpoint = storage.application["metadata"]["checkpoint"]
+    assert (checkpoint["step"], checkpoint["answers"]) == ("answers_pending", {"years": "5"})
+
+    questions.answers = {"salary": "100k"}
+    result = await _service(
+        storage, form_filler=filler, question_round=questions
+    ).process_application(1)
+
+    assert result["status"] == "completed"
+    assert questions.asked == [["years", "salary"], ["salary"]]
+    assert storage.application["metadata"]["checkpoint"]["answers"] == {
+        "years": "5",
+        "salary": "100k",
+    }
+
+
+@pytest.mark.asyncio
+async def test_late_answers_are_merged_and_resume_the_run():
+    """Test that answers arriving after a timeout fill the form without asking again."""
+    storage, filler = FakeStorage(), FakeFormFiller()
+    questions = FakeQuestionRound(answered=False)
+    service = _service(storage, form_filler=filler, question_round=questions)
+    assert (await service.process_application(1))["status"] == "awaiting_user_input"
+
+    result = await service.handle_answers(1, {"years": "5"})
+
+    assert result["status"] == "completed"
+    assert questions.asked == [["years"]]
+    assert filler.fields == {"years": "5"}
+    assert storage.application["metadata"]["checkpoint"]["answers"] == {"years": "5"}
+    assert "answers_received" in storage.events
+
+
+@pytest.mark.asyncio
+async def test_user_settles_an_unconfirmed_submission():
+    """Test that "yes" completes a possibly sent submission and anything unclear keeps it parked."""
+    storage, filler = FakeStorage({"step": "submitting"}, "awaiting_user_input"), FakeFormFiller()
+    service = _service(storage, form_filler=filler)
+
+    assert (await service.handle_user_response(1, "maybe"))["status"] == "awaiting_user_input"
+    assert storage.application["metadata"]["checkpoint"]["step"] == "submitting"
+
+    result = await service.handle_user_response(1, " Yes ")
+
+    assert result["status"] == "completed"
+    assert storage.application["status"] == "completed"
+    assert storage.application["metadata"]["checkpoint"]["step"] == "submitted"
+    assert storage.events[-2:] == ["submission_confirmed", "submitted"]
+    assert filler.submits == 0
+
+
+@pytest.mark.asyncio
+async def test_denied_submission_is_resubmitted_from_its_answers():
+    """Test that "no" rolls the checkpoint back to answered and submits again."""
+    storage = FakeStorage(
+        {
+            "step": "submitting",
+            "page_url": "https://jobs.test/1",
+            "unmatched": [{"name": "years"}],
+            "answers": {"years": "9"},
+        },
+        "awaiting_user_input",
+    )
+    browser, filler, questions = FakeBrowser(), FakeFormFiller(), FakeQuestionRound()
+
+    result = await _service(storage, browser, filler, questions).handle_user_response(1, "no")
+
+    assert result["status"] == "completed"
+    assert storage.events[0] == "submission_denied"
+    assert browser.visits == ["https://jobs.test/1"]
+    assert filler.fields == {"years": "9"}
+    assert (filler.submits, questions.asked) == (1, [])
+    assert storage.application["metadata"]["checkpoint"]["step"] == "submitted"
+
+
+@pytest.mark.asyncio
+async def test_finished_applications_are_not_reopened():
+    """Test that a cancelled or completed application returns before touching the page."""
+    for status in ("cancelled", "completed"):
+        storage, browser = FakeStorage({"step": "answered"}, status), FakeBrowser()
+
+        result = await _service(storage, browser).process_application(1)
+
+        assert result["status"] == status
+        assert browser.visits == [] and storage.events == []
+
+
+@pytest.mark.asyncio
+async def test_losing_a_create_race_handles_the_winners_row():
+    """Test that a duplicate insert re-reads the other row and starts it if still pending."""
+    for status, expected in (("pending", "in_progress"), ("completed", "completed")):
+        storage = RacingStorage(status=status)
+        assert await _service(storage).start_application(7, "https://jobs.test/1") == 1
+        assert storage.application["status"] == expected
@@ -0,0 +1,57 @@
+"""Unit tests for the shared LLM HTTP transport registry."""
+
+import pytest
+
+from src.infrastructure.llm.http_pool import (
+    HTTPPoolConfig,
+    LLMClientRegistry,
+    _TrackingTransport,
+    httpx,
+)
+from src.infrastructure.llm.openai_client import OpenAIClient
+
+
+def test_registry_reuses_client_for_same_credentials():
+    """Test that identical base_url and key share one AsyncOpenAI instance."""
+    registry = LLMClientRegistry()
+    first = registry.get_client("sk-one", "https://api.example.com/v1")
+    second = registry.get_client("sk-one", "https://api.example.com/v1/")
+    assert first is second
+    assert registry.stats()["clients"] == 1
+
+
+def test_registry_shares_pool_across_credentials():
+    """Test that different keys get separate clients on one HTTP pool."""
+    registry = LLMClientRegistry()
+    first = registry.get_client("sk-one", "https://api.example.com/v1")
+    second = registry.get_client("sk-two", "https://api.example.com/v1")
+    assert first is not second
+    assert first._client is second._client is registry.http_client
+
+
+def test_openai_client_uses_registry():
+    """Test that OpenAIClient instances for one user share the pooled client."""
+    registry = LLMClientRegistry()
+    a = OpenAIClient("sk-one", "gpt-4o-mini", registry=registry)
+    b = OpenAIClient("sk-one", "gpt-4o", registry=registry)
+    assert a.client is b.client
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_requests():
+    """Test that utilization stats count requests through the shared pool."""
+    registry = LLMClientRegistry(HTTPPoolConfig(max_connections=4))
+    client = registry.http_client
+    transport = registry._transport
+    assert isinstance(transport, _TrackingTransport)
+    transport._inner = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+    await client.get("https://api.example.com/v1/models")
+    await client.get("https://api.example.com/v1/models")
+
+    stats = registry.stats()
+    assert stats["requests"] == 2
+    assert stats["in_flight"] == 0
+    assert stats["peak_utilization"] == 0.25
+    await registry.aclose()
+    assert registry.stats()["clients"] == 0
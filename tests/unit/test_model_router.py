@@ -0,0 +1,73 @@
+"""Unit tests for per-task LLM model routing."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.domain.models.form_field import FieldType
+from src.domain.models.model_route import TaskKind
+from src.domain.models.user_config import UserConfig
+from src.infrastructure.llm.http_pool import LLMClientRegistry
+from src.infrastructure.llm.model_router import ModelRouter
+from src.infrastructure.llm.openai_client import OpenAIClient
+
+
+def _config(**overrides):
+    values = {
+        "telegram_bot_token": "token",
+        "openai_key": "sk-test",
+        "model_name": "gpt-4o",
+        "model_base_url": "https://api.openai.com/v1",
+        "model_routes": {"classification": "gpt-4o-mini", "field_mapping": "gpt-4o-mini"},
+    }
+    values.update(overrides)
+    return UserConfig(**values)
+
+
+def test_route_by_task_kind_falls_back_to_default():
+    """Test that unrouted task kinds use the default model."""
+    router = ModelRouter.from_config(_config())
+    assert router.route(TaskKind.CLASSIFICATION).model == "gpt-4o-mini"
+    assert router.route(TaskKind.LONG_FORM).model == "gpt-4o"
+
+
+def test_route_by_field_type():
+    """Test that field types map to the expected task kinds."""
+    router = ModelRouter("big", {TaskKind.CLASSIFICATION: "small"})
+    assert router.route(field_type=FieldType.SELECT).task == TaskKind.CLASSIFICATION
+    assert router.route(field_type=FieldType.SELECT).model == "small"
+    assert router.route(field_type=FieldType.TEXTAREA).task == TaskKind.LONG_FORM
+    assert router.route(field_type=FieldType.EMAIL).task == TaskKind.FIELD_MAPPING
+
+
+def test_user_config_rejects_unknown_task_kind():
+    """Test that model_routes keys are validated against TaskKind."""
+    with pytest.raises(ValueError):
+        _config(model_routes={"poetry": "gpt-4o"})
+
+
+@pytest.mark.asyncio
+async def test_client_records_route_and_latency():
+    """Test that routed calls record the chosen model and latency."""
+    client = OpenAIClient.from_config(_config(), registry=LLMClientRegistry())
+    requests = []
+
+    async def create(**request):
+        requests.append(request)
+        return SimpleNamespace(model_dump=lambda: {"choices": [{"message": {"content": "{}"}}]})
+
+    client.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+
+    await client.complete_task(None, [{"role": "user", "content": "Yes or no?"}], FieldType.RADIO)
+    await client.generate_text("Write a cover letter")
+
+    assert [r["model"] for r in requests] == ["gpt-4o-mini", "gpt-4o"]
+    assert [r.route.task for r in client.router.recent] == [
+        TaskKind.CLASSIFICATION,
+        TaskKind.LONG_FORM,
+    ]
+    stats = client.router.stats()
+    assert stats["classification:gpt-4o-mini"]["count"] == 1
+    assert stats["long_form:gpt-4o"]["count"] == 1
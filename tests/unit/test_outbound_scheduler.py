@@ -0,0 +1,100 @@
+"""Unit tests for the outbound Telegram scheduler."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from telegram.error import RetryAfter
+
+from src.infrastructure.telegram.outbound_scheduler import (
+    MessagePriority,
+    OutboundScheduler,
+    TokenBucket,
+)
+
+
+class FakeBot:
+    """Records Bot API calls."""
+
+    def __init__(self):
+        self.calls = []
+        self._next_id = 100
+
+    async def send_message(self, chat_id, text, parse_mode=None, **kwargs):
+        self._next_id += 1
+        self.calls.append(("send", chat_id, text))
+        return SimpleNamespace(message_id=self._next_id)
+
+    async def edit_message_text(self, chat_id, message_id, text, parse_mode=None):
+        self.calls.append(("edit", chat_id, text))
+        return SimpleNamespace(message_id=message_id)
+
+
+def test_token_bucket_delay():
+    """Test that an empty bucket reports the time until the next token."""
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, capacity=1.0, clock=lambda: now[0])
+    assert bucket.delay() == 0
+    bucket.consume()
+    assert bucket.delay() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.delay() == 0
+    bucket.block_for(3)
+    assert bucket.delay() == pytest.approx(3)
+
+
+@pytest.mark.asyncio
+async def test_urgent_lane_overtakes_queued_progress():
+    """Test that OTP prompts are sent before earlier queued messages."""
+    bot = FakeBot()
+    scheduler = OutboundScheduler(bot, global_rate=50, global_burst=1)
+    order = []
+
+    def send(label):
+        async def call():
+            order.append(label)
+
+        return call
+
+    tasks = [
+        asyncio.create_task(scheduler.submit(1, send("first"))),
+        asyncio.create_task(scheduler.submit(2, send("normal"))),
+        asyncio.create_task(scheduler.submit(3, send("otp"), MessagePriority.URGENT)),
+    ]
+    await asyncio.gather(*tasks)
+    await scheduler.stop()
+    assert order == ["otp", "first", "normal"]
+
+
+@pytest.mark.asyncio
+async def test_progress_updates_are_coalesced_and_edited():
+    """Test that superseded progress updates collapse into one message."""
+    bot = FakeBot()
+    scheduler = OutboundScheduler(bot, per_chat_rate=50, per_chat_burst=1)
+    await scheduler.submit_progress(1, "app-1", "Navigating")
+    await asyncio.gather(
+        scheduler.submit_progress(1, "app-1", "Filling 1/3"),
+        scheduler.submit_progress(1, "app-1", "Filling 2/3"),
+        scheduler.submit_progress(1, "app-1", "Filling 3/3"),
+    )
+    await scheduler.stop()
+    assert bot.calls == [("send", 1, "Navigating"), ("edit", 1, "Filling 3/3")]
+    assert scheduler.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_chat_and_retries():
+    """Test that a RetryAfter response is retried after the penalty."""
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RetryAfter(0.01)
+        return "ok"
+
+    scheduler = OutboundScheduler(FakeBot())
+    assert await scheduler.submit(1, flaky) == "ok"
+    await scheduler.stop()
+    assert len(attempts) == 2
+    assert scheduler.stats()["retried"] == 1
@@ -0,0 +1,53 @@
+"""Unit tests for the cache-friendly prompt builder."""
+
+from src.infrastructure.llm.prompt_builder import (
+    PromptBuilder,
+    PromptCacheStats,
+    cached_token_ratio,
+)
+
+
+def test_build_orders_system_profile_then_request():
+    """Test that messages follow system, profile prefix, request order."""
+    builder = PromptBuilder(system_prompt="system")
+    messages = builder.build({"personal_info": {"full_name": "Jane"}}, "What is your name?")
+    assert [m["role"] for m in messages] == ["system", "user", "user"]
+    assert messages[0]["content"] == "system"
+    assert "Jane" in messages[1]["content"]
+    assert messages[2]["content"] == "What is your name?"
+
+
+def test_profile_prefix_is_stable_across_key_order():
+    """Test that the profile prefix does not depend on dict insertion order."""
+    builder = PromptBuilder()
+    first = builder.profile_prefix({"b": 1, "a": {"y": 2, "x": 3}})
+    second = builder.profile_prefix({"a": {"x": 3, "y": 2}, "b": 1})
+    assert first == second
+
+
+def test_prefix_shared_between_different_requests():
+    """Test that only the final message differs between two requests."""
+    builder = PromptBuilder()
+    profile = {"skills": {"technical_skills": ["Python"]}}
+    first = builder.build(profile, "Question one")
+    second = builder.build(profile, "Question two")
+    assert first[:2] == second[:2]
+    assert first[2] != second[2]
+
+
+def test_cached_token_ratio():
+    """Test the cached-token ratio computed from usage data."""
+    usage = {"prompt_tokens": 2000, "prompt_tokens_details": {"cached_tokens": 1536}}
+    assert cached_token_ratio(usage) == 0.768
+    assert cached_token_ratio({"prompt_tokens": 10}) == 0.0
+    assert cached_token_ratio(None) == 0.0
+
+
+def test_prompt_cache_stats_accumulate():
+    """Test that cache stats aggregate across completions."""
+    stats = PromptCacheStats()
+    stats.record({"prompt_tokens": 1000, "prompt_tokens_details": {"cached_tokens": 0}})
+    stats.record({"prompt_tokens": 1000, "prompt_tokens_details": {"cached_tokens": 1000}})
+    snapshot = stats.snapshot()
+    assert snapshot["requests"] == 2
+    assert snapshot["cached_ratio"] == 0.5
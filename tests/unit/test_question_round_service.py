@@ -0,0 +1,122 @@
+"""Unit tests for batched question rounds."""
+
+import asyncio
+
+import pytest
+
+from src.application.services.question_round_service import (
+    QuestionRoundService,
+    QuestionRoundTimeout,
+)
+
+
+class FakeTelegram:
+    """Asks questions and replies to each with a canned answer."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.sent = []
+
+    async def ask(self, chat_id, text, timeout=None, parse_mode=None, on_sent=None):
+        self.sent.append((chat_id, text))
+        if on_sent is not None:
+            await on_sent(900 + len(self.sent))
+        return {"text": self.reply} if self.reply is not None else None
+
+
+class FakeStorage:
+    """Keeps pending prompts in memory and records every one saved."""
+
+    def __init__(self):
+        self.prompts = {}
+        self.saved = []
+
+    async def save_pending_prompt(self, prompt):
+        self.prompts[prompt["application_id"]] = prompt
+        self.saved.append(prompt)
+
+    async def delete_pending_prompt(self, application_id):
+        self.prompts.pop(application_id, None)
+
+
+def test_parse_reply_handles_separators_and_continuations():
+    """Test that numbered replies are split into per-question answers."""
+    text = "1: Jane\n2) yes\n3. I like\nbuilding tools\n9: ignored"
+    assert QuestionRoundService.parse_reply(text, 3) == {
+        1: "Jane",
+        2: "yes",
+        3: "I like\nbuilding tools",
+    }
+    assert QuestionRoundService.parse_reply("just this", 1) == {1: "just this"}
+
+
+@pytest.mark.asyncio
+async def test_fields_from_several_applications_share_one_message():
+    """Test that concurrent applications are asked in a single round trip."""
+    telegram = FakeTelegram("1: 5\n2: 2\n3: https://github.com/jane")
+    service = QuestionRoundService(telegram, window=0.01)
+    first = service.ask(
+        1,
+        100,
+        [
+            {"name": "years_python", "label": "Years of Python"},
+            {"name": "relocate", "label": "Willing to relocate?", "options": ["Yes", "No"]},
+        ],
+    )
+    second = service.ask(2, 100, [{"name": "github", "label": "GitHub URL"}])
+    answers = await asyncio.gather(first, second)
+
+    assert len(telegram.sent) == 1
+    assert "3. GitHub URL (application #2)" in telegram.sent[0][1]
+    assert answers == [
+        {"years_python": "5", "relocate": "No"},
+        {"github": "https://github.com/jane"},
+    ]
+    assert service.rounds_sent == 1
+    assert service.questions_asked == 3
+
+
+@pytest.mark.asyncio
+async def test_timeout_raises_for_every_application():
+    """Test that a round without a reply fails each waiting application instead of answering."""
+    service = QuestionRoundService(FakeTelegram(None), window=0.01)
+    results = await asyncio.gather(
+        service.ask(1, 100, [{"name": "city"}]),
+        service.ask(2, 100, [{"name": "phone"}]),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, QuestionRoundTimeout) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_round_prompts_are_saved_until_answered():
+    """Test that each application's part of a round is persisted and cleared by the reply."""
+    storage = FakeStorage()
+    service = QuestionRoundService(FakeTelegram("1: Berlin\n2: 2"), window=0.01, storage=storage)
+    await asyncio.gather(
+        service.ask(1, 100, [{"name": "city"}]),
+        service.ask(2, 100, [{"name": "remote", "options": ["Yes", "No"]}]),
+    )
+    assert [prompt["application_id"] for prompt in storage.saved] == [1, 2]
+    assert storage.saved[1]["prompt_message_id"] == 901
+    assert storage.saved[1]["fields"] == [{"number": 2, "name": "remote", "options": ["Yes", "No"]}]
+    assert storage.saved[1]["question_count"] == 2
+    assert storage.prompts == {}
+
+
+@pytest.mark.asyncio
+async def test_timed_out_round_keeps_its_prompts():
+    """Test that prompts outlive a round nobody answered in time."""
+    storage = FakeStorage()
+    service = QuestionRoundService(FakeTelegram(None), window=0.01, storage=storage)
+    with pytest.raises(QuestionRoundTimeout):
+        await service.ask(1, 100, [{"name": "city"}])
+    assert list(storage.prompts) == [1]
+
+
+def test_answers_from_reply_picks_numbered_options():
+    """Test that a stored round's fields turn a reply back into named answers."""
+    fields = [{"number": 2, "name": "remote", "options": ["Yes", "No"]}]
+    assert QuestionRoundService.answers_from_reply("1: Berlin\n2: 1", 2, fields) == {
+        "remote": "Yes"
+    }
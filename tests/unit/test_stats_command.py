@@ -0,0 +1,88 @@
+"""Unit tests for the /stats command handler."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.application.handlers.stats_command import StatsCommandHandler
+
+STATS = {
+    "started": 10,
+    "completed": 6,
+    "failed": 3,
+    "cancelled": 1,
+    "success_rate": 0.6,
+    "by_domain": {
+        "boards.greenhouse.io": {"started": 6, "completed": 5, "success_rate": 5 / 6},
+        "jobs.lever.co": {"started": 4, "completed": 1, "success_rate": 0.25},
+    },
+    "median_duration_s": 600,
+    "duration_histogram": [{"le": 300, "count": 2}, {"le": 600, "count": 4}],
+    "failure_reasons": [{"reason": "captcha", "count": 2}, {"reason": "timeout", "count": 1}],
+}
+
+
+class FakeStorage:
+    """Serves one user and canned stats."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_user_by_telegram_id(self, chat_id):
+        return {"id": 7} if chat_id == 42 else None
+
+    async def get_application_stats(self, user_id, since=None, ats_domain=None):
+        self.calls.append((user_id, since, ats_domain))
+        return STATS
+
+
+class FakeBot:
+    """Captures sent messages."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, reply_to_message_id=None, parse_mode=None):
+        self.sent.append((chat_id, text))
+
+
+def _update(chat_id, text):
+    return SimpleNamespace(
+        effective_chat=SimpleNamespace(id=chat_id), effective_message=SimpleNamespace(text=text)
+    )
+
+
+@pytest.mark.asyncio
+async def test_stats_reply_summarizes_aggregates():
+    """Test that /stats with a window and board asks storage once and formats the reply."""
+    storage, bot = FakeStorage(), FakeBot()
+    handler = StatsCommandHandler(storage, bot)
+
+    await handler.handle(_update(42, "/stats 7 Jobs.Lever.co"), None)
+
+    assert storage.calls[0][0] == 7 and storage.calls[0][2] == "jobs.lever.co"
+    text = bot.sent[0][1]
+    assert text.startswith("Applications in the last 7 days on jobs.lever.co")
+    assert "Success rate: 60%" in text
+    assert "Median time to submit: under 10 min" in text
+    assert "  captcha: 2" in text
+    assert "By job board" not in text
+
+
+@pytest.mark.asyncio
+async def test_unknown_chat_gets_a_short_reply():
+    """Test that a chat without a user does not query stats."""
+    storage, bot = FakeStorage(), FakeBot()
+
+    await StatsCommandHandler(storage, bot).handle(_update(1, "/stats"), None)
+
+    assert storage.calls == []
+    assert bot.sent == [(1, "No applications yet.")]
+
+
+def test_format_lists_boards_when_not_filtered():
+    """Test that the unfiltered reply breaks results down per board."""
+    text = StatsCommandHandler.format_stats(STATS, 30)
+
+    assert "  boards.greenhouse.io: 5/6 submitted, 83% success" in text
+    assert "  jobs.lever.co: 1/4 submitted, 25% success" in text
@@ -0,0 +1,65 @@
+"""Unit tests for the storage benchmark suite."""
+
+import pytest
+
+from benchmarks.storage_suite import OPERATIONS, Scale, compare, run, seed
+from src.infrastructure.storage.sqlite_storage import SQLiteStorage
+
+
+@pytest.mark.asyncio
+async def test_every_method_runs_against_a_seeded_dataset(tmp_path):
+    """Test that a tiny run measures every method without errors."""
+    result = await run(
+        Scale(users=3, applications=50, events_per_application=2),
+        operations=10,
+        concurrency=2,
+        readers=1,
+        db_path=tmp_path / "bench.db",
+    )
+
+    assert set(result["results"]) == set(OPERATIONS)
+    assert all(stats["count"] == 10 for stats in result["results"].values())
+    assert all(stats["errors"] == 0 for stats in result["results"].values())
+    assert all(stats["flush_ms"] >= 0 for stats in result["results"].values())
+    assert result["scale"]["applications"] == 50
+
+
+@pytest.mark.asyncio
+async def test_seeded_failures_keep_their_reasons(tmp_path):
+    """Test that seeded failures are counted under a reason, not as unknown."""
+    storage = SQLiteStorage(tmp_path / "bench.db", readers=1)
+    await storage.initialize()
+    try:
+        await seed(storage, Scale(users=1, applications=100, events_per_application=1))
+        stats = await storage.get_application_stats(1)
+        history = await storage.get_application_history(1)
+    finally:
+        await storage.close()
+
+    reasons = {failure["reason"] for failure in stats["failure_reasons"]}
+    assert reasons and "unknown" not in reasons
+    assert len(history) == 2
+
+
+def test_compare_reports_only_regressions_beyond_threshold():
+    """Test that slower p95 or lower throughput past the threshold is reported."""
+    baseline = {
+        "results": {
+            "get_user": {"p95_ms": 1.0, "ops_per_s": 1000.0},
+            "save_resume": {"p95_ms": 2.0, "ops_per_s": 500.0},
+        }
+    }
+    current = {
+        "results": {
+            "get_user": {"p95_ms": 1.1, "ops_per_s": 2000.0},
+            "save_resume": {"p95_ms": 3.0, "ops_per_s": 300.0},
+            "new_method": {"p95_ms": 9.0, "ops_per_s": 1.0},
+        }
+    }
+
+    regressions = compare(baseline, current, threshold=0.2)
+
+    assert [(r["method"], r["metric"]) for r in regressions] == [
+        ("save_resume", "p95_ms"),
+        ("save_resume", "ops_per_s"),
+    ]
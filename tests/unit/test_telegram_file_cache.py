@@ -0,0 +1,73 @@
+"""Unit tests for the Telegram file_id cache."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.telegram.file_cache import TelegramFileCache
+from src.infrastructure.telegram.outbound_scheduler import OutboundScheduler
+from src.infrastructure.telegram.telegram_bot import TelegramBot
+
+
+class FakeFileIdStorage:
+    """Stores file_ids in a dict."""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def get_telegram_file_id(self, bot_id, content_hash, media_type):
+        return self.rows.get((bot_id, content_hash, media_type))
+
+    async def save_telegram_file_id(self, bot_id, content_hash, media_type, file_id):
+        self.rows[(bot_id, content_hash, media_type)] = file_id
+
+
+class FakeBot:
+    """Records what each send_document call uploaded."""
+
+    def __init__(self):
+        self.documents = []
+
+    async def send_document(self, chat_id, document, caption=None, filename=None):
+        self.documents.append(document)
+        return SimpleNamespace(document=SimpleNamespace(file_id=f"file-{len(self.documents)}"))
+
+
+@pytest.mark.asyncio
+async def test_digest_identifies_content(tmp_path):
+    """Test that identical content at different paths has the same digest."""
+    first = tmp_path / "a.pdf"
+    second = tmp_path / "b.pdf"
+    first.write_bytes(b"resume")
+    second.write_bytes(b"resume")
+    cache = TelegramFileCache(bot_id=1)
+    assert await cache.digest(str(first)) == await cache.digest(str(second))
+
+
+@pytest.mark.asyncio
+async def test_file_ids_persist_through_storage():
+    """Test that a new cache instance finds file_ids saved by another."""
+    storage = FakeFileIdStorage()
+    await TelegramFileCache(bot_id=1, storage=storage).put("abc", "document", "file-1")
+    cache = TelegramFileCache(bot_id=1, storage=storage)
+    assert await cache.get("abc", "document") == "file-1"
+    assert await cache.get("abc", "photo") is None
+    assert await TelegramFileCache(bot_id=2, storage=storage).get("abc", "document") is None
+
+
+@pytest.mark.asyncio
+async def test_send_document_uploads_once(tmp_path):
+    """Test that resending the same file references the cached file_id."""
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF-1.4 resume")
+    fake_bot = FakeBot()
+    bot = TelegramBot("123:abc", storage=FakeFileIdStorage())
+    bot.application = SimpleNamespace(bot=fake_bot)
+    bot.outbound = OutboundScheduler(fake_bot)
+
+    await bot.send_document(1, str(path))
+    await bot.send_document(2, str(path))
+    await bot.outbound.stop()
+
+    assert fake_bot.documents == [b"%PDF-1.4 resume", "file-1"]
+    assert bot.file_cache.hits == 1
@@ -0,0 +1,54 @@
+"""Unit tests for job URL helpers."""
+
+import pytest
+
+from src.utils.urls import ats_domain, canonicalize_job_url, validate_job_url
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://boards.greenhouse.io/acme/jobs/4012345", "greenhouse:4012345"),
+        ("https://job-boards.greenhouse.io/acme/jobs/4012345/", "greenhouse:4012345"),
+        ("https://boards.greenhouse.io/embed/job_app?for=acme&token=4012345", "greenhouse:4012345"),
+        ("https://www.acme.com/careers/open-roles?gh_jid=4012345&gh_src=abc", "greenhouse:4012345"),
+        ("https://jobs.lever.co/Acme/5A1B-77/apply?lever-source=LinkedIn", "lever:acme/5a1b-77"),
+        ("https://jobs.ashbyhq.com/acme/9F2C-11/application", "ashby:9f2c-11"),
+        ("https://acme.com/jobs?ashby_jid=9f2c-11", "ashby:9f2c-11"),
+        (
+            "https://acme.wd5.myworkdayjobs.com/en-US/Careers/job/Remote-US/Senior-Engineer_R12345",
+            "workday:acme/careers/r12345",
+        ),
+        (
+            "https://acme.wd1.myworkdayjobs.com/careers/job/NYC/Engineer_R12345/apply/applyManually",
+            "workday:acme/careers/r12345",
+        ),
+    ],
+)
+def test_ats_postings_map_to_one_key(url, expected):
+    """Test that every link form of a known ATS posting gives the same key."""
+    assert canonicalize_job_url(url) == expected
+
+
+def test_other_urls_are_normalized():
+    """Test that host case, www, tracking params, fragments and slashes are dropped."""
+    assert (
+        canonicalize_job_url("http://WWW.Acme.com/Jobs/42/?utm_source=x&b=2&a=1&ref=feed#apply")
+        == "https://acme.com/Jobs/42?a=1&b=2"
+    )
+    assert canonicalize_job_url("https://acme.com:8443/jobs") == "https://acme.com:8443/jobs"
+
+
+def test_ats_domain_is_lower_cased_host():
+    """Test that ats_domain keeps only the host."""
+    assert ats_domain(" https://Boards.Greenhouse.io/acme/jobs/1 ") == "boards.greenhouse.io"
+
+
+@pytest.mark.parametrize(
+    "url", ["https://acme.com:99999/jobs", "https://acme.com:x/1", "http://[::1/"]
+)
+def test_validate_job_url_rejects_unparseable_urls(url):
+    """Test that URLs the helpers would choke on are refused up front."""
+    with pytest.raises(ValueError):
+        validate_job_url(url)
+    validate_job_url("https://acme.com:8443/jobs")